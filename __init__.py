@@ -3,10 +3,25 @@
 
 """ComfyUI PLY Preview - Gaussian splat PLY file loading and preview nodes."""
 
+import os
+
 from .load_gaussian_ply import LoadGaussianPLY
 from .load_gaussian_ply_path import LoadGaussianPLYPath
 from .process_gaussian_ply import ProcessGaussianPLY
+from .downsample_gaussian_ply import DownsampleGaussianPLY
+from .batch_process_gaussian_ply import BatchProcessGaussianPLY
+from .crop_gaussian_ply import CropGaussianPLY
+from .merge_gaussian_ply import MergeGaussianPLY
 from .preview_gaussian import PreviewGaussianNode
+from .render_gaussian_ply import RenderGaussianPLY
+from .artifact_cache import derived_cache
+from .concurrency import run_blocking, single_flight
+from .decoded_cache import decoded_cache
+from .file_index import ply_file_index
+from .fingerprint import fingerprints
+from .metrics import metrics
+from .common import COMFYUI_INPUT_FOLDER, COMFYUI_OUTPUT_FOLDER
+from .ply_stream import ROUTE_PREFIX as PLY_ROUTE_PREFIX, handle_ply_request, ply_registry
 from aiohttp import web
 
 try:
@@ -21,25 +36,136 @@ NODE_CLASS_MAPPINGS = {
     "PlyPreviewLoadGaussianPLYEnhance": LoadGaussianPLY,
     "PlyPreviewLoadGaussianPLYPathEnhance": LoadGaussianPLYPath,
     "PlyPreviewProcessGaussianPLYEnhance": ProcessGaussianPLY,
+    "PlyPreviewDownsampleGaussianPLYEnhance": DownsampleGaussianPLY,
+    "PlyPreviewBatchProcessGaussianPLYEnhance": BatchProcessGaussianPLY,
+    "PlyPreviewCropGaussianPLYEnhance": CropGaussianPLY,
+    "PlyPreviewMergeGaussianPLYEnhance": MergeGaussianPLY,
     "PlyPreviewPreviewGaussianEnhance": PreviewGaussianNode,
+    "PlyPreviewRenderGaussianPLYEnhance": RenderGaussianPLY,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "PlyPreviewLoadGaussianPLYEnhance": "Load Gaussian PLY Enhance",
     "PlyPreviewLoadGaussianPLYPathEnhance": "Load Gaussian PLY (Path) Enhance",
     "PlyPreviewProcessGaussianPLYEnhance": "Process Gaussian PLY Enhance",
+    "PlyPreviewDownsampleGaussianPLYEnhance": "Downsample Gaussian PLY Enhance",
+    "PlyPreviewBatchProcessGaussianPLYEnhance": "Batch Process Gaussian PLY Enhance",
+    "PlyPreviewCropGaussianPLYEnhance": "Crop Gaussian PLY Enhance",
+    "PlyPreviewMergeGaussianPLYEnhance": "Merge Gaussian PLY Enhance",
     "PlyPreviewPreviewGaussianEnhance": "Preview Gaussian Enhance",
+    "PlyPreviewRenderGaussianPLYEnhance": "Render Gaussian PLY Enhance",
 }
 
 # Lightweight API to let the frontend refresh PLY dropdowns without restarting ComfyUI
 if PromptServer is not None:
     async def plypreview_list_ply_files(request):  # pragma: no cover - runtime route
-        files = LoadGaussianPLY._get_ply_files()
-        return web.json_response({"files": files})
+        query = request.rel_url.query
+        try:
+            offset = int(query.get("offset", 0))
+            limit = int(query["limit"]) if "limit" in query else None
+        except ValueError:
+            return web.json_response({"error": "offset/limit must be integers"}, status=400)
+        files, total = await run_blocking(ply_file_index.query, query.get("prefix", ""), query.get("q", ""), offset, limit)
+        return web.json_response({"files": files, "total": total, "offset": offset})
+
+    async def plypreview_ply_info(request):  # pragma: no cover - runtime route
+        selection = request.rel_url.query.get("file", "")
+        resolved = await run_blocking(_resolve_info_selection, selection)
+        if resolved is None:
+            return web.json_response({"error": f"PLY file not found: {selection}"}, status=404)
+        from .ply_info import ply_info_index
+
+        try:
+            info = await run_blocking(ply_info_index.get, resolved)
+        except Exception as e:
+            return web.json_response({"error": str(e)}, status=400)
+        return web.json_response(info)
+
+    def _within(path: str, root: str | None) -> bool:
+        if not root:
+            return False
+        root = os.path.realpath(root)
+        try:
+            return os.path.commonpath([path, root]) == root
+        except ValueError:  # different drives on Windows
+            return False
+
+    def _resolve_info_selection(selection: str) -> str | None:
+        """Resolve a dropdown label, input/output-relative path or preview URL/id for /plypreview/info.
+
+        The route is unauthenticated, so only files inside the input/output folders or already
+        registered by a preview node are served; absolute paths elsewhere and ``..`` escapes are refused.
+        """
+        selection = selection.strip().strip('"')
+        ply_id = selection.rpartition(PLY_ROUTE_PREFIX)[2]
+        resolved = ply_registry.resolve(ply_id)
+        if resolved is None:
+            candidate = LoadGaussianPLY._resolve_selection(selection)
+            if candidate is None and os.path.isabs(selection):
+                candidate = selection
+            if candidate is None:
+                return None
+            real = os.path.realpath(candidate)
+            if not (_within(real, COMFYUI_INPUT_FOLDER) or _within(real, COMFYUI_OUTPUT_FOLDER) or ply_registry.contains(real)):
+                return None
+            resolved = real
+        if not os.path.isfile(resolved) or not resolved.lower().endswith((".ply", ".splat")):
+            return None
+        return resolved
+
+    def _cache_stats() -> dict:
+        return {
+            **derived_cache.stats(),
+            "decoded": decoded_cache.stats(),
+            "fingerprints": fingerprints.stats(),
+            "single_flight": single_flight.stats(),
+        }
+
+    async def plypreview_cache_stats(request):  # pragma: no cover - runtime route
+        # Stats scan the cache directory
+        return web.json_response(await run_blocking(_cache_stats))
+
+    async def plypreview_metrics(request):  # pragma: no cover - runtime route
+        query = request.rel_url.query
+        if query.get("reset") == "1":
+            metrics.reset()
+        wants_text = query.get("format") == "prometheus" or (
+            "format" not in query and "text/plain" in request.headers.get("Accept", "")
+        )
+        if wants_text:
+            # Exposition format 0.0.4; aiohttp's content_type= cannot carry the version parameter
+            return web.Response(
+                body=metrics.prometheus().encode("utf-8"),
+                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+            )
+        return web.json_response({**metrics.snapshot(), "cache": await run_blocking(_cache_stats)})
+
+    async def plypreview_profile(request):  # pragma: no cover - runtime route
+        query = request.rel_url.query
+        if request.method == "POST":
+            if "enabled" not in query:
+                return web.json_response({"error": "enabled=0|1 is required"}, status=400)
+            metrics.set_profiling(query["enabled"] == "1", reset=query.get("reset") == "1")
+            return web.json_response({"profiling": metrics.profile_enabled})
+        try:
+            limit = int(query.get("limit", 40))
+        except ValueError:
+            return web.json_response({"error": "limit must be an integer"}, status=400)
+        return web.Response(text=metrics.profile_report(query.get("sort", "cumulative"), limit), content_type="text/plain")
 
     try:
         PromptServer.instance.routes.get("/plypreview/files")(plypreview_list_ply_files)
         print("[PlyPreview] Registered /plypreview/files refresh endpoint")
+        PromptServer.instance.routes.get("/plypreview/cache")(plypreview_cache_stats)
+        print("[PlyPreview] Registered /plypreview/cache stats endpoint")
+        PromptServer.instance.routes.get("/plypreview/info")(plypreview_ply_info)
+        print("[PlyPreview] Registered /plypreview/info metadata endpoint")
+        PromptServer.instance.routes.get("/plypreview/metrics")(plypreview_metrics)
+        PromptServer.instance.routes.get("/plypreview/profile")(plypreview_profile)
+        PromptServer.instance.routes.post("/plypreview/profile")(plypreview_profile)
+        print("[PlyPreview] Registered /plypreview/metrics and /plypreview/profile endpoints")
+        PromptServer.instance.routes.get("/plypreview/ply/{ply_id}")(handle_ply_request)
+        print("[PlyPreview] Registered /plypreview/ply streaming endpoint")
     except Exception as e:  # pragma: no cover
         print(f"[PlyPreview] Warning: failed to register refresh endpoint: {e}")
 
@@ -49,5 +175,10 @@ __all__ = [
     "LoadGaussianPLY",
     "LoadGaussianPLYPath",
     "ProcessGaussianPLY",
+    "DownsampleGaussianPLY",
+    "BatchProcessGaussianPLY",
+    "CropGaussianPLY",
+    "MergeGaussianPLY",
     "PreviewGaussianNode",
+    "RenderGaussianPLY",
 ]
@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Content-addressed cache for derived PLY artifacts (filtered, converted, ...)."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from .common import COMFYUI_OUTPUT_FOLDER
+from .fingerprint import file_fingerprint
+
+# Override with PLYPREVIEW_CACHE_DIR / PLYPREVIEW_CACHE_MAX_MB
+DEFAULT_CACHE_MAX_MB = 8192
+
+
+def _default_cache_dir() -> str:
+    configured = os.environ.get("PLYPREVIEW_CACHE_DIR")
+    if configured:
+        return configured
+    if COMFYUI_OUTPUT_FOLDER:
+        return os.path.join(COMFYUI_OUTPUT_FOLDER, "plypreview_cache")
+    return os.path.join(tempfile.gettempdir(), "plypreview_cache")
+
+
+def _discard_decoded(path: str) -> None:
+    # Unpin the decoded/mapped copy so the file's space is freed (and it can be deleted on Windows)
+    try:
+        from .decoded_cache import decoded_cache
+    except ImportError:
+        return
+    decoded_cache.discard(path)
+
+
+class DerivedArtifactCache:
+    """Directory of derived files keyed by source fingerprint + operation parameters.
+
+    Entries are evicted least-recently-used first (tracked through file mtimes) once the
+    directory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def key(self, source_path: str, operation: str, params: dict) -> str:
+        payload = json.dumps(
+            {
+                "source": file_fingerprint(source_path),
+                "operation": operation,
+                "params": params,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, source_path: str, operation: str, params: dict, suffix: str, ext: str = ".ply") -> str:
+        """Deterministic cache location for the artifact; it may not exist yet."""
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        key = self.key(source_path, operation, params)
+        return os.path.join(self.directory, f"{stem}{suffix}-{key[:16]}{ext}")
+
+    def owns(self, path: str) -> bool:
+        """Whether ``path`` lies inside the cache directory (its lifetime is managed here)."""
+        root = os.path.realpath(self.directory)
+        try:
+            return os.path.commonpath([os.path.realpath(path), root]) == root
+        except ValueError:  # different drives on Windows
+            return False
+
+    def contains(self, path: str) -> bool:
+        """Whether ``path`` is cached, without counting a hit or miss (for rechecks after a lookup)."""
+        return os.path.isfile(path)
+
+    def lookup(self, path: str) -> str | None:
+        """Return ``path`` if cached (refreshing its LRU position), counting the hit or miss."""
+        with self._lock:
+            if os.path.isfile(path):
+                self.hits += 1
+                try:
+                    os.utime(path, None)
+                except OSError:
+                    pass
+                return path
+            self.misses += 1
+            return None
+
+    def prepare(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+    def commit(self, path: str) -> None:
+        """Register a freshly written artifact and enforce the size budget."""
+        with self._lock:
+            self._evict(keep=path)
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.endswith(".partial"):
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def _evict(self, keep: str | None = None) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+                continue
+            _discard_decoded(path)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+            print(f"[PlyPreview] Cache evicted: {os.path.basename(path)}")
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+derived_cache = DerivedArtifactCache(
+    _default_cache_dir(),
+    int(float(os.environ.get("PLYPREVIEW_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB)) * 1024 * 1024),
+)
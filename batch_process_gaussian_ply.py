@@ -0,0 +1,348 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import contextvars
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .common import COMFYUI_INPUT_FOLDER, COMFYUI_OUTPUT_FOLDER
+from .concurrency import atomic_write
+from .fingerprint import file_fingerprint
+from .load_gaussian_ply import OUTLIER_INPUTS, OUTPUT_INPUTS, PROFILE_INPUTS, PRUNE_INPUTS, LoadGaussianPLY
+from .metrics import metrics
+
+# Optional ComfyUI progress bar – avoid hard dependency for offline editing
+try:
+    from comfy.utils import ProgressBar  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover - environment-specific
+    ProgressBar = None
+
+MANIFEST_NAME = ".plypreview_batch.json"
+MANIFEST_VERSION = 1
+# workers = 0 runs this many files at once, fewer when RAM cannot hold that many scenes
+DEFAULT_WORKERS = 2
+# Peak memory of one job as a multiple of its source file size (decoded + filtered + encoded copies)
+JOB_MEMORY_FACTOR = 3
+
+
+def _available_memory() -> int | None:
+    """Bytes of RAM available for new allocations, or None when it cannot be determined."""
+    try:
+        with open("/proc/meminfo", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _output_name(relative_path: str, output_format: str) -> str:
+    from .compact_formats import FORMAT_SUFFIXES
+
+    stem = os.path.splitext(relative_path)[0]
+    ext = FORMAT_SUFFIXES[output_format][1] if output_format != "ply" else ".ply"
+    return stem + ext
+
+
+def _run_batch_job(job: dict) -> dict:
+    """Process one file on a worker thread."""
+    from .compact_formats import load_vertex_columns, write_gaussians
+    from .gaussian_cloud import GaussianCloud
+
+    start = time.perf_counter()
+    source = job["source"]
+    options = job["options"]
+    # Decode outside the shared LRU cache: each file is visited once per batch
+    cloud = GaussianCloud(source, (), path=source, data=load_vertex_columns(source))
+    n_original = len(cloud)
+    cloud = LoadGaussianPLY()._process_cloud(
+        cloud,
+        options["enable_opacity_filter"],
+        options["opacity_threshold"],
+        0,
+        options["outlier_removal"],
+        options["outlier_sigma"],
+        options["outlier_radius"],
+        options["prune_mode"],
+        options["prune_target_count"],
+        options["prune_target_mb"],
+        options["prune_center_weight"],
+        options["spatial_order"],
+        # Files already run in parallel; nested kernel pools would multiply the thread count
+        threads=1,
+        output_format=options["output_format"],
+    )
+
+    output = job["output"]
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with atomic_write(output) as tmp_path:
+        if not cloud.lineage and options["output_format"] == "ply" and source.lower().endswith(".ply"):
+            shutil.copyfile(source, tmp_path)
+        else:
+            write_gaussians(tmp_path, cloud.data, options["output_format"])
+    return {
+        "source": source,
+        "output": output,
+        "gaussians_in": n_original,
+        "gaussians_out": len(cloud),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class BatchProcessGaussianPLY:
+    """Apply the loader processing steps to every splat in a folder, in parallel."""
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "folder": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "tooltip": "Folder to scan (absolute or relative to ComfyUI output/input folders)",
+                }),
+                "pattern": ("STRING", {
+                    "default": "*.ply",
+                    "multiline": False,
+                    "tooltip": "Glob pattern matched inside the folder, e.g. *.ply, scene_*.splat or **/*.ply",
+                }),
+                "output_subfolder": ("STRING", {
+                    "default": "plypreview_batch",
+                    "multiline": False,
+                    "tooltip": "Results are written here under the ComfyUI output folder, mirroring the source layout",
+                }),
+                "workers": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 64,
+                    "step": 1,
+                    "tooltip": "Files processed at once on worker threads (0 = automatic: up to 2, fewer when RAM is short). Each worker holds one scene in memory",
+                }),
+            },
+            "optional": {
+                "skip_up_to_date": (["disabled", "enabled"], {
+                    "default": "enabled",
+                    "tooltip": "Skip files whose output already exists for the same source fingerprint and settings",
+                }),
+                "enable_opacity_filter": (["disabled", "enabled"], {
+                    "default": "disabled",
+                    "tooltip": "Filter out low-opacity Gaussians to reduce background noise",
+                }),
+                "opacity_threshold": ("FLOAT", {
+                    "default": 0.1,
+                    "min": 0.0,
+                    "max": 1.0,
+                    "step": 0.01,
+                    "tooltip": "Minimum opacity (0-1). Gaussians below this will be removed (used when filter enabled)",
+                }),
+                **OUTLIER_INPUTS,
+                **PRUNE_INPUTS,
+                **OUTPUT_INPUTS,
+                **PROFILE_INPUTS,
+            },
+        }
+
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("ply_paths",)
+    OUTPUT_IS_LIST = (True,)
+    FUNCTION = "batch_process"
+    CATEGORY = "PlyPreview"
+
+    @classmethod
+    def IS_CHANGED(cls, folder, pattern="*.ply", **kwargs):
+        # Re-run when any matched source is added, removed or modified
+        root = cls._resolve_folder(folder)
+        if root is None:
+            return folder
+        digest = hashlib.blake2b(digest_size=16)
+        for path in cls._collect_sources(root, pattern, None):
+            digest.update(file_fingerprint(path).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _resolve_folder(folder: str) -> str | None:
+        if not folder:
+            return None
+        candidate = folder.strip().strip('"')
+        if candidate == "":
+            return None
+        if os.path.isabs(candidate):
+            return candidate if os.path.isdir(candidate) else None
+        for base in (COMFYUI_OUTPUT_FOLDER, COMFYUI_INPUT_FOLDER):
+            if base is not None and os.path.isdir(os.path.join(base, candidate)):
+                return os.path.join(base, candidate)
+        return candidate if os.path.isdir(candidate) else None
+
+    @staticmethod
+    def _collect_sources(root: str, pattern: str, exclude_dir: str | None) -> list[str]:
+        exclude = os.path.realpath(exclude_dir) + os.sep if exclude_dir else None
+        sources = []
+        for path in glob.glob(os.path.join(glob.escape(root), pattern or "*.ply"), recursive=True):
+            if not os.path.isfile(path) or not path.lower().endswith((".ply", ".splat")):
+                continue
+            if exclude and os.path.realpath(path).startswith(exclude):
+                continue
+            sources.append(path)
+        return sorted(sources)
+
+    @staticmethod
+    def _options_key(options: dict) -> str:
+        return hashlib.blake2b(json.dumps(options, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _load_manifest(output_dir: str) -> dict:
+        try:
+            with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest.get("entries", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    @staticmethod
+    def _save_manifest(output_dir: str, entries: dict) -> None:
+        with atomic_write(os.path.join(output_dir, MANIFEST_NAME)) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, indent=1, sort_keys=True)
+
+    @staticmethod
+    def _worker_count(requested: int, sources: list[str]) -> int:
+        """``requested`` workers, or a RAM-bounded default for 0; always at least one."""
+        largest = max((os.path.getsize(path) for path in sources), default=0)
+        available = _available_memory()
+        fits = max(1, available // max(largest * JOB_MEMORY_FACTOR, 1)) if available else None
+        if requested > 0:
+            if fits is not None and requested > fits:
+                print(f"[BatchProcessGaussianPLY] Warning: {requested} workers may need ~{requested * largest * JOB_MEMORY_FACTOR / 2**30:.1f} GB, {available / 2**30:.1f} GB available")
+            return min(requested, len(sources))
+        workers = min(DEFAULT_WORKERS, os.cpu_count() or 1, len(sources))
+        return max(1, min(workers, fits)) if fits is not None else workers
+
+    @metrics.profile_input
+    def batch_process(
+        self,
+        folder: str,
+        pattern: str = "*.ply",
+        output_subfolder: str = "plypreview_batch",
+        workers: int = 0,
+        skip_up_to_date: str = "enabled",
+        enable_opacity_filter: str = "disabled",
+        opacity_threshold: float = 0.1,
+        outlier_removal: str = "disabled",
+        outlier_sigma: float = 3.0,
+        outlier_radius: float = 0.0,
+        prune_mode: str = "disabled",
+        prune_target_count: int = 1000000,
+        prune_target_mb: float = 100.0,
+        prune_center_weight: float = 0.0,
+        output_format: str = "ply",
+        spatial_order: str = "source",
+        profile: str = "disabled",
+    ):
+        root = self._resolve_folder(folder)
+        if root is None:
+            raise ValueError(f"Folder not found: {folder}")
+        if COMFYUI_OUTPUT_FOLDER is None:
+            raise ValueError("ComfyUI output folder is unavailable")
+        output_dir = os.path.join(COMFYUI_OUTPUT_FOLDER, output_subfolder.strip() or "plypreview_batch")
+
+        options = {
+            "enable_opacity_filter": enable_opacity_filter,
+            "opacity_threshold": round(float(opacity_threshold), 6),
+            "outlier_removal": outlier_removal,
+            "outlier_sigma": round(float(outlier_sigma), 6),
+            "outlier_radius": round(float(outlier_radius), 9),
+            "prune_mode": prune_mode,
+            "prune_target_count": int(prune_target_count),
+            "prune_target_mb": round(float(prune_target_mb), 6),
+            "prune_center_weight": round(float(prune_center_weight), 6),
+            "output_format": output_format,
+            "spatial_order": spatial_order,
+        }
+        options_key = self._options_key(options)
+
+        sources = self._collect_sources(root, pattern, output_dir)
+        print(f"[BatchProcessGaussianPLY] {len(sources)} files match {pattern!r} in {root}")
+        if not sources:
+            return ([],)
+
+        manifest = self._load_manifest(output_dir)
+        results: dict[str, str] = {}
+        jobs = []
+        claimed: set[str] = set()
+        for source in sources:
+            name = _output_name(os.path.relpath(source, root), output_format)
+            if name in claimed:
+                print(f"[BatchProcessGaussianPLY] Warning: {source} maps to an output already produced in this batch, skipping")
+                continue
+            claimed.add(name)
+            output = os.path.join(output_dir, name)
+            fingerprint = file_fingerprint(source)
+            entry = manifest.get(name)
+            if (
+                skip_up_to_date == "enabled"
+                and entry == {"source": fingerprint, "options": options_key}
+                and os.path.exists(output)
+            ):
+                results[source] = output
+                continue
+            jobs.append(({"source": source, "output": output, "options": options}, name, fingerprint))
+
+        skipped = len(results)
+        if skipped:
+            print(f"[BatchProcessGaussianPLY] {skipped} outputs up to date, skipped")
+
+        progress = ProgressBar(len(sources)) if ProgressBar is not None else None
+        if progress is not None and skipped:
+            progress.update(skipped)
+
+        failed = 0
+        start = time.perf_counter()
+        if jobs:
+            # Threads, not forked processes: the server process holds locks (caches, aiohttp,
+            # CUDA) that a fork could inherit mid-use, and numpy releases the GIL for the heavy work
+            workers = self._worker_count(workers, [job["source"] for job, _, _ in jobs])
+            print(f"[BatchProcessGaussianPLY] Processing {len(jobs)} files with {workers} worker thread(s)")
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Each job runs in a copy of this context so a per-call profile switch reaches the workers
+                    futures = {
+                        executor.submit(contextvars.copy_context().run, _run_batch_job, job): (job, name, fingerprint)
+                        for job, name, fingerprint in jobs
+                    }
+                    for future in as_completed(futures):
+                        job, name, fingerprint = futures[future]
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            failed += 1
+                            manifest.pop(name, None)
+                            print(f"[BatchProcessGaussianPLY] Error processing {job['source']}: {e}")
+                        else:
+                            results[job["source"]] = result["output"]
+                            manifest[name] = {"source": fingerprint, "options": options_key}
+                            print(
+                                f"[BatchProcessGaussianPLY] {os.path.basename(job['source'])}: "
+                                f"{result['gaussians_in']} -> {result['gaussians_out']} gaussians in {result['seconds']:.2f}s"
+                            )
+                        if progress is not None:
+                            progress.update(1)
+            finally:
+                os.makedirs(output_dir, exist_ok=True)
+                self._save_manifest(output_dir, manifest)
+
+        elapsed = time.perf_counter() - start
+        done = len(results) - skipped
+        rate = f", {done / elapsed:.2f} files/s" if done and elapsed > 0 else ""
+        print(f"[BatchProcessGaussianPLY] Done: {done} processed, {skipped} skipped, {failed} failed in {elapsed:.2f}s{rate}")
+        print(f"[BatchProcessGaussianPLY] Outputs in: {output_dir}")
+        return ([results[source] for source in sources if source in results],)
@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compare source vs Morton (Z-order) row order on a synthetic Gaussian scene.
+
+Reports the gzip size of the written PLY and of its chunk-quantized ``compressed_ply``
+encoding, that encoding's max position error, and a viewer frame-time proxy: the
+per-frame work gsplat.js does on the CPU (view-depth argsort plus gathering the
+32-byte splat rows in that order) averaged over random camera directions.
+
+    python benchmarks/morton_order.py --gaussians 2000000
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import load_package, synthetic_scene
+
+
+def gzip_size(path: str) -> int:
+    with open(path, "rb") as f:
+        return len(gzip.compress(f.read(), compresslevel=6))
+
+
+def frame_time_ms(vertices: np.ndarray, compact, frames: int, seed: int = 1) -> float:
+    rows = compact.encode_splat(vertices)
+    xyz = np.stack([vertices[name] for name in ("x", "y", "z")], axis=1)
+    directions = np.random.default_rng(seed).normal(size=(frames, 3)).astype(np.float32)
+    start = time.perf_counter()
+    for direction in directions:
+        order = np.argsort(xyz @ direction)
+        np.take(rows, order)
+    return 1000.0 * (time.perf_counter() - start) / frames
+
+
+def max_compressed_error(vertices: np.ndarray, compact) -> float:
+    decoded = compact.decode_compressed(*[data for _, data in compact.encode_compressed(vertices)[:2]])
+    return float(max(np.abs(decoded[name] - vertices[name]).max() for name in ("x", "y", "z")))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gaussians", type=int, default=1_000_000)
+    parser.add_argument("--frames", type=int, default=10)
+    args = parser.parse_args()
+
+    package = load_package()
+    ops, compact, ply_io = package("gaussian_ops"), package("compact_formats"), package("ply_io")
+    source = synthetic_scene(args.gaussians)
+    start = time.perf_counter()
+    sorted_rows = source[ops.morton_order(source)]
+    sort_seconds = time.perf_counter() - start
+
+    print(f"{args.gaussians} gaussians, Morton sort {sort_seconds:.2f}s")
+    print(f"{'order':<8} {'ply MB':>8} {'gzip MB':>8} {'ratio':>6} {'cply gz MB':>10} {'cply err':>9} {'frame ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, vertices in (("source", source), ("morton", sorted_rows)):
+            path = os.path.join(tmp, f"{label}.ply")
+            ply_io.write_vertex_ply(path, vertices)
+            raw = os.path.getsize(path)
+            packed = gzip_size(path)
+            compressed_path = os.path.join(tmp, f"{label}.compressed.ply")
+            compact.write_gaussians(compressed_path, vertices, "compressed_ply")
+            print(
+                f"{label:<8} {raw / 2**20:8.1f} {packed / 2**20:8.1f} {raw / packed:6.2f} "
+                f"{gzip_size(compressed_path) / 2**20:10.1f} {max_compressed_error(vertices, compact):9.4f} "
+                f"{frame_time_ms(vertices, compact, args.frames):9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
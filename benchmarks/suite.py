@@ -0,0 +1,265 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Scaling benchmarks for the node hot paths on synthetic Gaussian PLYs.
+
+Generates deterministic scenes (see ``synthetic.py``) and times PLY writing, the
+opacity filter (``LoadGaussianPLY._filter_by_opacity``), the Preview node's metadata
+path (cold and warm), ``get_recommended_resolution`` and the dropdown listing
+(``LoadGaussianPLY._get_ply_files``) over a large directory tree. Each result records
+wall time, Gaussians/s and peak RSS; the JSON report can be diffed between commits:
+
+    python benchmarks/suite.py --gaussians 100000 1000000 --sh-degree 0 3 --output before.json
+    python benchmarks/suite.py --gaussians 100000 1000000 --sh-degree 0 3 --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import REPO_ROOT, load_package, write_synthetic_ply
+
+# Peak RSS sources: /proc on Linux, ``resource`` on other POSIX systems, psutil (optional) on Windows
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+try:
+    import psutil  # type: ignore[import-not-found]
+except ImportError:
+    psutil = None
+
+# Node log output is swallowed during timed runs unless --verbose is given
+VERBOSE = False
+
+
+def _clear_peak_rss() -> bool:
+    # Linux: writing 5 to clear_refs resets VmHWM so each stage reports its own peak
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size in MB, or None when the platform offers no way to read it."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        # Process-lifetime peak (bytes on macOS, KiB elsewhere)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        # peak_wset is the Windows peak working set; other platforms only report the current RSS
+        return getattr(memory, "peak_wset", memory.rss) / 2**20
+    return None
+
+
+def measure(name: str, fn, repeat: int = 1, gaussians: int | None = None, setup=None, **labels) -> dict:
+    """Run ``fn`` ``repeat`` times (after ``setup`` each time) and keep the fastest run."""
+    best = None
+    peak = None
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        _clear_peak_rss()
+        with contextlib.redirect_stdout(sys.stdout if VERBOSE else io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        sample = _peak_rss_mb()
+        if sample is not None:
+            peak = sample if peak is None else max(peak, sample)
+        best = elapsed if best is None else min(best, elapsed)
+    result = {"name": name, **labels, "gaussians": gaussians, "seconds": round(best, 6), "peak_rss_mb": round(peak, 1) if peak is not None else None}
+    if gaussians:
+        result["gaussians_per_s"] = round(gaussians / best) if best > 0 else None
+    print(
+        f"{name:<22} {str(labels.get('sh_degree', '')):>2} {labels.get('format', ''):<6} "
+        f"{gaussians or '':>10} {best:9.3f}s {result.get('gaussians_per_s') or '':>12} {f'{peak:9.1f} MB' if peak is not None else 'n/a':>12}"
+    )
+    return result
+
+
+def bench_scene(package, workspace: str, n: int, sh_degree: int, binary: bool, repeat: int, threshold: float) -> list[dict]:
+    loader_module = package("load_gaussian_ply")
+    decoded_cache = package("decoded_cache").decoded_cache
+    derived_cache = package("artifact_cache").derived_cache
+    preview_module = package("preview_gaussian")
+
+    fmt = "binary" if binary else "ascii"
+    labels = {"sh_degree": sh_degree, "format": fmt}
+    path = os.path.join(workspace, "output", f"synthetic_{n}_sh{sh_degree}_{fmt}.ply")
+    results = [measure("write_ply", lambda: write_synthetic_ply(path, n, sh_degree, binary), 1, n, **labels)]
+    results[-1]["file_mb"] = round(os.path.getsize(path) / 2**20, 2)
+
+    loader = loader_module.LoadGaussianPLY()
+    filtered = derived_cache.path_for(path, *loader._opacity_step(threshold))
+
+    def cold_filter():
+        decoded_cache.clear()
+        if os.path.exists(filtered):
+            os.remove(filtered)
+
+    results.append(measure("filter_opacity", lambda: loader._filter_by_opacity(path, threshold), repeat, n, setup=cold_filter, **labels))
+
+    preview = preview_module.PreviewGaussianNode()
+    info_index = package("ply_info").ply_info_index
+
+    def cold_metadata():
+        info_index._entries = {}
+
+    results.append(measure("preview_metadata_cold", lambda: preview.preview_gaussian(path), repeat, n, setup=cold_metadata, **labels))
+    results.append(measure("preview_metadata_warm", lambda: preview.preview_gaussian(path), repeat, n, **labels))
+    os.remove(path)
+    if os.path.exists(filtered):
+        os.remove(filtered)
+    return results
+
+
+def bench_resolution(package, calls: int, repeat: int) -> dict:
+    get_recommended_resolution = package("common").get_recommended_resolution
+    fovs = np.linspace(10.0, 180.0, calls).tolist()
+    scales = np.linspace(1.0, 50.0, calls).tolist()
+
+    def run():
+        for fov, scale in zip(fovs, scales):
+            get_recommended_resolution(fov, scale)
+
+    result = measure("recommended_resolution", run, repeat)
+    result["calls"] = calls
+    result["calls_per_s"] = round(calls / result["seconds"]) if result["seconds"] > 0 else None
+    return result
+
+
+def bench_file_listing(package, workspace: str, files: int, per_dir: int, repeat: int) -> list[dict]:
+    file_index = package("file_index")
+    loader = package("load_gaussian_ply").LoadGaussianPLY
+    root = os.path.join(workspace, "input", "scenes")
+    for i in range(files):
+        folder = os.path.join(root, f"batch_{i // per_dir:05d}")
+        if i % per_dir == 0:
+            os.makedirs(folder, exist_ok=True)
+        open(os.path.join(folder, f"scene_{i:07d}.ply"), "wb").close()
+
+    def fresh_index():
+        file_index.ply_file_index = file_index._build_index()
+        package("load_gaussian_ply").ply_file_index = file_index.ply_file_index
+
+    labels = {"files": files, "directories": -(-files // per_dir)}
+    results = [measure("list_ply_files_cold", loader._get_ply_files, repeat, setup=fresh_index, **labels)]
+
+    def expire():
+        file_index.ply_file_index._validated_at = 0.0
+
+    results.append(measure("list_ply_files_warm", loader._get_ply_files, repeat, setup=expire, **labels))
+    listed = len(loader._get_ply_files())
+    for result in results:
+        result["entries"] = listed
+    shutil.rmtree(root)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _result_key(result: dict) -> tuple:
+    return tuple((k, result[k]) for k in ("name", "sh_degree", "format", "gaussians", "files") if result.get(k) is not None)
+
+
+def compare(baseline_path: str, results: list[dict]) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {_result_key(r): r for r in json.load(f)["results"]}
+    print(f"\nvs {baseline_path}: time ratio (<1 is faster), peak RSS delta")
+    for result in results:
+        before = baseline.get(_result_key(result))
+        if before is None or not before["seconds"]:
+            continue
+        label = " ".join(str(v) for _, v in _result_key(result))
+        ratio = result["seconds"] / before["seconds"]
+        if result["peak_rss_mb"] is None or before.get("peak_rss_mb") is None:
+            print(f"  {label:<48} {ratio:6.2f}x {'n/a':>12}")
+        else:
+            print(f"  {label:<48} {ratio:6.2f}x {result['peak_rss_mb'] - before['peak_rss_mb']:+9.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gaussians", type=int, nargs="+", default=[100_000, 1_000_000], help="scene sizes (100k-20M)")
+    parser.add_argument("--sh-degree", type=int, nargs="+", default=[3], choices=[0, 1, 2, 3])
+    parser.add_argument("--formats", nargs="+", default=["binary"], choices=["binary", "ascii"])
+    parser.add_argument("--files", type=int, default=20_000, help="PLY files in the listing benchmark")
+    parser.add_argument("--files-per-dir", type=int, default=200)
+    parser.add_argument("--resolution-calls", type=int, default=100_000)
+    parser.add_argument("--threshold", type=float, default=0.1, help="opacity filter threshold")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--workspace", help="scratch directory (default: a temporary directory)")
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the nodes' log output")
+    args = parser.parse_args()
+
+    global VERBOSE
+    VERBOSE = args.verbose
+
+    workspace = args.workspace or tempfile.mkdtemp(prefix="plypreview_bench_")
+    for sub in ("input", "output", "cache"):
+        os.makedirs(os.path.join(workspace, sub), exist_ok=True)
+    # Must be set before the package modules are imported
+    os.environ["PLYPREVIEW_CACHE_DIR"] = os.path.join(workspace, "cache")
+    os.environ["PLYPREVIEW_INDEX_TTL"] = "0"
+    package = load_package(workspace)
+
+    print(f"{'benchmark':<22} {'sh':>2} {'format':<6} {'gaussians':>10} {'wall':>10} {'gaussians/s':>12} {'peak RSS':>12}")
+    results = []
+    try:
+        for n in args.gaussians:
+            for sh_degree in args.sh_degree:
+                for fmt in args.formats:
+                    results += bench_scene(package, workspace, n, sh_degree, fmt == "binary", args.repeat, args.threshold)
+        results.append(bench_resolution(package, args.resolution_calls, args.repeat))
+        results += bench_file_listing(package, workspace, args.files, args.files_per_dir, args.repeat)
+    finally:
+        if not args.workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    report = {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "workspace", "verbose")},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
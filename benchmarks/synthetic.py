@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Deterministic synthetic 3DGS scenes and the package loader shared by the benchmarks.
+
+Rows are generated in fixed-size blocks, each seeded from ``(seed, block index)``, so a
+scene is identical however it is consumed and 20M-Gaussian files are written with
+bounded memory.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rows generated per block; part of the scene definition, so changing it changes the data
+SYNTHETIC_BLOCK_ROWS = 1 << 20
+CLUSTERS = 256
+
+
+def load_package(workspace: str | None = None):
+    """Import the node modules as ``plypreview.*`` without running the package ``__init__``.
+
+    With ``workspace``, a stand-in ``folder_paths`` module points the ComfyUI input/output
+    folders at ``workspace/input`` and ``workspace/output``. Returns an import function.
+    """
+    if workspace is not None and "folder_paths" not in sys.modules:
+        folder_paths = types.ModuleType("folder_paths")
+        folder_paths.get_input_directory = lambda: os.path.join(workspace, "input")
+        folder_paths.get_output_directory = lambda: os.path.join(workspace, "output")
+        sys.modules["folder_paths"] = folder_paths
+    package = types.ModuleType("plypreview")
+    package.__path__ = [REPO_ROOT]
+    sys.modules.setdefault("plypreview", package)
+    return lambda name: importlib.import_module(f"plypreview.{name}")
+
+
+def vertex_dtype(sh_degree: int = 0) -> np.dtype:
+    """Property layout written by the reference 3DGS trainer for ``sh_degree``."""
+    rest = 3 * ((sh_degree + 1) ** 2 - 1)
+    names = ["x", "y", "z", "nx", "ny", "nz", "f_dc_0", "f_dc_1", "f_dc_2"]
+    names += [f"f_rest_{i}" for i in range(rest)]
+    names += ["opacity", "scale_0", "scale_1", "scale_2", "rot_0", "rot_1", "rot_2", "rot_3"]
+    return np.dtype([(name, "<f4") for name in names])
+
+
+def iter_synthetic_blocks(n: int, seed: int = 0, sh_degree: int = 0):
+    """Yield the rows of a synthetic scene in consecutive blocks of at most ``SYNTHETIC_BLOCK_ROWS``.
+
+    Gaussians form surface-like clusters in random row order, as produced by densifying
+    optimizers; opacities and log-scales follow typical trained-scene distributions.
+    """
+    dtype = vertex_dtype(sh_degree)
+    rest = [name for name in dtype.names if name.startswith("f_rest_")]
+    scene = np.random.default_rng(seed)
+    centers = scene.uniform(-10, 10, size=(CLUSTERS, 3))
+    normal = scene.normal(size=(CLUSTERS, 3))
+    normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+    base_color = scene.normal(size=(CLUSTERS, 3))
+
+    for block, begin in enumerate(range(0, n, SYNTHETIC_BLOCK_ROWS)):
+        rows = min(SYNTHETIC_BLOCK_ROWS, n - begin)
+        rng = np.random.default_rng([seed, block])
+        data = np.zeros(rows, dtype=dtype)
+        cluster = rng.integers(0, CLUSTERS, rows)
+        offset = rng.normal(scale=1.5, size=(rows, 3))
+        offset -= np.sum(offset * normal[cluster], axis=1, keepdims=True) * normal[cluster] * 0.95
+        position = centers[cluster] + offset
+        for axis, name in enumerate(("x", "y", "z")):
+            data[name] = position[:, axis]
+        for channel in range(3):
+            data[f"f_dc_{channel}"] = base_color[cluster, channel] + rng.normal(scale=0.2, size=rows)
+        for name in rest:
+            data[name] = rng.normal(scale=0.05, size=rows)
+        data["opacity"] = rng.normal(1.0, 1.5, rows)
+        for axis in range(3):
+            data[f"scale_{axis}"] = rng.normal(-4.5, 0.5, rows)
+        rotation = rng.normal(size=(rows, 4))
+        rotation /= np.linalg.norm(rotation, axis=1, keepdims=True)
+        for axis in range(4):
+            data[f"rot_{axis}"] = rotation[:, axis]
+        yield data
+
+
+def synthetic_scene(n: int, seed: int = 0, sh_degree: int = 0) -> np.ndarray:
+    """The whole synthetic scene as one structured array."""
+    return np.concatenate(list(iter_synthetic_blocks(n, seed, sh_degree))) if n else np.zeros(0, vertex_dtype(sh_degree))
+
+
+def write_synthetic_ply(path: str, n: int, sh_degree: int = 3, binary: bool = True, seed: int = 0) -> None:
+    """Write a synthetic scene as a binary little-endian or ASCII PLY with bounded memory."""
+    dtype = vertex_dtype(sh_degree)
+    blocks = iter_synthetic_blocks(n, seed, sh_degree)
+    if binary:
+        ply_io = load_package()("ply_io")
+        ply_io.write_vertex_chunks(path, dtype, n, blocks)
+        return
+
+    lines = ["ply", "format ascii 1.0", f"element vertex {n}"]
+    lines += [f"property float {name}" for name in dtype.names]
+    lines.append("end_header")
+    with open(path, "w", encoding="ascii", newline="\n") as f:
+        f.write("\n".join(lines) + "\n")
+        for block in blocks:
+            columns = block.view(np.float32).reshape(len(block), len(dtype.names))
+            np.savetxt(f, columns, fmt="%.7g")
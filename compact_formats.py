@@ -0,0 +1,357 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Compact Gaussian splat encodings: float16 PLY, antimatter15 ``.splat`` and chunk-quantized PLY.
+
+All encoders and decoders are vectorized over whole columns. Decoders return the usual
+float32 3DGS vertex columns (``x``, ``f_dc_*``, ``opacity`` logits, log ``scale_*``, ``rot_*``).
+"""
+
+import os
+
+import numpy as np
+
+from .ply_io import (
+    PlyHeader,
+    header_byte_size,
+    open_element_memmap,
+    read_ply_header,
+    read_vertex_data,
+    rows_for_byte_budget,
+    write_ply_elements,
+    write_vertex_ply,
+)
+
+OUTPUT_FORMATS = ("ply", "ply_float16", "splat", "compressed_ply")
+
+# File suffix and extension of each non-default format in the derived cache
+FORMAT_SUFFIXES = {
+    "ply_float16": ("_f16", ".ply"),
+    "splat": ("", ".splat"),
+    "compressed_ply": ("_compressed", ".compressed.ply"),
+}
+
+SH_C0 = 0.28209479177387814
+POSITION_FIELDS = ("x", "y", "z")
+SCALE_FIELDS = ("scale_0", "scale_1", "scale_2")
+DC_FIELDS = ("f_dc_0", "f_dc_1", "f_dc_2")
+ROTATION_FIELDS = ("rot_0", "rot_1", "rot_2", "rot_3")
+
+SPLAT_DTYPE = np.dtype([("position", "<f4", (3,)), ("scale", "<f4", (3,)), ("color", "u1", (4,)), ("rotation", "u1", (4,))])
+
+# Rows sharing one set of quantization bounds in the compressed PLY layout
+COMPRESSED_CHUNK_ROWS = 256
+COMPRESSED_CHUNK_FIELDS = (
+    "min_x", "min_y", "min_z", "max_x", "max_y", "max_z",
+    "min_scale_x", "min_scale_y", "min_scale_z", "max_scale_x", "max_scale_y", "max_scale_z",
+    "min_r", "min_g", "min_b", "max_r", "max_g", "max_b",
+)
+COMPRESSED_VERTEX_FIELDS = ("packed_position", "packed_rotation", "packed_scale", "packed_color")
+
+
+def _column(vertices: np.ndarray, name: str, default: float = 0.0) -> np.ndarray:
+    if name in vertices.dtype.names:
+        return np.asarray(vertices[name], dtype=np.float32)
+    return np.full(len(vertices), default, dtype=np.float32)
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-values))
+
+
+def _logit(values: np.ndarray) -> np.ndarray:
+    values = np.clip(values, 1e-6, 1.0 - 1e-6)
+    return np.log(values) - np.log1p(-values)
+
+
+def _normalized_rotation(vertices: np.ndarray) -> np.ndarray:
+    rotation = np.stack([_column(vertices, name, 1.0 if name == "rot_0" else 0.0) for name in ROTATION_FIELDS], axis=1)
+    norm = np.linalg.norm(rotation, axis=1, keepdims=True)
+    rotation /= np.where(norm > 0, norm, 1.0)
+    return rotation
+
+
+def _gaussian_dtype(rest_fields: list[str]) -> np.dtype:
+    names = list(POSITION_FIELDS) + list(DC_FIELDS) + rest_fields + ["opacity"] + list(SCALE_FIELDS) + list(ROTATION_FIELDS)
+    return np.dtype([(name, "<f4") for name in names])
+
+
+# === float16 PLY ===
+
+def float16_dtype(dtype: np.dtype) -> np.dtype:
+    """Row layout written by ``encode_float16`` for vertices of ``dtype``."""
+    fields = []
+    for name in dtype.names:
+        field = dtype[name]
+        if field.kind == "f":
+            field = np.dtype("<f4") if name in POSITION_FIELDS else np.dtype("<f2")
+        fields.append((name, field))
+    return np.dtype(fields)
+
+
+def encode_float16(vertices: np.ndarray) -> np.ndarray:
+    """Store every float column as ``half`` except positions, which need float32 range/precision."""
+    return vertices.astype(float16_dtype(vertices.dtype))
+
+
+# === antimatter15 .splat (32 bytes per Gaussian) ===
+
+def encode_splat(vertices: np.ndarray) -> np.ndarray:
+    """Pack to the 32-byte ``.splat`` row: float32 position and linear scale, RGBA8, quaternion8."""
+    rows = np.empty(len(vertices), dtype=SPLAT_DTYPE)
+    rows["position"] = np.stack([_column(vertices, name) for name in POSITION_FIELDS], axis=1)
+    rows["scale"] = np.exp(np.stack([_column(vertices, name) for name in SCALE_FIELDS], axis=1))
+    color = np.empty((len(vertices), 4), dtype=np.float32)
+    for channel, name in enumerate(DC_FIELDS):
+        color[:, channel] = (0.5 + SH_C0 * _column(vertices, name)) * 255.0
+    color[:, 3] = _sigmoid(_column(vertices, "opacity", 10.0)) * 255.0
+    rows["color"] = np.clip(np.rint(color), 0, 255)
+    rows["rotation"] = np.clip(np.rint(_normalized_rotation(vertices) * 128.0 + 128.0), 0, 255)
+    return rows
+
+
+def decode_splat(rows: np.ndarray) -> np.ndarray:
+    rows = rows.view(SPLAT_DTYPE).reshape(-1)
+    vertices = np.empty(len(rows), dtype=_gaussian_dtype([]))
+    position = rows["position"]
+    scale = np.log(np.maximum(rows["scale"], 1e-30))
+    color = rows["color"].astype(np.float32) / 255.0
+    rotation = (rows["rotation"].astype(np.float32) - 128.0) / 128.0
+    for axis in range(3):
+        vertices[POSITION_FIELDS[axis]] = position[:, axis]
+        vertices[SCALE_FIELDS[axis]] = scale[:, axis]
+        vertices[DC_FIELDS[axis]] = (color[:, axis] - 0.5) / SH_C0
+    vertices["opacity"] = _logit(color[:, 3])
+    for axis, name in enumerate(ROTATION_FIELDS):
+        vertices[name] = rotation[:, axis]
+    return vertices
+
+
+# === chunk-quantized PLY (PlayCanvas / SuperSplat "compressed.ply") ===
+
+def _chunk_bounds(values: np.ndarray, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return np.minimum.reduceat(values, starts, axis=0), np.maximum.reduceat(values, starts, axis=0)
+
+
+def _quantize(values: np.ndarray, low: np.ndarray, high: np.ndarray, chunk: np.ndarray, bits: int) -> np.ndarray:
+    span = high - low
+    span = np.where(span > 0, span, 1.0)
+    scaled = (values - low[chunk]) / span[chunk]
+    top = (1 << bits) - 1
+    return np.clip(np.rint(scaled * top), 0, top).astype(np.uint32)
+
+
+def _pack_11_10_11(quantized: list[np.ndarray]) -> np.ndarray:
+    return (quantized[0] << 21) | (quantized[1] << 11) | quantized[2]
+
+
+def encode_compressed(vertices: np.ndarray) -> list[tuple[str, np.ndarray]]:
+    """Encode to ``chunk``/``vertex``/``sh`` elements with per-256-row bounds.
+
+    Position and log-scale are 11/10/11-bit fractions of their chunk's box, DC color is
+    8-bit within the chunk's color range plus 8-bit opacity, and the rotation stores the
+    index of its largest component (2 bits) and the other three at 10 bits. Higher-order
+    SH coefficients are kept as 8-bit values in ``[-4, 4)``. Rows are chunked in their
+    current order, so spatially sorted input compresses with less error.
+    """
+    n = len(vertices)
+    starts = np.arange(0, n, COMPRESSED_CHUNK_ROWS)
+    chunk = np.arange(n) // COMPRESSED_CHUNK_ROWS
+    chunks = np.empty(len(starts), dtype=[(name, "<f4") for name in COMPRESSED_CHUNK_FIELDS])
+    packed = np.empty(n, dtype=[(name, "<u4") for name in COMPRESSED_VERTEX_FIELDS])
+
+    def pack_vector(fields, prefix_low, prefix_high, suffixes):
+        values = np.stack([_column(vertices, name) for name in fields], axis=1)
+        low, high = _chunk_bounds(values, starts)
+        for axis, suffix in enumerate(suffixes):
+            chunks[prefix_low + suffix] = low[:, axis]
+            chunks[prefix_high + suffix] = high[:, axis]
+        bits = (11, 10, 11)
+        return _pack_11_10_11([_quantize(values[:, axis], low[:, axis], high[:, axis], chunk, bits[axis]) for axis in range(3)])
+
+    packed["packed_position"] = pack_vector(POSITION_FIELDS, "min_", "max_", ("x", "y", "z"))
+    packed["packed_scale"] = pack_vector(SCALE_FIELDS, "min_scale_", "max_scale_", ("x", "y", "z"))
+
+    color = np.stack([0.5 + SH_C0 * _column(vertices, name) for name in DC_FIELDS], axis=1)
+    low, high = _chunk_bounds(color, starts)
+    packed_color = np.zeros(n, dtype=np.uint32)
+    for axis, channel in enumerate("rgb"):
+        chunks["min_" + channel] = low[:, axis]
+        chunks["max_" + channel] = high[:, axis]
+        packed_color |= _quantize(color[:, axis], low[:, axis], high[:, axis], chunk, 8) << (24 - 8 * axis)
+    alpha = _sigmoid(_column(vertices, "opacity", 10.0))
+    packed_color |= np.clip(np.rint(alpha * 255.0), 0, 255).astype(np.uint32)
+    packed["packed_color"] = packed_color
+
+    rotation = _normalized_rotation(vertices)
+    largest = np.argmax(np.abs(rotation), axis=1)
+    rows = np.arange(n)
+    rotation *= np.where(rotation[rows, largest] < 0, -1.0, 1.0)[:, None]
+    others = np.array([[j for j in range(4) if j != i] for i in range(4)])[largest]
+    packed_rotation = largest.astype(np.uint32) << 30
+    for slot in range(3):
+        value = rotation[rows, others[:, slot]] * (np.sqrt(2.0) * 0.5) + 0.5
+        packed_rotation |= np.clip(np.rint(value * 1023.0), 0, 1023).astype(np.uint32) << (20 - 10 * slot)
+    packed["packed_rotation"] = packed_rotation
+
+    elements = [("chunk", chunks), ("vertex", packed)]
+    rest_fields = [name for name in vertices.dtype.names if name.startswith("f_rest_")]
+    if rest_fields:
+        sh = np.empty(n, dtype=[(name, "u1") for name in rest_fields])
+        for name in rest_fields:
+            sh[name] = np.clip(np.trunc((_column(vertices, name) / 8.0 + 0.5) * 256.0), 0, 255)
+        elements.append(("sh", sh))
+    return elements
+
+
+def _dequantize(packed: np.ndarray, shift: int, bits: int, low: np.ndarray, high: np.ndarray, chunk: np.ndarray) -> np.ndarray:
+    fraction = ((packed >> shift) & ((1 << bits) - 1)).astype(np.float32) / float((1 << bits) - 1)
+    return low[chunk] + fraction * (high[chunk] - low[chunk])
+
+
+def decode_compressed(chunks: np.ndarray, packed: np.ndarray, sh: np.ndarray | None = None) -> np.ndarray:
+    n = len(packed)
+    rest_fields = list(sh.dtype.names) if sh is not None else []
+    vertices = np.empty(n, dtype=_gaussian_dtype(rest_fields))
+    chunk = np.arange(n) // COMPRESSED_CHUNK_ROWS
+    names = chunks.dtype.names
+
+    def bound(name):
+        return np.asarray(chunks[name], dtype=np.float32)
+
+    position = np.asarray(packed["packed_position"], dtype=np.uint32)
+    scale = np.asarray(packed["packed_scale"], dtype=np.uint32)
+    for index, (axis, shift, bits) in enumerate((("x", 21, 11), ("y", 11, 10), ("z", 0, 11))):
+        vertices[axis] = _dequantize(position, shift, bits, bound("min_" + axis), bound("max_" + axis), chunk)
+        vertices[SCALE_FIELDS[index]] = _dequantize(scale, shift, bits, bound("min_scale_" + axis), bound("max_scale_" + axis), chunk)
+
+    color = np.asarray(packed["packed_color"], dtype=np.uint32)
+    for axis, channel in enumerate("rgb"):
+        if "min_" + channel in names:
+            value = _dequantize(color, 24 - 8 * axis, 8, bound("min_" + channel), bound("max_" + channel), chunk)
+        else:
+            value = ((color >> (24 - 8 * axis)) & 255).astype(np.float32) / 255.0
+        vertices[DC_FIELDS[axis]] = (value - 0.5) / SH_C0
+    vertices["opacity"] = _logit((color & 255).astype(np.float32) / 255.0)
+
+    rotation_bits = np.asarray(packed["packed_rotation"], dtype=np.uint32)
+    largest = (rotation_bits >> 30).astype(np.int64)
+    others = np.stack(
+        [(((rotation_bits >> (20 - 10 * slot)) & 1023).astype(np.float32) / 1023.0 - 0.5) * np.sqrt(2.0) for slot in range(3)],
+        axis=1,
+    )
+    rotation = np.empty((n, 4), dtype=np.float32)
+    rows = np.arange(n)
+    rotation[rows, largest] = np.sqrt(np.maximum(0.0, 1.0 - np.sum(others * others, axis=1)))
+    slots = np.array([[j for j in range(4) if j != i] for i in range(4)])[largest]
+    for slot in range(3):
+        rotation[rows, slots[:, slot]] = others[:, slot]
+    for axis, name in enumerate(ROTATION_FIELDS):
+        vertices[name] = rotation[:, axis]
+
+    for name in rest_fields:
+        vertices[name] = ((np.asarray(sh[name], dtype=np.float32) + 0.5) / 256.0 - 0.5) * 8.0
+    return vertices
+
+
+def is_compressed_ply(header: PlyHeader) -> bool:
+    return header.element("chunk") is not None and "packed_position" in header.vertex_fields
+
+
+# === dispatch ===
+
+def load_vertex_columns(path: str, header: PlyHeader | None = None) -> np.ndarray:
+    """Vertex columns of any supported file: plain/float16 PLY (memory-mapped), compressed PLY or ``.splat``."""
+    if path.lower().endswith(".splat"):
+        return decode_splat(np.fromfile(path, dtype=np.uint8))
+    if header is None:
+        header = read_ply_header(path)
+    if is_compressed_ply(header):
+        sh = open_element_memmap(path, "sh", header) if header.element("sh") is not None else None
+        return decode_compressed(open_element_memmap(path, "chunk", header), open_element_memmap(path, "vertex", header), sh)
+    return read_vertex_data(path, header)
+
+
+def compact_vertex_dtype(path: str, header: PlyHeader | None = None) -> np.dtype:
+    """Decoded columns of a compressed PLY or ``.splat`` file, read from the header alone."""
+    if path.lower().endswith(".splat"):
+        return _gaussian_dtype([])
+    if header is None:
+        header = read_ply_header(path)
+    sh = header.element("sh")
+    return _gaussian_dtype(list(sh.dtype(header.byte_order).names) if sh is not None else [])
+
+
+def compact_vertex_count(path: str, header: PlyHeader | None = None) -> int:
+    """Gaussian count of a compressed PLY (from its header) or ``.splat`` (from its size)."""
+    if path.lower().endswith(".splat"):
+        return os.path.getsize(path) // SPLAT_DTYPE.itemsize
+    if header is None:
+        header = read_ply_header(path)
+    return header.vertex_count
+
+
+def iter_compact_chunks(path: str, chunk_rows: int, header: PlyHeader | None = None):
+    """Decode a compressed PLY or ``.splat`` file in slices of at most ``chunk_rows`` rows.
+
+    The file is memory-mapped and only the current slice is decoded. Compressed slices are
+    rounded up to whole ``COMPRESSED_CHUNK_ROWS`` blocks so each decodes against its own bounds.
+    """
+    count = compact_vertex_count(path, header)
+    if count == 0:
+        return
+    if path.lower().endswith(".splat"):
+        rows = np.memmap(path, dtype=SPLAT_DTYPE, mode="r", shape=(count,))
+        step = max(1, int(chunk_rows))
+        for start in range(0, count, step):
+            yield decode_splat(np.asarray(rows[start:start + step]))
+        return
+    if header is None:
+        header = read_ply_header(path)
+    chunks = open_element_memmap(path, "chunk", header)
+    packed = open_element_memmap(path, "vertex", header)
+    sh = open_element_memmap(path, "sh", header) if header.element("sh") is not None else None
+    blocks = max(1, -(-int(chunk_rows) // COMPRESSED_CHUNK_ROWS))
+    step = blocks * COMPRESSED_CHUNK_ROWS
+    for start in range(0, count, step):
+        first = start // COMPRESSED_CHUNK_ROWS
+        yield decode_compressed(
+            chunks[first:first + blocks],
+            packed[start:start + step],
+            sh[start:start + step] if sh is not None else None,
+        )
+
+
+def rows_for_format_budget(dtype: np.dtype, max_bytes: int, output_format: str = "ply") -> int:
+    """Largest row count of ``dtype`` vertices whose ``output_format`` file fits in ``max_bytes``."""
+    if output_format == "ply":
+        return rows_for_byte_budget(dtype, max_bytes)
+    if output_format == "ply_float16":
+        return rows_for_byte_budget(float16_dtype(dtype), max_bytes)
+    if output_format == "splat":
+        return max(0, int(max_bytes) // SPLAT_DTYPE.itemsize)
+    if output_format == "compressed_ply":
+        chunk_dtype = np.dtype([(name, "<f4") for name in COMPRESSED_CHUNK_FIELDS])
+        vertex_dtype = np.dtype([(name, "<u4") for name in COMPRESSED_VERTEX_FIELDS])
+        rest_fields = [name for name in dtype.names if name.startswith("f_rest_")]
+        elements = [("chunk", chunk_dtype), ("vertex", vertex_dtype)]
+        if rest_fields:
+            elements.append(("sh", np.dtype([(name, "u1") for name in rest_fields])))
+        # Every started block of COMPRESSED_CHUNK_ROWS rows adds one chunk row.
+        budget = int(max_bytes) - header_byte_size(elements) - chunk_dtype.itemsize
+        row_bytes = vertex_dtype.itemsize + len(rest_fields) + chunk_dtype.itemsize / COMPRESSED_CHUNK_ROWS
+        return max(0, int(budget // row_bytes))
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def write_gaussians(path: str, vertices: np.ndarray, output_format: str = "ply") -> None:
+    """Write vertex columns to ``path`` in one of ``OUTPUT_FORMATS``."""
+    if output_format == "ply":
+        write_vertex_ply(path, vertices)
+    elif output_format == "ply_float16":
+        write_vertex_ply(path, encode_float16(vertices))
+    elif output_format == "splat":
+        encode_splat(vertices).tofile(path)
+    elif output_format == "compressed_ply":
+        write_ply_elements(path, encode_compressed(vertices))
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Bounded executor for blocking route work, single-flight deduplication and atomic writes."""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Override with PLYPREVIEW_IO_WORKERS
+DEFAULT_IO_WORKERS = 4
+
+# Filesystem scans and numpy work from HTTP handlers run here, never on the event loop
+io_executor = ThreadPoolExecutor(
+    max_workers=max(1, int(os.environ.get("PLYPREVIEW_IO_WORKERS", DEFAULT_IO_WORKERS))),
+    thread_name_prefix="plypreview-io",
+)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` on the bounded I/O executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(fn, *args, **kwargs))
+
+
+class _Call:
+    __slots__ = ("owner", "done", "result", "error")
+
+    def __init__(self, owner: int):
+        self.owner = owner
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; concurrent callers share its result.
+
+    Keys are derived-artifact paths, which already encode the source fingerprint and the
+    operation parameters. A caller re-entering a key it is computing runs ``fn`` directly.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        me = threading.get_ident()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call(me)
+                leader = True
+            elif call.owner == me:
+                leader = None
+            else:
+                self.shared += 1
+                leader = False
+
+        if leader is None:
+            return fn()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "shared": self.shared}
+
+
+single_flight = SingleFlight()
+
+
+def partial_path(path: str) -> str:
+    """Temporary sibling of ``path`` unique to this process and thread (ends in ``.partial``)."""
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.partial"
+
+
+@contextmanager
+def atomic_write(path: str):
+    """Yield a temporary path that replaces ``path`` atomically once the block succeeds.
+
+    Readers see either the previous file or the complete new one, never a partial write.
+    """
+    tmp_path = partial_path(path)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
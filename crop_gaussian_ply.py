@@ -0,0 +1,170 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import time
+from .metrics import metrics
+
+
+def _box_input(default: float, axis: str, bound: str) -> tuple:
+    return ("FLOAT", {
+        "default": default,
+        "min": -1e6,
+        "max": 1e6,
+        "step": 0.01,
+        "tooltip": f"{bound} {axis} of the crop box (box mode)",
+    })
+
+
+class CropGaussianPLY:
+    """Keep the Gaussians inside a box or camera frustum, reading only intersecting chunks."""
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "crop_mode": (["box", "frustum"], {
+                    "default": "box",
+                    "tooltip": "box: axis-aligned bounds below; frustum: the view of the connected extrinsics/intrinsics",
+                }),
+                "min_x": _box_input(-1.0, "x", "Lower"),
+                "min_y": _box_input(-1.0, "y", "Lower"),
+                "min_z": _box_input(-1.0, "z", "Lower"),
+                "max_x": _box_input(1.0, "x", "Upper"),
+                "max_y": _box_input(1.0, "y", "Upper"),
+                "max_z": _box_input(1.0, "z", "Upper"),
+            },
+            "optional": {
+                "ply_path": ("STRING", {
+                    "forceInput": True,
+                    "tooltip": "PLY file path from upstream node",
+                }),
+                "gaussian_cloud": ("GAUSSIAN_CLOUD", {
+                    "tooltip": "In-memory Gaussian cloud from a loader/process node (used instead of ply_path when connected)",
+                }),
+                "extrinsics": ("EXTRINSICS", {
+                    "tooltip": "4x4 world-to-camera matrix for frustum mode; identity when not connected",
+                }),
+                "intrinsics": ("INTRINSICS", {
+                    "tooltip": "3x3 intrinsics for frustum mode (image of 2*cx by 2*cy pixels); 512x512 at 50° when not connected",
+                }),
+                "near": ("FLOAT", {
+                    "default": 0.01,
+                    "min": 0.0,
+                    "max": 1e6,
+                    "step": 0.01,
+                    "tooltip": "Near plane distance (frustum mode)",
+                }),
+                "far": ("FLOAT", {
+                    "default": 0.0,
+                    "min": 0.0,
+                    "max": 1e6,
+                    "step": 0.1,
+                    "tooltip": "Far plane distance (frustum mode, 0 = unbounded)",
+                }),
+                "use_index": (["enabled", "disabled"], {
+                    "default": "enabled",
+                    "tooltip": "Build (once) and use the cached octree index so only intersecting chunks are read; smaller files are filtered in memory",
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "GAUSSIAN_CLOUD")
+    RETURN_NAMES = ("ply_path", "gaussian_cloud")
+    FUNCTION = "crop"
+    CATEGORY = "PlyPreview"
+
+    @staticmethod
+    def _crop_step(crop_mode: str, bounds: list[float], extrinsics, intrinsics, near: float, far: float) -> tuple[str, dict, str]:
+        if crop_mode == "frustum":
+            params = {
+                "mode": "frustum",
+                "extrinsics": [[round(float(v), 9) for v in row] for row in extrinsics],
+                "intrinsics": [[round(float(v), 9) for v in row] for row in intrinsics],
+                "near": round(float(near), 9),
+                "far": round(float(far), 9),
+            }
+            return "crop", params, "_frustum"
+        params = {"mode": "box", "min": [round(float(v), 9) for v in bounds[:3]], "max": [round(float(v), 9) for v in bounds[3:]]}
+        return "crop", params, "_crop"
+
+    def crop(
+        self,
+        crop_mode: str = "box",
+        min_x: float = -1.0,
+        min_y: float = -1.0,
+        min_z: float = -1.0,
+        max_x: float = 1.0,
+        max_y: float = 1.0,
+        max_z: float = 1.0,
+        ply_path: str = "",
+        gaussian_cloud=None,
+        extrinsics=None,
+        intrinsics=None,
+        near: float = 0.01,
+        far: float = 0.0,
+        use_index: str = "enabled",
+    ):
+        from .common import get_default_extrinsics, get_default_intrinsics
+        from .gaussian_cloud import GaussianCloud
+        from .spatial_index import INDEX_MIN_ROWS, SpatialIndex, box_planes, frustum_planes, gaussian_positions, points_inside
+
+        if gaussian_cloud is not None:
+            cloud = gaussian_cloud
+            print(f"[CropGaussianPLY] Input cloud: {gaussian_cloud!r}")
+        else:
+            if not ply_path or ply_path.strip() == "":
+                raise ValueError("Connect a ply_path or gaussian_cloud input")
+
+            resolved = ply_path.strip().strip('"')
+            if not os.path.exists(resolved):
+                raise ValueError(f"PLY file not found: {resolved}")
+            if not resolved.lower().endswith((".ply", ".splat")):
+                raise ValueError("File must be a .ply or .splat Gaussian splat")
+
+            cloud = GaussianCloud.from_path(resolved)
+            print(f"[CropGaussianPLY] Input PLY: {resolved}")
+
+        bounds = [min_x, min_y, min_z, max_x, max_y, max_z]
+        if crop_mode == "frustum":
+            extrinsics = extrinsics if extrinsics is not None else get_default_extrinsics()
+            intrinsics = intrinsics if intrinsics is not None else get_default_intrinsics()
+            planes = frustum_planes(extrinsics, intrinsics, near, far)
+        else:
+            if any(low > high for low, high in zip(bounds[:3], bounds[3:])):
+                raise ValueError(f"Crop box min must not exceed max: {bounds[:3]} > {bounds[3:]}")
+            planes = box_planes(bounds[:3], bounds[3:])
+
+        step = self._crop_step(crop_mode, bounds, extrinsics, intrinsics, near, far)
+        cached = cloud.cached_child(*step)
+        if cached is not None:
+            print(f"[CropGaussianPLY] Using cached crop: {cached.path}")
+            cropped_cloud = cached
+        else:
+            start = time.perf_counter()
+            n_original = len(cloud)
+            with metrics.stage("crop", n_original) as span:
+                # Unwritten derived clouds are already in memory; indexing them would mean writing them first
+                if use_index == "enabled" and cloud.path is not None and not cloud.is_loaded and n_original >= INDEX_MIN_ROWS:
+                    index = SpatialIndex.for_source(cloud.path)
+                    cropped, bytes_read = index.crop(planes)
+                    total_bytes = len(index.vertices) * index.vertices.dtype.itemsize
+                    print(f"[CropGaussianPLY] Read {bytes_read / 1e6:.1f} of {total_bytes / 1e6:.1f} MB ({100 * bytes_read / max(total_bytes, 1):.1f}%) via spatial index")
+                else:
+                    cropped = cloud.data[points_inside(gaussian_positions(cloud.data), planes)]
+                    bytes_read = cloud.data.nbytes
+                span.bytes = bytes_read
+            elapsed = time.perf_counter() - start
+            print(f"[CropGaussianPLY] {crop_mode.capitalize()} crop kept {len(cropped)}/{n_original} gaussians ({100 * len(cropped) / max(n_original, 1):.1f}%) in {elapsed:.2f}s")
+            if len(cropped) == 0:
+                raise ValueError("Crop region contains no Gaussians")
+            if len(cropped) == n_original:
+                print("[CropGaussianPLY] Every gaussian is inside the crop region, using original")
+                cropped_cloud = cloud
+            else:
+                cropped_cloud = cloud.derive(cropped, *step)
+
+        # Always materialized: ComfyUI's output cache does not see which outputs are linked
+        output_path = cropped_cloud.to_path()
+        if cropped_cloud.lineage:
+            print(f"[CropGaussianPLY] Cropped PLY saved to: {output_path}")
+        return (output_path, cropped_cloud)
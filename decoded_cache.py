@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Process-wide LRU cache of decoded vertex arrays with a RAM budget."""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .artifact_cache import derived_cache
+from .compact_formats import load_vertex_columns
+from .metrics import metrics
+from .ply_io import PlyHeader
+
+# Override with PLYPREVIEW_DECODED_CACHE_MB (0 disables the cache)
+DEFAULT_DECODED_CACHE_MB = 2048
+# Each cached mapping keeps its file open; bound them by count as well as by mapped length
+MAX_MAPPED_ENTRIES = 16
+
+
+class DecodedCloudCache:
+    """Keeps decoded vertex blocks in RAM keyed by (realpath, size, mtime).
+
+    Entries are read-only arrays shared by every cloud loaded from the same file.
+    Binary float32 PLYs stay memory-mapped, so filters only ever materialize the rows
+    they keep. A mapping is cached only for files inside the derived cache, whose eviction
+    calls :meth:`discard`. A mapping of a user's source file would keep it open, which
+    blocks overwriting or deleting it on Windows and risks SIGBUS after an in-place
+    truncate on POSIX, so such mappings go to the caller uncached. Mapped entries count
+    their mapped length against ``max_bytes`` and are also capped at ``max_mapped``. A
+    changed file drops its old entries on the next lookup.
+    """
+
+    def __init__(self, max_bytes: int, max_mapped: int = MAX_MAPPED_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_mapped = max_mapped
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(ply_path: str) -> tuple:
+        real = os.path.realpath(ply_path)
+        st = os.stat(real)
+        return (real, st.st_size, st.st_mtime_ns)
+
+    @staticmethod
+    def _cost(data: np.ndarray) -> int:
+        # Mapped entries count their mapped length, so the budget bounds address space too
+        return data.nbytes
+
+    @staticmethod
+    def _retain(real: str, data: np.ndarray) -> bool:
+        return not isinstance(data, np.memmap) or derived_cache.owns(real)
+
+    def get(self, ply_path: str, header: PlyHeader | None = None) -> np.ndarray:
+        key = self._key(ply_path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+            # The file changed: release stale copies (and mappings) now, not on the next store
+            self._drop_path(key[0])
+
+        with metrics.stage("read", nbytes=key[1]) as span:
+            data = load_vertex_columns(ply_path, header)
+            span.gaussians = len(data)
+            if self.max_bytes <= 0:
+                return data
+        if self._cost(data) > self.max_bytes or not self._retain(key[0], data):
+            return data
+        data.flags.writeable = False
+        self._store(key, data)
+        return data
+
+    def _mapped_count(self) -> int:
+        return sum(1 for data in self._entries.values() if isinstance(data, np.memmap))
+
+    def _store(self, key: tuple, data: np.ndarray) -> None:
+        with self._lock:
+            # Drop older versions of the same file
+            self._drop_path(key[0])
+            self._entries[key] = data
+            self._bytes += self._cost(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._cost(evicted)
+                self.evictions += 1
+            if isinstance(data, np.memmap):
+                excess = self._mapped_count() - self.max_mapped
+                for old in [k for k, v in self._entries.items() if isinstance(v, np.memmap) and k != key][:max(excess, 0)]:
+                    self._bytes -= self._cost(self._entries.pop(old))
+                    self.evictions += 1
+
+    def _drop_path(self, real: str) -> None:
+        # Caller holds the lock
+        for stale in [k for k in self._entries if k[0] == real]:
+            self._bytes -= self._cost(self._entries.pop(stale))
+
+    def discard(self, ply_path: str) -> None:
+        """Forget every entry for ``ply_path`` (before the file is deleted or replaced)."""
+        with self._lock:
+            self._drop_path(os.path.realpath(ply_path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "mapped_entries": self._mapped_count(),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+decoded_cache = DecodedCloudCache(int(float(os.environ.get("PLYPREVIEW_DECODED_CACHE_MB", DEFAULT_DECODED_CACHE_MB)) * 1024 * 1024))
@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import time
+from .metrics import metrics
+
+
+class DownsampleGaussianPLY:
+    """Merge overlapping Gaussians on a voxel grid to cut render time and memory."""
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "voxel_size": ("FLOAT", {
+                    "default": 0.01,
+                    "min": 0.0001,
+                    "max": 100.0,
+                    "step": 0.001,
+                    "tooltip": "Edge length of the merge grid in scene units; all Gaussians in one cell become one",
+                }),
+            },
+            "optional": {
+                "ply_path": ("STRING", {
+                    "forceInput": True,
+                    "tooltip": "PLY file path from upstream node",
+                }),
+                "gaussian_cloud": ("GAUSSIAN_CLOUD", {
+                    "tooltip": "In-memory Gaussian cloud from a loader/process node (used instead of ply_path when connected)",
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "GAUSSIAN_CLOUD")
+    RETURN_NAMES = ("ply_path", "gaussian_cloud")
+    FUNCTION = "downsample"
+    CATEGORY = "PlyPreview"
+
+    @staticmethod
+    def _downsample_step(voxel_size: float) -> tuple[str, dict, str]:
+        return "voxel_downsample", {"voxel_size": round(float(voxel_size), 9)}, f"_voxel{voxel_size:g}"
+
+    def _downsample_cloud(self, cloud, voxel_size: float):
+        """Return ``cloud`` merged on a ``voxel_size`` grid (in memory, nothing written)."""
+        from .gaussian_ops import voxel_downsample
+
+        step = self._downsample_step(voxel_size)
+        cached = cloud.cached_child(*step)
+        if cached is not None:
+            print(f"[DownsampleGaussianPLY] Using cached downsampled PLY: {cached.path}")
+            return cached
+
+        start = time.perf_counter()
+        with metrics.stage("downsample", len(cloud)):
+            merged = voxel_downsample(cloud.data, voxel_size)
+        elapsed = time.perf_counter() - start
+        n_original = len(cloud)
+        print(f"[DownsampleGaussianPLY] Voxel {voxel_size:g}: merged {n_original} -> {len(merged)} gaussians ({100*len(merged)/max(n_original, 1):.1f}%) in {elapsed:.2f}s")
+        if len(merged) == n_original:
+            print("[DownsampleGaussianPLY] Every gaussian has its own voxel, using original")
+            return cloud
+        return cloud.derive(merged, *step)
+
+    def downsample(self, voxel_size: float = 0.01, ply_path: str = "", gaussian_cloud=None):
+        from .gaussian_cloud import GaussianCloud
+
+        if gaussian_cloud is not None:
+            cloud = gaussian_cloud
+            print(f"[DownsampleGaussianPLY] Input cloud: {gaussian_cloud!r}")
+        else:
+            if not ply_path or ply_path.strip() == "":
+                raise ValueError("Connect a ply_path or gaussian_cloud input")
+
+            resolved = ply_path.strip().strip('"')
+            if not os.path.exists(resolved):
+                raise ValueError(f"PLY file not found: {resolved}")
+            if not resolved.lower().endswith((".ply", ".splat")):
+                raise ValueError("File must be a .ply or .splat Gaussian splat")
+
+            cloud = GaussianCloud.from_path(resolved)
+            print(f"[DownsampleGaussianPLY] Input PLY: {resolved}")
+
+        cloud = self._downsample_cloud(cloud, voxel_size)
+        # Always materialized: ComfyUI's output cache does not see which outputs are linked
+        output_path = cloud.to_path()
+        if cloud.lineage:
+            print(f"[DownsampleGaussianPLY] Downsampled PLY saved to: {output_path}")
+        return (output_path, cloud)
@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Cached, incremental index of PLY files under the ComfyUI input/output folders."""
+
+import os
+import threading
+import time
+
+from .artifact_cache import derived_cache
+from .common import COMFYUI_INPUT_FOLDER, COMFYUI_OUTPUT_FOLDER
+
+# Override with PLYPREVIEW_INDEX_MAX_DEPTH / PLYPREVIEW_INDEX_TTL / PLYPREVIEW_INDEX_POLL_SECONDS
+DEFAULT_MAX_DEPTH = 8
+DEFAULT_TTL_SECONDS = 2.0
+
+
+class _DirEntry:
+    __slots__ = ("mtime_ns", "files", "subdirs")
+
+    def __init__(self, mtime_ns: int, files: list[str], subdirs: list[str]):
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.subdirs = subdirs
+
+
+class PlyFileIndex:
+    """Sorted list of ``[label] relative/path.ply`` entries, revalidated by directory mtime.
+
+    Each directory is re-listed only when its own mtime changes (a file was added,
+    removed or renamed in it), so a refresh costs one ``stat`` per directory. Within
+    ``ttl`` seconds of the last validation the cached list is returned without any I/O.
+    """
+
+    def __init__(self, roots: list[tuple[str, str, set[str]]], max_depth: int, ttl: float):
+        self.roots = roots
+        self.max_depth = max_depth
+        self.ttl = ttl
+        self._dirs: dict[str, _DirEntry] = {}
+        self._files: list[str] = []
+        self._validated_at = 0.0
+        self._lock = threading.Lock()
+        self._poller: threading.Thread | None = None
+
+    def _listing(self, path: str, excluded: set[str]) -> _DirEntry | None:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._dirs.pop(path, None)
+            return None
+
+        cached = self._dirs.get(path)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached
+
+        files: list[str] = []
+        subdirs: list[str] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file():
+                            if entry.name.lower().endswith((".ply", ".splat")):
+                                files.append(entry.name)
+                        elif entry.is_dir() and not entry.name.startswith("."):
+                            if os.path.normcase(os.path.abspath(entry.path)) not in excluded:
+                                subdirs.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        listing = _DirEntry(mtime_ns, sorted(files), sorted(subdirs))
+        self._dirs[path] = listing
+        return listing
+
+    def _walk(self, label: str, root: str, excluded: set[str]) -> list[str]:
+        results: list[str] = []
+        stack = [("", 0)]
+        while stack:
+            relative, depth = stack.pop()
+            path = os.path.join(root, relative) if relative else root
+            listing = self._listing(path, excluded)
+            if listing is None:
+                continue
+            for name in listing.files:
+                results.append(f"[{label}] {relative}/{name}" if relative else f"[{label}] {name}")
+            if depth < self.max_depth:
+                for sub in listing.subdirs:
+                    stack.append((f"{relative}/{sub}" if relative else sub, depth + 1))
+        return results
+
+    def refresh(self) -> list[str]:
+        """Revalidate every indexed directory and rebuild the sorted file list."""
+        with self._lock:
+            files: list[str] = []
+            for label, root, excluded in self.roots:
+                if root and os.path.isdir(root):
+                    files.extend(self._walk(label, root, excluded))
+            files.sort()
+            self._files = files
+            self._validated_at = time.monotonic()
+            return files
+
+    def list_files(self) -> list[str]:
+        if self._validated_at and (self._poller is not None or time.monotonic() - self._validated_at <= self.ttl):
+            return self._files
+        return self.refresh()
+
+    def query(self, prefix: str = "", contains: str = "", offset: int = 0, limit: int | None = None) -> tuple[list[str], int]:
+        """Filter by label prefix and case-insensitive substring, then paginate."""
+        files = self.list_files()
+        if prefix:
+            files = [f for f in files if f.startswith(prefix)]
+        if contains:
+            needle = contains.lower()
+            files = [f for f in files if needle in f.lower()]
+        total = len(files)
+        offset = max(0, offset)
+        page = files[offset:offset + limit] if limit is not None else files[offset:]
+        return page, total
+
+    def start_polling(self, interval: float) -> None:
+        """Revalidate in a background thread so request handlers only read the cached list."""
+        if self._poller is not None or interval <= 0:
+            return
+
+        def poll():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:  # pragma: no cover - defensive
+                    print(f"[PlyPreview] Warning: PLY index refresh failed: {e}")
+                time.sleep(interval)
+
+        self.refresh()
+        self._poller = threading.Thread(target=poll, name="plypreview-file-index", daemon=True)
+        self._poller.start()
+
+
+def _build_index() -> PlyFileIndex:
+    cache_dir = os.path.normcase(os.path.abspath(derived_cache.directory))
+    roots: list[tuple[str, str, set[str]]] = []
+    if COMFYUI_INPUT_FOLDER:
+        input_3d = os.path.normcase(os.path.abspath(os.path.join(COMFYUI_INPUT_FOLDER, "3d")))
+        roots.append(("input", COMFYUI_INPUT_FOLDER, {input_3d, cache_dir}))
+        roots.append(("input/3d", os.path.join(COMFYUI_INPUT_FOLDER, "3d"), {cache_dir}))
+    if COMFYUI_OUTPUT_FOLDER:
+        roots.append(("output", COMFYUI_OUTPUT_FOLDER, {cache_dir}))
+
+    index = PlyFileIndex(
+        roots,
+        max_depth=int(os.environ.get("PLYPREVIEW_INDEX_MAX_DEPTH", DEFAULT_MAX_DEPTH)),
+        ttl=float(os.environ.get("PLYPREVIEW_INDEX_TTL", DEFAULT_TTL_SECONDS)),
+    )
+    index.start_polling(float(os.environ.get("PLYPREVIEW_INDEX_POLL_SECONDS", "0")))
+    return index
+
+
+ply_file_index = _build_index()
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Content fingerprints of source files: size plus a sampled digest, memoized by stat identity.
+
+A fingerprint is the file's size plus a BLAKE2b digest of its content, so a byte-identical
+copy (new inode, new mtime) keeps the same fingerprint and every cache keyed on it. Files up
+to ``FULL_HASH_BYTES`` are hashed whole. Larger files hash the header, the tail and one block
+in each of ``SAMPLE_COUNT`` equal strata at an offset derived from the header, so the sampled
+positions differ from file to file. The choice depends on the size alone, never on stat
+metadata, so equal bytes always give equal fingerprints. Results are memoized by
+``(device, inode, size, mtime)``, so an unchanged file costs one ``stat``.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+HEAD_BYTES = 64 * 1024
+SAMPLE_BYTES = 4096
+SAMPLE_COUNT = 256
+# Files up to this size are hashed in full
+FULL_HASH_BYTES = 64 * 1024 * 1024
+READ_BYTES = 1024 * 1024
+# A file modified this recently may be rewritten again within the same mtime tick
+# (coarse timestamps), so its fingerprint is not memoized yet
+RACY_SECONDS = 2.0
+MAX_ENTRIES = 65536
+
+
+def _sample_offsets(head: bytes, size: int) -> list[int]:
+    """One block start per stratum of the body, jittered by a hash of the header."""
+    body = size - HEAD_BYTES - SAMPLE_BYTES
+    stratum = max(1, body // SAMPLE_COUNT)
+    jitter = hashlib.shake_256(head + size.to_bytes(8, "little")).digest(8 * SAMPLE_COUNT)
+    return [
+        HEAD_BYTES + min(body, i * stratum + int.from_bytes(jitter[8 * i:8 * i + 8], "little") % stratum)
+        for i in range(SAMPLE_COUNT)
+    ]
+
+
+def content_digest(path: str, size: int) -> str:
+    """BLAKE2b over ``path``: the whole file when small, else header, strata and tail."""
+    digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+    with open(path, "rb") as f:
+        if size <= FULL_HASH_BYTES:
+            while block := f.read(READ_BYTES):
+                digest.update(block)
+            return digest.hexdigest()
+        head = f.read(HEAD_BYTES)
+        digest.update(head)
+        for offset in _sample_offsets(head, size):
+            f.seek(offset)
+            digest.update(f.read(SAMPLE_BYTES))
+        # The tail always ends exactly at EOF, so appended data is always seen
+        f.seek(size - SAMPLE_BYTES)
+        digest.update(f.read(SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+class FingerprintCache:
+    """Thread-safe LRU of content fingerprints memoized by ``(st_dev, st_ino, st_size, st_mtime_ns)``."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprint(self, path: str) -> str:
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        # Stat identity is only the memo key: a byte-identical copy keeps its fingerprint
+        fingerprint = f"{st.st_size}-{content_digest(path, st.st_size)}"
+        if time.time() - st.st_mtime >= RACY_SECONDS:
+            with self._lock:
+                self._entries[key] = fingerprint
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+fingerprints = FingerprintCache()
+
+
+def file_fingerprint(path: str) -> str:
+    """Fingerprint of ``path`` (one ``stat`` when already known)."""
+    return fingerprints.fingerprint(path)
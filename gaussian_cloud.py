@@ -0,0 +1,135 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""In-memory Gaussian splat handle exchanged between nodes as ``GAUSSIAN_CLOUD``."""
+
+import os
+
+import numpy as np
+
+from .artifact_cache import derived_cache
+from .compact_formats import FORMAT_SUFFIXES, is_compressed_ply, write_gaussians
+from .concurrency import atomic_write, single_flight
+from .decoded_cache import decoded_cache
+from .metrics import metrics
+from .ply_io import PlyHeader, read_ply_header
+
+
+def _lineage_key(lineage: tuple) -> tuple[str, dict, str]:
+    # A single step keys exactly like the standalone operation so both share cache entries
+    if len(lineage) == 1:
+        return lineage[0]
+    operation = "+".join(step[0] for step in lineage)
+    params = {"steps": [[step[0], step[1]] for step in lineage]}
+    suffix = "".join(step[2] for step in lineage)
+    return operation, params, suffix
+
+
+class GaussianCloud:
+    """Structured vertex columns of a Gaussian splat, loaded lazily.
+
+    A cloud is either backed by a PLY on disk (columns come from the shared decoded
+    cache on first access) or derived in memory from another cloud. Derived clouds remember the
+    operations applied to their source so they can be written to, or found in, the
+    derived-artifact cache only when a file path is actually needed.
+    """
+
+    __slots__ = ("source_path", "lineage", "_path", "_data", "_header")
+
+    def __init__(self, source_path: str, lineage: tuple = (), path: str | None = None, data: np.ndarray | None = None):
+        self.source_path = source_path
+        self.lineage = lineage
+        self._path = path
+        self._data = data
+        self._header: PlyHeader | None = None
+
+    @classmethod
+    def from_path(cls, path: str) -> "GaussianCloud":
+        return cls(path, (), path=path)
+
+    def __repr__(self) -> str:
+        state = self._path or f"<derived from {os.path.basename(self.source_path)}>"
+        return f"GaussianCloud({state}, {len(self)} gaussians)"
+
+    @property
+    def path(self) -> str | None:
+        """PLY file holding exactly this cloud, if one exists yet."""
+        return self._path
+
+    @property
+    def header(self) -> PlyHeader | None:
+        if self._header is None and self._path is not None and not self._path.lower().endswith(".splat"):
+            self._header = read_ply_header(self._path)
+        return self._header
+
+    @property
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            if self._path is None:
+                raise ValueError("GaussianCloud has neither data nor a backing file")
+            self._data = decoded_cache.get(self._path, self.header)
+        return self._data
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    def __len__(self) -> int:
+        if self._data is not None or self.header is None:
+            return len(self.data)
+        return self.header.vertex_count
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        if self._data is None and self.header is not None and not is_compressed_ply(self.header):
+            return tuple(self.header.vertex_fields)
+        return self.data.dtype.names
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    def _child_location(self, operation: str, params: dict, suffix: str) -> tuple[tuple, str]:
+        lineage = self.lineage + ((operation, params, suffix),)
+        return lineage, derived_cache.path_for(self.source_path, *_lineage_key(lineage))
+
+    def cached_child(self, operation: str, params: dict, suffix: str) -> "GaussianCloud | None":
+        """The result of applying ``operation`` if the derived cache already holds it."""
+        lineage, location = self._child_location(operation, params, suffix)
+        if derived_cache.lookup(location):
+            return GaussianCloud(self.source_path, lineage, path=location)
+        return None
+
+    def derive(self, data: np.ndarray, operation: str, params: dict, suffix: str) -> "GaussianCloud":
+        """New in-memory cloud produced from this one by ``operation``."""
+        lineage = self.lineage + ((operation, params, suffix),)
+        return GaussianCloud(self.source_path, lineage, data=data)
+
+    def to_path(self, output_format: str = "ply") -> str:
+        """Materialize to the derived cache (if not already on disk) and return the file path.
+
+        ``output_format`` selects a compact encoding (see ``compact_formats.OUTPUT_FORMATS``);
+        encoded copies are cached alongside, while ``path`` keeps pointing at the lossless PLY.
+        """
+        if output_format != "ply":
+            suffix, ext = FORMAT_SUFFIXES[output_format]
+            lineage = self.lineage + (("encode", {"format": output_format, "version": 1}, suffix),)
+            location = derived_cache.path_for(self.source_path, *_lineage_key(lineage), ext=ext)
+            return derived_cache.lookup(location) or self._materialize(location, output_format)
+
+        if self._path is not None:
+            return self._path
+        self._path = self._materialize(derived_cache.path_for(self.source_path, *_lineage_key(self.lineage)), "ply")
+        return self._path
+
+    def _materialize(self, location: str, output_format: str) -> str:
+        # Concurrent prompts deriving the same artifact share one write
+        return single_flight.do(location, lambda: self._write_once(location, output_format))
+
+    def _write_once(self, location: str, output_format: str) -> str:
+        # Reached after a counted cached_child()/lookup miss, so the recheck does not count again
+        if not derived_cache.contains(location):
+            derived_cache.prepare()
+            with metrics.stage("write", len(self.data)) as span, atomic_write(location) as tmp_path:
+                write_gaussians(tmp_path, self.data, output_format)
+                span.bytes = os.path.getsize(tmp_path)
+            derived_cache.commit(location)
+        return location
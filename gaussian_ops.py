@@ -0,0 +1,379 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Vectorized per-Gaussian computations on structured vertex arrays."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+SCALE_FIELDS = ("scale_0", "scale_1", "scale_2")
+POSITION_FIELDS = ("x", "y", "z")
+
+
+def log_importance(vertices: np.ndarray) -> np.ndarray:
+    """Log of opacity × ellipsoid volume, computed in log space to avoid overflow.
+
+    Stored opacities are logits and scales are log-scales, so this is
+    ``log(sigmoid(opacity)) + scale_0 + scale_1 + scale_2``. Missing fields contribute 0.
+    """
+    names = vertices.dtype.names
+    score = np.zeros(len(vertices), dtype=np.float32)
+    if "opacity" in names:
+        score -= np.logaddexp(np.float32(0.0), -np.asarray(vertices["opacity"], dtype=np.float32))
+    for name in SCALE_FIELDS:
+        if name in names:
+            score += np.asarray(vertices[name], dtype=np.float32)
+    return score
+
+
+def importance_order(vertices: np.ndarray) -> np.ndarray:
+    """Row permutation placing the most important Gaussians first (stable for ties)."""
+    return np.argsort(-log_importance(vertices), kind="stable")
+
+
+def pruning_scores(vertices: np.ndarray, center_weight: float = 0.0) -> np.ndarray:
+    """``log_importance`` optionally penalized by distance from the scene's median center.
+
+    Subtracting ``center_weight * log1p(d / median(d))`` divides the importance by
+    ``(1 + d / median(d)) ** center_weight``, favoring the subject over far background.
+    """
+    score = log_importance(vertices)
+    names = vertices.dtype.names
+    if center_weight > 0 and all(name in names for name in POSITION_FIELDS):
+        xyz = np.stack([np.asarray(vertices[name], dtype=np.float32) for name in POSITION_FIELDS], axis=1)
+        center = np.median(xyz, axis=0)
+        distance = np.sqrt(np.sum(np.square(xyz - center), axis=1))
+        del xyz
+        typical = float(np.median(distance)) or 1.0
+        score -= np.float32(center_weight) * np.log1p(distance / np.float32(typical))
+    return score
+
+
+def top_k_mask(scores: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    """Boolean mask selecting the ``k`` highest scores in O(N), plus the lowest kept score.
+
+    Using a mask (not the partition indices) keeps the selected rows in source order.
+    """
+    n = len(scores)
+    mask = np.zeros(n, dtype=bool)
+    if k <= 0 or n == 0:
+        return mask, float("inf")
+    if k >= n:
+        mask[:] = True
+        return mask, float(scores.min())
+    top = np.argpartition(scores, n - k)[n - k:]
+    mask[top] = True
+    return mask, float(scores[top].min())
+
+
+def _voxel_keys(xyz: np.ndarray, voxel_size: float, pad: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Linear int64 cell key per point and the grid dims; ``pad`` empty cells border the grid."""
+    cells = np.floor((xyz - xyz.min(axis=0)) / np.float32(voxel_size)).astype(np.int64)
+    if pad:
+        cells += pad
+    dims = cells.max(axis=0) + 1 + pad
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) >= 2.0 ** 62:
+        raise ValueError(f"voxel_size {voxel_size} is too small for the scene extent")
+    return (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2], dims
+
+
+def _group_keys(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Group equal keys with a single sort.
+
+    Returns ``(order, starts, cell_sorted, inverse)``: the sorting permutation, the first
+    sorted row of each cell, the cell id of every sorted row and of every original row.
+    """
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+    del sorted_keys
+    cell_sorted = np.zeros(len(order), dtype=np.int64)
+    cell_sorted[starts[1:]] = 1
+    np.cumsum(cell_sorted, out=cell_sorted)
+    inverse = np.empty_like(cell_sorted)
+    inverse[order] = cell_sorted
+    return order, starts, cell_sorted, inverse
+
+
+def voxel_downsample(vertices: np.ndarray, voxel_size: float) -> np.ndarray:
+    """Merge all Gaussians sharing a voxel into one representative.
+
+    Per cell: position and DC color are opacity-weighted means, scales are moment-matched
+    (weighted mean of squared linear scale plus the positional variance along each axis),
+    opacity is the union ``1 - prod(1 - a)``, and every other field (rotation, higher-order
+    SH, normals) is taken from the most opaque member. Fully vectorized: one sort for the
+    grouping, then ``np.bincount`` / ``reduceat`` reductions.
+    """
+    names = vertices.dtype.names
+    if not all(name in names for name in POSITION_FIELDS):
+        raise ValueError("Downsampling needs x, y, z vertex fields")
+    if voxel_size <= 0:
+        raise ValueError("voxel_size must be positive")
+
+    xyz = np.stack([np.asarray(vertices[name], dtype=np.float32) for name in POSITION_FIELDS], axis=1)
+    keys, _ = _voxel_keys(xyz, voxel_size)
+    # One sort groups the cells; everything after it is O(N)
+    order, starts, cell_sorted, inverse = _group_keys(keys)
+    del keys
+    n_cells = len(starts)
+
+    if "opacity" in names:
+        alpha = np.clip(1.0 / (1.0 + np.exp(-np.asarray(vertices["opacity"], dtype=np.float64))), 1e-7, 1.0 - 1e-7)
+    else:
+        alpha = np.full(len(vertices), 0.5)
+    weight_sum = np.bincount(inverse, weights=alpha, minlength=n_cells)
+
+    def weighted_mean(values: np.ndarray) -> np.ndarray:
+        return np.bincount(inverse, weights=alpha * values, minlength=n_cells) / weight_sum
+
+    # Most opaque member of each cell (first one on ties) carries the non-averaged fields
+    alpha_sorted = alpha[order]
+    cell_max = np.maximum.reduceat(alpha_sorted, starts)
+    candidates = np.flatnonzero(alpha_sorted == cell_max[cell_sorted])
+    del alpha_sorted, cell_max
+    candidate_cells = cell_sorted[candidates]
+    first = np.concatenate(([True], candidate_cells[1:] != candidate_cells[:-1]))
+    representative = order[candidates[first]]
+    del order, cell_sorted, candidates, candidate_cells
+    merged = np.array(vertices[representative])
+
+    for axis, name in enumerate(POSITION_FIELDS):
+        column = xyz[:, axis].astype(np.float64)
+        mean = weighted_mean(column)
+        merged[name] = mean
+        if SCALE_FIELDS[axis] in names:
+            variance = np.maximum(weighted_mean(column * column) - mean * mean, 0.0)
+            linear = np.exp(np.asarray(vertices[SCALE_FIELDS[axis]], dtype=np.float64))
+            second_moment = weighted_mean(linear * linear) + variance
+            merged[SCALE_FIELDS[axis]] = 0.5 * np.log(np.maximum(second_moment, 1e-30))
+    del xyz
+
+    for name in names:
+        if name.startswith("f_dc_"):
+            merged[name] = weighted_mean(np.asarray(vertices[name], dtype=np.float64))
+
+    if "opacity" in names:
+        transmittance = np.exp(np.bincount(inverse, weights=np.log1p(-alpha), minlength=n_cells))
+        combined = np.clip(1.0 - transmittance, 1e-7, 1.0 - 1e-7)
+        merged["opacity"] = np.log(combined) - np.log1p(-combined)
+    return merged
+
+
+# Occupied cells processed per batch when counting neighbors
+NEIGHBOR_CHUNK_CELLS = 1_000_000
+
+
+def neighbor_counts(xyz: np.ndarray, radius: float, chunk_cells: int = NEIGHBOR_CHUNK_CELLS) -> np.ndarray:
+    """Points in the 3×3×3 block of ``radius``-sized grid cells around each point (itself included).
+
+    Points are hashed to a uniform grid; the 27-cell sums are computed once per occupied
+    cell with ``searchsorted`` over the sorted cell keys, in batches of ``chunk_cells``.
+    """
+    keys, dims = _voxel_keys(xyz, radius, pad=1)
+    order, starts, _, inverse = _group_keys(keys)
+    cell_keys = keys[order[starts]]
+    del keys, order
+    cell_counts = np.diff(np.append(starts, len(inverse)))
+
+    offsets = np.array(
+        [(dx * dims[1] + dy) * dims[2] + dz for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+        dtype=np.int64,
+    )
+    totals = np.zeros(len(cell_keys), dtype=np.int64)
+    for begin in range(0, len(cell_keys), chunk_cells):
+        block = cell_keys[begin:begin + chunk_cells]
+        for offset in offsets:
+            neighbor = block + offset
+            pos = np.searchsorted(cell_keys, neighbor)
+            np.minimum(pos, len(cell_keys) - 1, out=pos)
+            hit = cell_keys[pos] == neighbor
+            totals[begin:begin + chunk_cells] += np.where(hit, cell_counts[pos], 0)
+    return totals[inverse]
+
+
+def auto_neighbor_radius(xyz: np.ndarray, target_per_cell: float = 8.0) -> float:
+    """Cell size giving ~``target_per_cell`` points per cell over the central 98% bounding box."""
+    low, high = np.percentile(xyz, [1.0, 99.0], axis=0)
+    volume = float(np.prod(np.maximum(high - low, 1e-6)))
+    return (volume * target_per_cell / max(len(xyz), 1)) ** (1.0 / 3.0)
+
+
+def outlier_mask(vertices: np.ndarray, sigma: float, radius: float = 0.0) -> tuple[np.ndarray, float, float]:
+    """Keep-mask dropping isolated floaters, plus the radius and neighbor-count cutoff used.
+
+    A point is an outlier when ``log(neighbor count)`` falls more than ``sigma`` standard
+    deviations below the mean. ``radius <= 0`` picks the grid size automatically.
+    """
+    names = vertices.dtype.names
+    if not all(name in names for name in POSITION_FIELDS):
+        raise ValueError("Outlier removal needs x, y, z vertex fields")
+    xyz = np.stack([np.asarray(vertices[name], dtype=np.float32) for name in POSITION_FIELDS], axis=1)
+    if radius <= 0:
+        radius = auto_neighbor_radius(xyz)
+    density = np.log(neighbor_counts(xyz, radius).astype(np.float32))
+    del xyz
+    cutoff = float(density.mean() - sigma * density.std())
+    return density >= cutoff, radius, float(np.exp(cutoff))
+
+
+MORTON_BITS = 21
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """Insert two zero bits between each of the low 21 bits (x -> x..x..x)."""
+    v = values.astype(np.uint64) & np.uint64(0x1FFFFF)
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+
+def morton_codes(vertices: np.ndarray) -> np.ndarray:
+    """63-bit Z-order codes from positions quantized to 21 bits per axis over the scene bounds."""
+    codes = np.zeros(len(vertices), dtype=np.uint64)
+    if len(vertices) == 0:
+        return codes
+    top = (1 << MORTON_BITS) - 1
+    for shift, name in zip((2, 1, 0), POSITION_FIELDS):
+        axis = np.asarray(vertices[name], dtype=np.float64)
+        low, high = float(axis.min()), float(axis.max())
+        scale = top / (high - low) if high > low else 0.0
+        quantized = np.clip((axis - low) * scale, 0, top).astype(np.uint64)
+        codes |= _spread_bits(quantized) << np.uint64(shift)
+    return codes
+
+
+def morton_order(vertices: np.ndarray) -> np.ndarray:
+    """Row permutation sorting Gaussians along the Z-order curve (stable for equal codes)."""
+    return np.argsort(morton_codes(vertices), kind="stable")
+
+
+ROTATION_FIELDS = ("rot_0", "rot_1", "rot_2", "rot_3")
+NORMAL_FIELDS = ("nx", "ny", "nz")
+
+
+def similarity_parts(matrix) -> tuple[float, np.ndarray, np.ndarray]:
+    """Split a 4x4 (or 3x4) rigid-plus-uniform-scale matrix into ``(scale, rotation, translation)``."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape not in ((4, 4), (3, 4)):
+        raise ValueError(f"Transform must be a 4x4 matrix, got shape {matrix.shape}")
+    linear = matrix[:3, :3]
+    det = float(np.linalg.det(linear))
+    if det <= 0:
+        raise ValueError("Transform must preserve orientation (positive determinant)")
+    scale = det ** (1.0 / 3.0)
+    rotation = linear / scale
+    if not np.allclose(rotation @ rotation.T, np.eye(3), atol=1e-4):
+        raise ValueError("Transform must be a rotation, uniform scale and translation (Gaussians cannot be sheared)")
+    return scale, rotation, matrix[:3, 3].copy()
+
+
+def quaternion_from_matrix(rotation: np.ndarray) -> np.ndarray:
+    """Unit ``(w, x, y, z)`` quaternion of a 3x3 rotation matrix."""
+    m = np.asarray(rotation, dtype=np.float64)
+    # Largest-component branch keeps the division well conditioned
+    w, x, y, z = np.sqrt(np.maximum(0.0, 1.0 + np.array([
+        m[0, 0] + m[1, 1] + m[2, 2],
+        m[0, 0] - m[1, 1] - m[2, 2],
+        -m[0, 0] + m[1, 1] - m[2, 2],
+        -m[0, 0] - m[1, 1] + m[2, 2],
+    ]))) / 2.0
+    largest = int(np.argmax([w, x, y, z]))
+    if largest == 0:
+        q = [w, (m[2, 1] - m[1, 2]) / (4 * w), (m[0, 2] - m[2, 0]) / (4 * w), (m[1, 0] - m[0, 1]) / (4 * w)]
+    elif largest == 1:
+        q = [(m[2, 1] - m[1, 2]) / (4 * x), x, (m[0, 1] + m[1, 0]) / (4 * x), (m[0, 2] + m[2, 0]) / (4 * x)]
+    elif largest == 2:
+        q = [(m[0, 2] - m[2, 0]) / (4 * y), (m[0, 1] + m[1, 0]) / (4 * y), y, (m[1, 2] + m[2, 1]) / (4 * y)]
+    else:
+        q = [(m[1, 0] - m[0, 1]) / (4 * z), (m[0, 2] + m[2, 0]) / (4 * z), (m[1, 2] + m[2, 1]) / (4 * z), z]
+    return np.asarray(q) / np.linalg.norm(q)
+
+
+def transform_gaussians(vertices: np.ndarray, matrix) -> None:
+    """Apply a similarity transform in place: positions, normals, log-scales and rotations.
+
+    Higher-order SH (``f_rest_*``) are left in their original frame.
+    """
+    scale, rotation, translation = similarity_parts(matrix)
+    names = vertices.dtype.names
+    if all(name in names for name in POSITION_FIELDS):
+        xyz = np.stack([vertices[name].astype(np.float64) for name in POSITION_FIELDS], axis=1) @ (scale * rotation.T) + translation
+        for axis, name in enumerate(POSITION_FIELDS):
+            vertices[name] = xyz[:, axis]
+    if all(name in names for name in NORMAL_FIELDS):
+        normals = np.stack([vertices[name].astype(np.float64) for name in NORMAL_FIELDS], axis=1) @ rotation.T
+        for axis, name in enumerate(NORMAL_FIELDS):
+            vertices[name] = normals[:, axis]
+    if scale != 1.0:
+        for name in SCALE_FIELDS:
+            if name in names:
+                vertices[name] += np.log(scale)
+    if all(name in names for name in ROTATION_FIELDS):
+        # Hamilton product q_R ⊗ q for every row
+        rw, rx, ry, rz = quaternion_from_matrix(rotation)
+        w, x, y, z = (vertices[name].astype(np.float64) for name in ROTATION_FIELDS)
+        vertices["rot_0"] = rw * w - rx * x - ry * y - rz * z
+        vertices["rot_1"] = rw * x + rx * w + ry * z - rz * y
+        vertices["rot_2"] = rw * y - rx * z + ry * w + rz * x
+        vertices["rot_3"] = rw * z + rx * y - ry * x + rz * w
+
+
+# Override with PLYPREVIEW_THREADS (0 = one per CPU core)
+DEFAULT_THREADS = 0
+# Below this many rows per range the thread hand-off costs more than it saves
+PARALLEL_MIN_ROWS = 262_144
+
+
+def worker_threads(threads: int | None = None) -> int:
+    """Thread count for chunk-parallel kernels: ``threads``, else ``PLYPREVIEW_THREADS``, else CPU count.
+
+    ``None`` and ``0`` both defer to the environment; callers already running inside a
+    pool (batch jobs) pass an explicit count so the pools do not multiply.
+    """
+    if not threads:
+        threads = int(os.environ.get("PLYPREVIEW_THREADS", DEFAULT_THREADS))
+    return threads if threads > 0 else (os.cpu_count() or 1)
+
+
+def row_ranges(n: int, threads: int, min_rows: int = PARALLEL_MIN_ROWS) -> list[tuple[int, int]]:
+    """Split ``n`` rows into at most ``threads`` contiguous ranges of at least ``min_rows``."""
+    parts = max(1, min(threads, n // max(min_rows, 1)))
+    bounds = np.linspace(0, n, parts + 1).astype(np.int64)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def parallel_filter_rows(vertices: np.ndarray, keep, threads: int | None = None) -> tuple[np.ndarray, int]:
+    """Rows of ``vertices`` where ``keep(block)`` is True, evaluated over row ranges in a thread pool.
+
+    ``keep`` maps a contiguous slice of ``vertices`` to a boolean mask. Each range is masked
+    and then gathered straight into its slot of the output buffer, so rows keep their
+    order and a memory-mapped block is read once, by range, on every core (numpy releases
+    the GIL for these kernels). When every row is kept ``vertices`` itself is returned
+    without copying. Returns the kept rows and the number of threads used.
+    """
+    ranges = row_ranges(len(vertices), worker_threads(threads))
+    if len(ranges) == 1:
+        mask = keep(vertices)
+        return (vertices if mask.all() else np.asarray(vertices[mask])), 1
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        masks = list(pool.map(lambda r: keep(vertices[r[0]:r[1]]), ranges))
+        counts = [int(np.count_nonzero(mask)) for mask in masks]
+        if sum(counts) == len(vertices):
+            return vertices, len(ranges)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        out = np.empty(int(offsets[-1]), dtype=vertices.dtype)
+        # Copy whole rows as opaque records; field-aware copies into ``out=`` are ~3x slower
+        rows = np.dtype((np.void, vertices.dtype.itemsize))
+        source, target = vertices.view(rows), out.view(rows)
+
+        def gather(i: int) -> None:
+            begin, end = ranges[i]
+            np.compress(masks[i], source[begin:end], axis=0, out=target[offsets[i]:offsets[i + 1]])
+
+        list(pool.map(gather, range(len(ranges))))
+    return out, len(ranges)
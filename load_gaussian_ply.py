@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import os
+import time
 from .common import (
     COMFYUI_INPUT_FOLDER,
     COMFYUI_OUTPUT_FOLDER,
@@ -8,6 +9,88 @@ from .common import (
     get_default_intrinsics,
     get_recommended_resolution,
 )
+from .concurrency import single_flight
+from .file_index import ply_file_index
+from .fingerprint import file_fingerprint
+from .metrics import metrics
+
+# Shared by the loader/process nodes
+OUTLIER_INPUTS = {
+    "outlier_removal": (["disabled", "enabled"], {
+        "default": "disabled",
+        "tooltip": "Remove isolated floaters whose local neighbor count is far below the scene average",
+    }),
+    "outlier_sigma": ("FLOAT", {
+        "default": 3.0,
+        "min": 0.5,
+        "max": 10.0,
+        "step": 0.1,
+        "tooltip": "Drop Gaussians whose log neighbor count is this many standard deviations below the mean (lower = more aggressive)",
+    }),
+    "outlier_radius": ("FLOAT", {
+        "default": 0.0,
+        "min": 0.0,
+        "max": 100.0,
+        "step": 0.001,
+        "tooltip": "Neighborhood grid cell size in scene units (0 = automatic from point density)",
+    }),
+}
+
+OUTPUT_INPUTS = {
+    "output_format": (["ply", "ply_float16", "splat", "compressed_ply"], {
+        "default": "ply",
+        "tooltip": "Encoding of the ply_path output: float32 PLY, float16 PLY (~2x smaller), 32-byte .splat (~8x) or chunk-quantized compressed PLY (~4-10x)",
+    }),
+    "spatial_order": (["source", "morton"], {
+        "default": "source",
+        "tooltip": "morton: reorder Gaussians along a Z-order curve before writing (better gzip ratio, GPU cache locality and compressed_ply precision)",
+    }),
+}
+
+THREADS_INPUTS = {
+    "threads": ("INT", {
+        "default": 0,
+        "min": 0,
+        "max": 256,
+        "step": 1,
+        "tooltip": "CPU threads for the parallel kernels (0 = PLYPREVIEW_THREADS, else one per core)",
+    }),
+}
+
+PROFILE_INPUTS = {
+    "profile": (["disabled", "enabled"], {
+        "default": "disabled",
+        "tooltip": "cProfile this node's stages into GET /plypreview/profile (just this run, unlike the process-wide POST /plypreview/profile)",
+    }),
+}
+
+PRUNE_INPUTS = {
+    "prune_mode": (["disabled", "target_count", "target_size_mb"], {
+        "default": "disabled",
+        "tooltip": "Keep only the most important Gaussians (opacity × scale volume) to hit a hard count or file-size budget",
+    }),
+    "prune_target_count": ("INT", {
+        "default": 1000000,
+        "min": 1,
+        "max": 100000000,
+        "step": 10000,
+        "tooltip": "Maximum number of Gaussians kept (used when prune_mode is target_count)",
+    }),
+    "prune_target_mb": ("FLOAT", {
+        "default": 100.0,
+        "min": 0.1,
+        "max": 100000.0,
+        "step": 1.0,
+        "tooltip": "Maximum size of the written file in MB, measured in the selected output_format (used when prune_mode is target_size_mb)",
+    }),
+    "prune_center_weight": ("FLOAT", {
+        "default": 0.0,
+        "min": 0.0,
+        "max": 10.0,
+        "step": 0.1,
+        "tooltip": "Penalize Gaussians far from the scene center when ranking (0 = importance only)",
+    }),
+}
 
 
 class LoadGaussianPLY:
@@ -69,38 +152,30 @@ class LoadGaussianPLY:
                     "step": 0.01,
                     "tooltip": "Minimum opacity (0-1). Gaussians below this will be removed (used when filter enabled)",
                 }),
+                "stream_chunk_rows": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 100000000,
+                    "step": 100000,
+                    "tooltip": "Stream the opacity filter in chunks of this many Gaussians to keep memory flat on huge files (0 = filter in one pass)",
+                }),
+                **OUTLIER_INPUTS,
+                **PRUNE_INPUTS,
+                **OUTPUT_INPUTS,
+                **THREADS_INPUTS,
+                **PROFILE_INPUTS,
             },
         }
 
-    RETURN_TYPES = ("STRING", "EXTRINSICS", "INTRINSICS")
-    RETURN_NAMES = ("ply_path", "extrinsics", "intrinsics")
+    RETURN_TYPES = ("STRING", "EXTRINSICS", "INTRINSICS", "GAUSSIAN_CLOUD")
+    RETURN_NAMES = ("ply_path", "extrinsics", "intrinsics", "gaussian_cloud")
     FUNCTION = "load_ply"
     CATEGORY = "PlyPreview"
 
     @classmethod
     def _get_ply_files(cls) -> list[str]:
-        ply_files: list[str] = []
-
-        if COMFYUI_INPUT_FOLDER and os.path.isdir(COMFYUI_INPUT_FOLDER):
-            for f in os.listdir(COMFYUI_INPUT_FOLDER):
-                full_path = os.path.join(COMFYUI_INPUT_FOLDER, f)
-                if os.path.isfile(full_path) and f.lower().endswith(".ply"):
-                    ply_files.append(f"[input] {f}")
-
-            input_3d = os.path.join(COMFYUI_INPUT_FOLDER, "3d")
-            if os.path.isdir(input_3d):
-                for f in os.listdir(input_3d):
-                    full_path = os.path.join(input_3d, f)
-                    if os.path.isfile(full_path) and f.lower().endswith(".ply"):
-                        ply_files.append(f"[input/3d] {f}")
-
-        if COMFYUI_OUTPUT_FOLDER and os.path.isdir(COMFYUI_OUTPUT_FOLDER):
-            for f in os.listdir(COMFYUI_OUTPUT_FOLDER):
-                full_path = os.path.join(COMFYUI_OUTPUT_FOLDER, f)
-                if os.path.isfile(full_path) and f.lower().endswith(".ply"):
-                    ply_files.append(f"[output] {f}")
-
-        return ply_files
+        # Served from a cached index that only re-lists directories whose mtime changed
+        return list(ply_file_index.list_files())
 
     @classmethod
     def _resolve_selection(cls, selection: str) -> str | None:
@@ -130,33 +205,289 @@ class LoadGaussianPLY:
                     return candidate
         return None
 
-    def _filter_by_opacity(self, ply_path: str, threshold: float) -> str:
+    @staticmethod
+    def _opacity_step(threshold: float) -> tuple[str, dict, str]:
+        return "opacity_filter", {"threshold": round(float(threshold), 6)}, f"_opacity{threshold:.2f}"
+
+    def _filter_by_opacity(self, ply_path: str, threshold: float, chunk_rows: int = 0) -> str:
         try:
-            from plyfile import PlyData, PlyElement
-            import numpy as np
+            from .artifact_cache import derived_cache
         except ImportError:
-            print("[LoadGaussianPLY] Warning: plyfile not installed, skipping opacity filter")
+            print("[LoadGaussianPLY] Warning: numpy not installed, skipping opacity filter")
             return ply_path
 
         try:
-            plydata = PlyData.read(ply_path)
-            vertex = plydata["vertex"]
+            output_path = derived_cache.path_for(ply_path, *self._opacity_step(threshold))
+        except OSError as e:
+            print(f"[LoadGaussianPLY] Error filtering PLY: {e}")
+            return ply_path
+
+        if derived_cache.lookup(output_path):
+            print(f"[LoadGaussianPLY] Using cached filtered PLY: {output_path}")
+            return output_path
+
+        # Concurrent prompts filtering the same source at the same threshold share one pass
+        return single_flight.do(output_path, lambda: self._filter_by_opacity_once(ply_path, threshold, chunk_rows, output_path))
+
+    def _filter_by_opacity_once(self, ply_path: str, threshold: float, chunk_rows: int, output_path: str) -> str:
+        from .artifact_cache import derived_cache
+        from .gaussian_cloud import GaussianCloud
+
+        # The caller's lookup already counted this miss; another prompt may have built it since
+        if derived_cache.contains(output_path):
+            return output_path
+
+        if chunk_rows and chunk_rows > 0:
+            return self._filter_by_opacity_streaming(ply_path, threshold, chunk_rows, output_path)
+
+        try:
+            cloud = self._filter_cloud_by_opacity(GaussianCloud.from_path(ply_path), threshold, check_cache=False)
+            if cloud.path is not None:
+                return cloud.path
+            output_path = cloud.to_path()
+            print(f"[LoadGaussianPLY] Saved filtered PLY: {output_path}")
+            return output_path
+        except Exception as e:
+            print(f"[LoadGaussianPLY] Error filtering PLY: {e}")
+            return ply_path
 
-            field_names = vertex.data.dtype.names
-            print(f"[LoadGaussianPLY] PLY fields: {field_names}")
+    def _filter_cloud_by_opacity(self, cloud, threshold: float, check_cache: bool = True, threads: int | None = None):
+        """Return ``cloud`` without Gaussians below ``threshold`` (in memory, nothing written)."""
+        import numpy as np
+        from .gaussian_ops import parallel_filter_rows
+        from .ply_io import sigmoid
+
+        step = self._opacity_step(threshold)
+        if check_cache:
+            cached = cloud.cached_child(*step)
+            if cached is not None:
+                print(f"[LoadGaussianPLY] Using cached filtered PLY: {cached.path}")
+                return cached
+
+        # Binary PLYs are memory-mapped: only the opacity column and the kept rows are ever materialized
+        vertices = cloud.data
+
+        field_names = vertices.dtype.names
+        print(f"[LoadGaussianPLY] PLY fields: {field_names}")
+
+        if "opacity" not in field_names:
+            print(f"[LoadGaussianPLY] Warning: No 'opacity' field found in {list(field_names)}")
+            return cloud
+
+        opacity_ranges = []
+
+        def keep(block):
+            opacity = sigmoid(np.asarray(block["opacity"]))
+            if len(opacity):
+                opacity_ranges.append((float(opacity.min()), float(opacity.max())))
+            return opacity >= threshold
+
+        # Row ranges are masked and gathered in parallel, straight from the mapped block into the output rows
+        with metrics.stage("filter", len(vertices), vertices.nbytes):
+            start = time.perf_counter()
+            kept, threads = parallel_filter_rows(vertices, keep, threads)
+            elapsed = max(time.perf_counter() - start, 1e-9)
+        if opacity_ranges:
+            low = min(r[0] for r in opacity_ranges)
+            high = max(r[1] for r in opacity_ranges)
+            print(f"[LoadGaussianPLY] Opacity range after sigmoid: [{low:.4f}, {high:.4f}]")
+
+        n_original = len(vertices)
+        n_filtered = len(kept)
+        print(f"[LoadGaussianPLY] Opacity filter: threshold={threshold:.3f}, kept {n_filtered}/{n_original} gaussians ({100*n_filtered/max(n_original, 1):.1f}%)")
+        print(f"[LoadGaussianPLY] Opacity filter throughput: {n_original/elapsed/1e6:.1f}M gaussians/s, {vertices.nbytes/elapsed/2**20:.0f} MB/s on {threads} thread(s) ({elapsed:.3f}s)")
+
+        if n_filtered == n_original or n_filtered == 0:
+            if n_filtered == 0:
+                print("[LoadGaussianPLY] Warning: All gaussians filtered out! Using original file")
+            else:
+                print("[LoadGaussianPLY] All gaussians passed filter, using original file")
+            return cloud
+
+        return cloud.derive(kept, *step)
+
+    @staticmethod
+    def _outlier_step(sigma: float, radius: float) -> tuple[str, dict, str]:
+        return "outlier_filter", {"sigma": round(float(sigma), 6), "radius": round(float(radius), 9)}, f"_outlier{sigma:g}"
+
+    def _remove_outliers(self, cloud, sigma: float = 3.0, radius: float = 0.0):
+        """Drop isolated floaters by neighbor count on a spatial hash grid (in memory)."""
+        import numpy as np
+        from .gaussian_ops import outlier_mask
+
+        step = self._outlier_step(sigma, radius)
+        cached = cloud.cached_child(*step)
+        if cached is not None:
+            print(f"[LoadGaussianPLY] Using cached outlier-filtered PLY: {cached.path}")
+            return cached
+
+        vertices = cloud.data
+        with metrics.stage("outliers", len(vertices)):
+            mask, used_radius, min_neighbors = outlier_mask(vertices, sigma, radius)
+        n_original = len(mask)
+        n_kept = int(np.count_nonzero(mask))
+        print(f"[LoadGaussianPLY] Outlier removal: radius={used_radius:.4g}, sigma={sigma:g}, min neighbors={min_neighbors:.1f}, kept {n_kept}/{n_original} gaussians ({100*n_kept/max(n_original, 1):.1f}%)")
+        if n_kept == n_original or n_kept == 0:
+            print("[LoadGaussianPLY] No outliers removed, using original")
+            return cloud
+        return cloud.derive(np.asarray(vertices[mask]), *step)
+
+    @staticmethod
+    def _prune_step(k: int, center_weight: float) -> tuple[str, dict, str]:
+        return "prune", {"k": int(k), "center_weight": round(float(center_weight), 6)}, f"_prune{int(k)}"
+
+    def _prune_cloud(
+        self,
+        cloud,
+        prune_mode: str,
+        target_count: int = 1000000,
+        target_mb: float = 100.0,
+        center_weight: float = 0.0,
+        output_format: str = "ply",
+    ):
+        """Keep the top-K Gaussians by importance so the result fits a count or byte budget.
+
+        The byte budget is measured in ``output_format``, the encoding the result is written in.
+        """
+        import numpy as np
+        from .compact_formats import rows_for_format_budget
+        from .gaussian_ops import pruning_scores, top_k_mask
+
+        n_original = len(cloud)
+        if prune_mode == "target_size_mb":
+            dtype = cloud.data.dtype if cloud.is_loaded or cloud.header is None else cloud.header.vertex_dtype()
+            budget = target_mb * 1024 * 1024
+            k = rows_for_format_budget(dtype, budget, output_format)
+            per_row = budget / k if k > 0 else float("inf")
+            print(f"[LoadGaussianPLY] Prune budget: {target_mb:.1f} MB as {output_format} at ~{per_row:.1f} bytes/gaussian -> {k} gaussians")
+        else:
+            k = int(target_count)
+
+        if k >= n_original:
+            print(f"[LoadGaussianPLY] Prune: {n_original} gaussians already within budget ({k}), keeping all")
+            return cloud
+        if k <= 0:
+            print("[LoadGaussianPLY] Warning: Prune budget too small for a single gaussian, keeping all")
+            return cloud
+
+        step = self._prune_step(k, center_weight)
+        cached = cloud.cached_child(*step)
+        if cached is not None:
+            print(f"[LoadGaussianPLY] Using cached pruned PLY: {cached.path}")
+            return cached
+
+        vertices = cloud.data
+        with metrics.stage("prune", n_original):
+            scores = pruning_scores(vertices, center_weight)
+            mask, cutoff = top_k_mask(scores, k)
+            del scores
+        print(f"[LoadGaussianPLY] Prune: kept {k}/{n_original} gaussians ({100*k/n_original:.1f}%), score cutoff log(opacity×volume)={cutoff:.4f}")
+        return cloud.derive(np.asarray(vertices[mask]), *step)
+
+    def _reorder_cloud(self, cloud):
+        """Return ``cloud`` with rows sorted by 63-bit Morton code (one permutation for all columns)."""
+        import numpy as np
+        from .gaussian_ops import morton_codes
+
+        step = ("morton_order", {"bits": 21}, "_morton")
+        cached = cloud.cached_child(*step)
+        if cached is not None:
+            print(f"[LoadGaussianPLY] Using cached Morton-ordered PLY: {cached.path}")
+            return cached
+
+        vertices = cloud.data
+        with metrics.stage("reorder", len(vertices)):
+            codes = morton_codes(vertices)
+            if len(codes) < 2 or bool(np.all(codes[1:] >= codes[:-1])):
+                print("[LoadGaussianPLY] Gaussians already in Morton order")
+                return cloud
+            order = np.argsort(codes, kind="stable")
+            del codes
+            reordered = np.asarray(vertices[order])
+        print(f"[LoadGaussianPLY] Morton reorder: {len(order)} gaussians")
+        return cloud.derive(reordered, *step)
+
+    def _process_cloud(
+        self,
+        source,
+        enable_opacity_filter: str = "disabled",
+        opacity_threshold: float = 0.1,
+        stream_chunk_rows: int = 0,
+        outlier_removal: str = "disabled",
+        outlier_sigma: float = 3.0,
+        outlier_radius: float = 0.0,
+        prune_mode: str = "disabled",
+        prune_target_count: int = 1000000,
+        prune_target_mb: float = 100.0,
+        prune_center_weight: float = 0.0,
+        spatial_order: str = "source",
+        threads: int | None = None,
+        output_format: str = "ply",
+    ):
+        """Apply the optional processing steps shared by the loader/process nodes.
 
-            if "opacity" in field_names:
-                opacity = np.array(vertex["opacity"])
-                opacity = 1.0 / (1.0 + np.exp(-opacity))
-                print(f"[LoadGaussianPLY] Opacity range after sigmoid: [{opacity.min():.4f}, {opacity.max():.4f}]")
+        ``source`` is a resolved PLY path or a ``GaussianCloud``; a ``GaussianCloud`` is returned.
+        ``threads`` bounds the parallel kernels (``None``/0 defers to ``PLYPREVIEW_THREADS``).
+        ``output_format`` is the encoding the result will be written in, for the prune byte budget.
+        """
+        from .gaussian_cloud import GaussianCloud
+
+        cloud = source if isinstance(source, GaussianCloud) else GaussianCloud.from_path(source)
+        if enable_opacity_filter == "enabled":
+            streamable = cloud.path is not None and not cloud.is_loaded and cloud.header is not None and "opacity" in cloud.header.vertex_fields
+            if stream_chunk_rows and stream_chunk_rows > 0 and streamable:
+                cloud = GaussianCloud.from_path(self._filter_by_opacity(cloud.path, opacity_threshold, stream_chunk_rows))
             else:
-                print(f"[LoadGaussianPLY] Warning: No 'opacity' field found in {list(field_names)}")
+                try:
+                    cloud = self._filter_cloud_by_opacity(cloud, opacity_threshold, threads=threads)
+                except Exception as e:
+                    print(f"[LoadGaussianPLY] Error filtering PLY: {e}")
+        if outlier_removal == "enabled":
+            try:
+                cloud = self._remove_outliers(cloud, outlier_sigma, outlier_radius)
+            except Exception as e:
+                print(f"[LoadGaussianPLY] Error removing outliers: {e}")
+        if prune_mode != "disabled":
+            try:
+                cloud = self._prune_cloud(
+                    cloud, prune_mode, prune_target_count, prune_target_mb, prune_center_weight, output_format=output_format
+                )
+            except Exception as e:
+                print(f"[LoadGaussianPLY] Error pruning PLY: {e}")
+        if spatial_order == "morton":
+            try:
+                cloud = self._reorder_cloud(cloud)
+            except Exception as e:
+                print(f"[LoadGaussianPLY] Error reordering PLY: {e}")
+        return cloud
+
+    def _filter_by_opacity_streaming(self, ply_path: str, threshold: float, chunk_rows: int, output_path: str) -> str:
+        from .artifact_cache import derived_cache
+        from .ply_io import read_ply_header, sigmoid, stream_filter_vertices
+
+        try:
+            header = read_ply_header(ply_path)
+            field_names = header.vertex_fields
+            print(f"[LoadGaussianPLY] PLY fields: {tuple(field_names)}")
+            if "opacity" not in field_names:
+                print(f"[LoadGaussianPLY] Warning: No 'opacity' field found in {field_names}")
                 return ply_path
 
-            mask = opacity >= threshold
-            n_original = len(opacity)
-            n_filtered = int(np.sum(mask))
-            print(f"[LoadGaussianPLY] Opacity filter: threshold={threshold:.3f}, kept {n_filtered}/{n_original} gaussians ({100*n_filtered/n_original:.1f}%)")
+            opacity_range = [1.0, 0.0]
+
+            def keep(chunk):
+                opacity = sigmoid(chunk["opacity"])
+                if len(opacity):
+                    opacity_range[0] = min(opacity_range[0], float(opacity.min()))
+                    opacity_range[1] = max(opacity_range[1], float(opacity.max()))
+                return opacity >= threshold
+
+            derived_cache.prepare()
+            with metrics.stage("filter", header.vertex_count, os.path.getsize(ply_path)):
+                n_filtered, n_original = stream_filter_vertices(ply_path, output_path, keep, chunk_rows, header)
+
+            print(f"[LoadGaussianPLY] Opacity range after sigmoid: [{opacity_range[0]:.4f}, {opacity_range[1]:.4f}]")
+            print(f"[LoadGaussianPLY] Opacity filter (streaming, {chunk_rows} rows/chunk): threshold={threshold:.3f}, kept {n_filtered}/{n_original} gaussians ({100*n_filtered/max(n_original, 1):.1f}%)")
 
             if n_filtered == n_original or n_filtered == 0:
                 if n_filtered == 0:
@@ -165,22 +496,7 @@ class LoadGaussianPLY:
                     print("[LoadGaussianPLY] All gaussians passed filter, using original file")
                 return ply_path
 
-            filtered_arrays = []
-            for prop in vertex.data.dtype.names:
-                filtered_arrays.append(vertex[prop][mask])
-
-            filtered_data = np.empty(n_filtered, dtype=vertex.data.dtype)
-            for i, prop in enumerate(vertex.data.dtype.names):
-                filtered_data[prop] = filtered_arrays[i]
-
-            filtered_vertex = PlyElement.describe(filtered_data, "vertex")
-
-            base_name = os.path.basename(ply_path)
-            name_without_ext = os.path.splitext(base_name)[0]
-            output_folder = os.path.dirname(ply_path)
-            output_path = os.path.join(output_folder, f"{name_without_ext}_opacity{threshold:.2f}.ply")
-
-            PlyData([filtered_vertex], text=False).write(output_path)
+            derived_cache.commit(output_path)
             print(f"[LoadGaussianPLY] Saved filtered PLY: {output_path}")
             return output_path
         except Exception as e:
@@ -189,9 +505,10 @@ class LoadGaussianPLY:
 
     @classmethod
     def IS_CHANGED(cls, ply_file: str, **kwargs):
+        # Size/mtime/inode plus a sampled digest, so same-mtime rewrites change it too
         resolved = cls._resolve_selection(ply_file)
         if resolved and os.path.exists(resolved):
-            return os.path.getmtime(resolved)
+            return file_fingerprint(resolved)
         return ply_file
 
     @classmethod
@@ -203,6 +520,7 @@ class LoadGaussianPLY:
             return f"PLY file not found: {ply_file}"
         return True
 
+    @metrics.profile_input
     def load_ply(
         self,
         ply_file: str,
@@ -213,11 +531,24 @@ class LoadGaussianPLY:
         image_height: int = 512,
         enable_opacity_filter: str = "disabled",
         opacity_threshold: float = 0.1,
+        stream_chunk_rows: int = 0,
+        outlier_removal: str = "disabled",
+        outlier_sigma: float = 3.0,
+        outlier_radius: float = 0.0,
+        prune_mode: str = "disabled",
+        prune_target_count: int = 1000000,
+        prune_target_mb: float = 100.0,
+        prune_center_weight: float = 0.0,
+        output_format: str = "ply",
+        spatial_order: str = "source",
+        threads: int = 0,
+        profile: str = "disabled",
     ):
         if not ply_file or ply_file == "No PLY files found":
             raise ValueError("No PLY file selected")
 
-        resolved = self._resolve_selection(ply_file)
+        with metrics.stage("resolve"):
+            resolved = self._resolve_selection(ply_file)
         if resolved is None:
             raise ValueError(f"Could not resolve PLY file: {ply_file}")
         if not os.path.exists(resolved):
@@ -230,13 +561,36 @@ class LoadGaussianPLY:
             image_width, image_height = get_recommended_resolution(fov_degrees, target_scale)
             print(f"[LoadGaussianPLY] Auto-resolution for FOV {fov_degrees}° @ scale {target_scale}: {image_width}x{image_height}")
 
-        output_path = resolved
-        if enable_opacity_filter == "enabled":
-            output_path = self._filter_by_opacity(resolved, opacity_threshold)
+        cloud = self._process_cloud(
+            resolved,
+            enable_opacity_filter,
+            opacity_threshold,
+            stream_chunk_rows,
+            outlier_removal,
+            outlier_sigma,
+            outlier_radius,
+            prune_mode,
+            prune_target_count,
+            prune_target_mb,
+            prune_center_weight,
+            spatial_order,
+            threads or None,
+            output_format=output_format,
+        )
+        # Always materialized: ComfyUI's output cache does not see which outputs are linked,
+        # and the derived cache makes reruns a lookup
+        output_path = cloud.to_path(output_format)
+        processed = (
+            "enabled" in (enable_opacity_filter, outlier_removal)
+            or prune_mode != "disabled"
+            or output_format != "ply"
+            or spatial_order != "source"
+        )
+        if processed and output_path:
             print(f"[LoadGaussianPLY] Filtered PLY saved to: {output_path}")
 
         extrinsics = get_default_extrinsics()
         intrinsics = get_default_intrinsics(image_width, image_height, fov_degrees)
         print(f"[LoadGaussianPLY] Camera: FOV={fov_degrees}°, size={image_width}x{image_height}")
 
-        return (output_path, extrinsics, intrinsics)
+        return (output_path, extrinsics, intrinsics, cloud)
@@ -8,7 +8,9 @@ from .common import (
     get_default_intrinsics,
     get_recommended_resolution,
 )
-from .load_gaussian_ply import LoadGaussianPLY
+from .fingerprint import file_fingerprint
+from .load_gaussian_ply import OUTLIER_INPUTS, OUTPUT_INPUTS, PROFILE_INPUTS, PRUNE_INPUTS, THREADS_INPUTS, LoadGaussianPLY
+from .metrics import metrics
 
 
 class LoadGaussianPLYPath:
@@ -68,11 +70,23 @@ class LoadGaussianPLYPath:
                     "step": 0.01,
                     "tooltip": "Minimum opacity (0-1). Gaussians below this will be removed (used when filter enabled)",
                 }),
+                "stream_chunk_rows": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 100000000,
+                    "step": 100000,
+                    "tooltip": "Stream the opacity filter in chunks of this many Gaussians to keep memory flat on huge files (0 = filter in one pass)",
+                }),
+                **OUTLIER_INPUTS,
+                **PRUNE_INPUTS,
+                **OUTPUT_INPUTS,
+                **THREADS_INPUTS,
+                **PROFILE_INPUTS,
             },
         }
 
-    RETURN_TYPES = ("STRING", "EXTRINSICS", "INTRINSICS")
-    RETURN_NAMES = ("ply_path", "extrinsics", "intrinsics")
+    RETURN_TYPES = ("STRING", "EXTRINSICS", "INTRINSICS", "GAUSSIAN_CLOUD")
+    RETURN_NAMES = ("ply_path", "extrinsics", "intrinsics", "gaussian_cloud")
     FUNCTION = "load_ply"
     CATEGORY = "PlyPreview"
 
@@ -80,7 +94,7 @@ class LoadGaussianPLYPath:
     def IS_CHANGED(cls, ply_path, **kwargs):
         resolved = cls._resolve_path(ply_path)
         if resolved and os.path.exists(resolved):
-            return os.path.getmtime(resolved)
+            return file_fingerprint(resolved)
         return ply_path
 
     @classmethod
@@ -107,6 +121,7 @@ class LoadGaussianPLYPath:
             return candidate
         return None
 
+    @metrics.profile_input
     def load_ply(
         self,
         ply_path: str,
@@ -117,11 +132,24 @@ class LoadGaussianPLYPath:
         image_height: int = 512,
         enable_opacity_filter: str = "disabled",
         opacity_threshold: float = 0.1,
+        stream_chunk_rows: int = 0,
+        outlier_removal: str = "disabled",
+        outlier_sigma: float = 3.0,
+        outlier_radius: float = 0.0,
+        prune_mode: str = "disabled",
+        prune_target_count: int = 1000000,
+        prune_target_mb: float = 100.0,
+        prune_center_weight: float = 0.0,
+        output_format: str = "ply",
+        spatial_order: str = "source",
+        threads: int = 0,
+        profile: str = "disabled",
     ):
         if not ply_path or ply_path.strip() == "":
             raise ValueError("PLY path cannot be empty")
 
-        resolved = self._resolve_path(ply_path)
+        with metrics.stage("resolve"):
+            resolved = self._resolve_path(ply_path)
         if resolved is None:
             searched = [ply_path]
             if COMFYUI_OUTPUT_FOLDER:
@@ -132,8 +160,8 @@ class LoadGaussianPLYPath:
             formatted = "\n".join(f"  - {path}" for path in searched)
             raise ValueError(f"PLY file not found. Searched in:\n{formatted}")
 
-        if not resolved.lower().endswith(".ply"):
-            raise ValueError("File must be a .ply Gaussian splat")
+        if not resolved.lower().endswith((".ply", ".splat")):
+            raise ValueError("File must be a .ply or .splat Gaussian splat")
 
         print(f"[LoadGaussianPLYPath] Using PLY file: {resolved}")
 
@@ -141,14 +169,37 @@ class LoadGaussianPLYPath:
             image_width, image_height = get_recommended_resolution(fov_degrees, target_scale)
             print(f"[LoadGaussianPLYPath] Auto-resolution for FOV {fov_degrees}° @ scale {target_scale}: {image_width}x{image_height}")
 
-        output_path = resolved
-        if enable_opacity_filter == "enabled":
-            loader = LoadGaussianPLY()
-            output_path = loader._filter_by_opacity(resolved, opacity_threshold)
+        loader = LoadGaussianPLY()
+        cloud = loader._process_cloud(
+            resolved,
+            enable_opacity_filter,
+            opacity_threshold,
+            stream_chunk_rows,
+            outlier_removal,
+            outlier_sigma,
+            outlier_radius,
+            prune_mode,
+            prune_target_count,
+            prune_target_mb,
+            prune_center_weight,
+            spatial_order,
+            threads or None,
+            output_format=output_format,
+        )
+        # Always materialized: ComfyUI's output cache does not see which outputs are linked,
+        # and the derived cache makes reruns a lookup
+        output_path = cloud.to_path(output_format)
+        processed = (
+            "enabled" in (enable_opacity_filter, outlier_removal)
+            or prune_mode != "disabled"
+            or output_format != "ply"
+            or spatial_order != "source"
+        )
+        if processed and output_path:
             print(f"[LoadGaussianPLYPath] Filtered PLY saved to: {output_path}")
 
         extrinsics = get_default_extrinsics()
         intrinsics = get_default_intrinsics(image_width, image_height, fov_degrees)
         print(f"[LoadGaussianPLYPath] Camera: FOV={fov_degrees}°, size={image_width}x{image_height}")
 
-        return (output_path, extrinsics, intrinsics)
+        return (output_path, extrinsics, intrinsics, cloud)
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import os
+import time
+from .batch_process_gaussian_ply import BatchProcessGaussianPLY
+from .metrics import metrics
+
+MERGE_INPUTS = 4
+
+
+class MergeGaussianPLY:
+    """Concatenate several Gaussian splats into one PLY, streaming in bounded chunks."""
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        paths = {
+            f"ply_path_{i}": ("STRING", {
+                "forceInput": True,
+                "tooltip": f"PLY file path #{i} from an upstream node",
+            })
+            for i in range(1, MERGE_INPUTS + 1)
+        }
+        return {
+            "required": {},
+            "optional": {
+                **paths,
+                "folder": ("STRING", {
+                    "default": "",
+                    "multiline": False,
+                    "tooltip": "Also merge every file matching the pattern in this folder (absolute or relative to ComfyUI output/input), after the connected paths",
+                }),
+                "pattern": ("STRING", {
+                    "default": "*.ply",
+                    "multiline": False,
+                    "tooltip": "Glob pattern matched inside the folder, e.g. *.ply, view_*.ply or **/*.ply",
+                }),
+                "transforms": ("STRING", {
+                    "default": "",
+                    "multiline": True,
+                    "tooltip": "Optional JSON list, one entry per input in merge order: null, a 4x4 matrix, or {\"translation\": [x, y, z], \"rotation\": [w, x, y, z], \"scale\": s}",
+                }),
+                "chunk_rows": ("INT", {
+                    "default": 1000000,
+                    "min": 1000,
+                    "max": 100000000,
+                    "step": 100000,
+                    "tooltip": "Gaussians held in memory at a time while streaming the inputs",
+                }),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "GAUSSIAN_CLOUD")
+    RETURN_NAMES = ("ply_path", "gaussian_cloud")
+    FUNCTION = "merge"
+    CATEGORY = "PlyPreview"
+
+    @classmethod
+    def IS_CHANGED(cls, folder="", pattern="*.ply", **kwargs):
+        # Re-run when any matched folder file is added, removed or modified
+        from .fingerprint import file_fingerprint
+
+        root = BatchProcessGaussianPLY._resolve_folder(folder)
+        if root is None:
+            return folder
+        digest = hashlib.blake2b(digest_size=16)
+        for path in BatchProcessGaussianPLY._collect_sources(root, pattern, None):
+            digest.update(file_fingerprint(path).encode("utf-8"))
+        return digest.hexdigest()
+
+    def merge(self, folder: str = "", pattern: str = "*.ply", transforms: str = "", chunk_rows: int = 1000000, **ply_paths):
+        from .artifact_cache import derived_cache
+        from .concurrency import atomic_write, single_flight
+        from .fingerprint import file_fingerprint
+        from .gaussian_cloud import GaussianCloud
+        from .ply_merge import merge_plys, parse_transforms
+
+        inputs = []
+        for i in range(1, MERGE_INPUTS + 1):
+            path = ply_paths.get(f"ply_path_{i}")
+            if not path or path.strip() == "":
+                continue
+            resolved = path.strip().strip('"')
+            if not os.path.exists(resolved):
+                raise ValueError(f"PLY file not found: {resolved}")
+            if not resolved.lower().endswith((".ply", ".splat")):
+                raise ValueError("File must be a .ply or .splat Gaussian splat")
+            inputs.append(resolved)
+        if folder and folder.strip():
+            root = BatchProcessGaussianPLY._resolve_folder(folder)
+            if root is None:
+                raise ValueError(f"Folder not found: {folder}")
+            inputs.extend(BatchProcessGaussianPLY._collect_sources(root, pattern, derived_cache.directory))
+        if not inputs:
+            raise ValueError("Connect ply_path inputs or set a folder with matching files")
+
+        matrices = parse_transforms(transforms, len(inputs))
+        params = {
+            "version": 1,
+            "inputs": [file_fingerprint(path) for path in inputs],
+            "transforms": matrices,
+        }
+        output_path = derived_cache.path_for(inputs[0], "merge", params, f"_merged{len(inputs)}")
+        if derived_cache.lookup(output_path):
+            print(f"[MergeGaussianPLY] Using cached merge: {output_path}")
+            return (output_path, GaussianCloud.from_path(output_path))
+
+        def build() -> str:
+            if derived_cache.contains(output_path):
+                return output_path
+            print(f"[MergeGaussianPLY] Merging {len(inputs)} files")
+            start = time.perf_counter()
+            derived_cache.prepare()
+            with metrics.stage("merge") as span, atomic_write(output_path) as tmp_path:
+                total, dtype = merge_plys(inputs, tmp_path, matrices, chunk_rows)
+                span.gaussians = total
+                span.bytes = os.path.getsize(tmp_path)
+            derived_cache.commit(output_path)
+            print(f"[MergeGaussianPLY] Wrote {total} gaussians ({len(dtype.names)} properties) in {time.perf_counter() - start:.2f}s: {output_path}")
+            return output_path
+
+        # Concurrent prompts merging the same inputs share one write
+        single_flight.do(output_path, build)
+        return (output_path, GaussianCloud.from_path(output_path))
@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Per-stage timings, throughput counters and an optional cProfile hook.
+
+Stages (``resolve``, ``read``, ``filter``, ``write``, ``preview``, ...) are timed with
+``metrics.stage(name)``; each keeps cumulative Prometheus-style buckets plus a rolling
+window of recent durations for quantiles. Served by ``GET /plypreview/metrics``.
+
+Profiling is either process-wide (``PLYPREVIEW_PROFILE=1`` / ``POST /plypreview/profile``) or
+scoped to one call with ``metrics.profiling()``, which node ``profile`` inputs use.
+"""
+
+import contextvars
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Upper bounds in seconds; +Inf is implicit
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Recent samples kept per stage for the JSON quantiles
+ROLLING_WINDOW = 1024
+
+# Set inside ``Metrics.profiling()``; follows the current thread/task, not the process
+_profile_scope: contextvars.ContextVar[bool] = contextvars.ContextVar("plypreview_profile_scope", default=False)
+
+
+class StageSpan:
+    """Mutable record of one timed stage; set ``gaussians``/``bytes`` once they are known."""
+
+    __slots__ = ("gaussians", "bytes")
+
+    def __init__(self, gaussians: int = 0, nbytes: int = 0):
+        self.gaussians = gaussians
+        self.bytes = nbytes
+
+
+class _StageStats:
+    __slots__ = ("count", "errors", "seconds", "gaussians", "bytes", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.gaussians = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.recent: deque[float] = deque(maxlen=ROLLING_WINDOW)
+
+    def observe(self, seconds: float, span: StageSpan, failed: bool) -> None:
+        self.count += 1
+        self.errors += int(failed)
+        self.seconds += seconds
+        self.gaussians += int(span.gaussians or 0)
+        self.bytes += int(span.bytes or 0)
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.recent.append(seconds)
+
+
+def _quantile(ordered: list[float], q: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Metrics:
+    """Thread-safe registry of stage statistics with an optional per-stage profiler."""
+
+    def __init__(self, profile: bool = False):
+        self.profile_enabled = profile
+        self.started = time.time()
+        self._stages: dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profile: pstats.Stats | None = None
+
+    @contextmanager
+    def stage(self, name: str, gaussians: int = 0, nbytes: int = 0):
+        """Time the enclosed block as stage ``name``; yields a :class:`StageSpan`."""
+        span = StageSpan(gaussians, nbytes)
+        # Only the outermost stage of a thread is profiled (one profiler per thread)
+        depth = getattr(self._local, "depth", 0)
+        wanted = self.profile_enabled or _profile_scope.get()
+        profiler = cProfile.Profile() if wanted and depth == 0 else None
+        self._local.depth = depth + 1
+        failed = False
+        start = time.perf_counter()
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows one active profiler per process; another stage holds it
+                profiler = None
+        try:
+            yield span
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            self._local.depth = depth
+            with self._lock:
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = _StageStats()
+                stats.observe(elapsed, span, failed)
+                if profiler is not None:
+                    if self._profile is None:
+                        self._profile = pstats.Stats(profiler)
+                    else:
+                        self._profile.add(profiler)
+
+    def timed(self, name: str):
+        """Decorator timing every call of the wrapped function as stage ``name``."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def profiling(self, enabled: bool = True):
+        """Profile the stages run inside this block (in this thread/task) regardless of the global switch."""
+        token = _profile_scope.set(bool(enabled) or _profile_scope.get())
+        try:
+            yield
+        finally:
+            _profile_scope.reset(token)
+
+    def profile_input(self, fn):
+        """Decorator for node functions: run the call under :meth:`profiling` when ``profile="enabled"``."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.profiling(kwargs.get("profile") == "enabled"):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def set_profiling(self, enabled: bool, reset: bool = False) -> None:
+        with self._lock:
+            self.profile_enabled = enabled
+            if reset:
+                self._profile = None
+
+    def profile_report(self, sort: str = "cumulative", limit: int = 40) -> str:
+        """pstats text of everything profiled since the last reset."""
+        with self._lock:
+            if self._profile is None:
+                return "No profile collected; set a node's profile input or POST /plypreview/profile?enabled=1\n"
+            out = io.StringIO()
+            self._profile.stream = out
+            self._profile.sort_stats(sort).print_stats(limit)
+            return out.getvalue()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._profile = None
+            self.started = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {}
+            for name, stats in sorted(self._stages.items()):
+                ordered = sorted(stats.recent)
+                stages[name] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "seconds_total": round(stats.seconds, 6),
+                    "gaussians_total": stats.gaussians,
+                    "bytes_total": stats.bytes,
+                    "gaussians_per_s": round(stats.gaussians / stats.seconds) if stats.seconds > 0 and stats.gaussians else None,
+                    "recent": {
+                        "samples": len(ordered),
+                        "p50": _quantile(ordered, 0.5),
+                        "p90": _quantile(ordered, 0.9),
+                        "p99": _quantile(ordered, 0.99),
+                        "max": ordered[-1] if ordered else None,
+                    },
+                }
+            return {"since": self.started, "profiling": self.profile_enabled, "stages": stages}
+
+    def prometheus(self) -> str:
+        """Text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP plypreview_stage_seconds Wall time per processing stage.",
+            "# TYPE plypreview_stage_seconds histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            for name, stats in stages:
+                cumulative = 0
+                for bound, count in zip(HISTOGRAM_BUCKETS + (float("inf"),), stats.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'plypreview_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'plypreview_stage_seconds_sum{{stage="{name}"}} {stats.seconds:.6f}')
+                lines.append(f'plypreview_stage_seconds_count{{stage="{name}"}} {stats.count}')
+            for metric, attr, help_text in (
+                ("plypreview_stage_errors_total", "errors", "Stage runs that raised."),
+                ("plypreview_gaussians_total", "gaussians", "Gaussians processed per stage."),
+                ("plypreview_bytes_total", "bytes", "Bytes read or written per stage."),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, stats in stages:
+                    lines.append(f'{metric}{{stage="{name}"}} {getattr(stats, attr)}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics(profile=os.environ.get("PLYPREVIEW_PROFILE", "0") == "1")
@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Header-only PLY metadata with a persistent (path, size, mtime) index."""
+
+import atexit
+import json
+import os
+import threading
+
+import numpy as np
+
+from .artifact_cache import derived_cache
+from .compact_formats import SPLAT_DTYPE, is_compressed_ply, load_vertex_columns
+from .concurrency import atomic_write
+from .fingerprint import file_fingerprint
+from .ply_io import read_ply_header, sigmoid
+
+# Percentiles are estimated from an evenly strided sample on very large scenes
+STATS_SAMPLE_ROWS = 1_000_000
+PERCENTILES = (5, 25, 50, 75, 95)
+MAX_INDEX_ENTRIES = 20000
+# Coalesce index rewrites: flush after this many new entries, or this long after the first
+FLUSH_EVERY = 256
+FLUSH_DELAY_SECONDS = 5.0
+
+
+def sh_degree_from_fields(fields: list[str]) -> int:
+    """Infer the spherical-harmonics degree from the number of ``f_rest_*`` properties."""
+    n_rest = sum(1 for name in fields if name.startswith("f_rest_"))
+    coeffs = n_rest // 3 + 1
+    degree = 0
+    while (degree + 1) ** 2 < coeffs:
+        degree += 1
+    return degree
+
+
+def _percentiles(values: np.ndarray) -> dict[str, float]:
+    if len(values) == 0:
+        return {}
+    result = np.percentile(values, PERCENTILES)
+    return {f"p{p}": round(float(v), 6) for p, v in zip(PERCENTILES, result)}
+
+
+def extract_ply_info(ply_path: str) -> dict:
+    """Read the header plus one vectorized pass for bounds and opacity/scale percentiles."""
+    file_size = os.path.getsize(ply_path)
+    if ply_path.lower().endswith(".splat"):
+        header = None
+        vertices = load_vertex_columns(ply_path)
+        fields = list(vertices.dtype.names)
+        count = len(vertices)
+        info: dict = {
+            "format": "splat",
+            "encoding": "splat",
+            "elements": {"splat": count},
+            "bytes_per_gaussian": SPLAT_DTYPE.itemsize,
+        }
+    else:
+        header = read_ply_header(ply_path)
+        vertices = None
+        fields = header.vertex_fields
+        count = header.vertex_count
+        vertex = header.element("vertex")
+        half = vertex is not None and any(p.type in ("half", "float16") for p in vertex.properties)
+        info = {
+            "format": header.format,
+            "encoding": "float16" if half else "ply",
+            "elements": {e.name: e.count for e in header.elements},
+            "bytes_per_gaussian": header.vertex_dtype().itemsize if header.is_binary else None,
+        }
+        if is_compressed_ply(header):
+            sh = header.element("sh")
+            fields = fields + ([p.name for p in sh.properties] if sh is not None else [])
+            info["encoding"] = "compressed"
+            info["bytes_per_gaussian"] = round((file_size - header.header_size) / max(count, 1), 2)
+
+    info = {
+        "filename": os.path.basename(ply_path),
+        "file_size": file_size,
+        "vertex_count": count,
+        "properties": fields,
+        "sh_degree": sh_degree_from_fields(fields),
+        **info,
+    }
+
+    if count == 0:
+        return info
+    if vertices is None:
+        vertices = load_vertex_columns(ply_path, header)
+    fields = vertices.dtype.names
+    if not all(axis in fields for axis in ("x", "y", "z")):
+        return info
+
+    stride = max(1, count // STATS_SAMPLE_ROWS)
+    sample = vertices[::stride]
+
+    # Bounds are exact; percentiles come from the (possibly strided) sample
+    info["bounds"] = {
+        "min": [float(np.min(vertices[axis])) for axis in ("x", "y", "z")],
+        "max": [float(np.max(vertices[axis])) for axis in ("x", "y", "z")],
+    }
+    if "opacity" in fields:
+        info["opacity_percentiles"] = _percentiles(sigmoid(np.asarray(sample["opacity"], dtype=np.float32)))
+    scale_fields = [name for name in ("scale_0", "scale_1", "scale_2") if name in fields]
+    if scale_fields:
+        log_scales = np.stack([np.asarray(sample[name], dtype=np.float32) for name in scale_fields])
+        info["scale_percentiles"] = _percentiles(np.exp(log_scales.max(axis=0)))
+    info["stats_sample_rows"] = int(len(sample))
+    return info
+
+
+class PlyInfoIndex:
+    """Memoizes :func:`extract_ply_info` by (realpath, fingerprint) and persists it as JSON.
+
+    New entries are written in batches (every ``FLUSH_EVERY`` inserts, ``FLUSH_DELAY_SECONDS``
+    after the first unsaved one, and at exit), so filling the index costs a bounded number
+    of rewrites rather than one full rewrite per file.
+    """
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._entries: dict[str, dict] | None = None
+        self._dirty = 0
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        # Serializes writers so an older snapshot never lands after a newer one
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _key(ply_path: str) -> str:
+        real = os.path.realpath(ply_path)
+        return f"{real}|{file_fingerprint(real)}"
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self, payload: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with atomic_write(self.index_path) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+        except OSError as e:
+            print(f"[PlyPreview] Warning: failed to persist PLY info index: {e}")
+
+    def flush(self) -> None:
+        """Write unsaved entries to disk now."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty or self._entries is None:
+                    return
+                payload = json.dumps(self._entries)
+                self._dirty = 0
+            self._save(payload)
+
+    def _mark_dirty(self) -> bool:
+        """Record one unsaved entry (lock held); returns True when a flush is due now."""
+        self._dirty += 1
+        if self._dirty >= FLUSH_EVERY:
+            return True
+        if self._timer is None:
+            self._timer = threading.Timer(FLUSH_DELAY_SECONDS, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        return False
+
+    def get(self, ply_path: str) -> dict:
+        key = self._key(ply_path)
+        with self._lock:
+            entries = self._load()
+            cached = entries.get(key)
+            if cached is not None:
+                return cached
+
+        info = extract_ply_info(ply_path)
+
+        with self._lock:
+            entries = self._load()
+            real = key.rsplit("|", 1)[0]
+            # Drop stale entries for the same file before recording the new one
+            for stale in [k for k in entries if k.rsplit("|", 1)[0] == real]:
+                del entries[stale]
+            while len(entries) >= MAX_INDEX_ENTRIES:
+                del entries[next(iter(entries))]
+            entries[key] = info
+            flush_now = self._mark_dirty()
+        if flush_now:
+            self.flush()
+        return info
+
+
+ply_info_index = PlyInfoIndex(os.path.join(derived_cache.directory, "index", "ply_info.json"))
@@ -0,0 +1,394 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Lightweight PLY header parsing and zero-copy vertex access for Gaussian splats."""
+
+import os
+
+import numpy as np
+
+from .concurrency import partial_path
+
+# PLY scalar type name -> numpy type code (without byte order)
+PLY_TO_NUMPY = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "half": "f2",
+    "float16": "f2",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+NUMPY_TO_PLY = {
+    "i1": "char",
+    "u1": "uchar",
+    "i2": "short",
+    "u2": "ushort",
+    "i4": "int",
+    "u4": "uint",
+    "f2": "half",
+    "f4": "float",
+    "f8": "double",
+}
+
+MAX_HEADER_BYTES = 1024 * 1024
+
+
+class PlyProperty:
+    """A single PLY property declaration (scalar or list)."""
+
+    __slots__ = ("name", "type", "count_type")
+
+    def __init__(self, name: str, type: str, count_type: str | None = None):
+        self.name = name
+        self.type = type
+        self.count_type = count_type
+
+    @property
+    def is_list(self) -> bool:
+        return self.count_type is not None
+
+
+class PlyElementInfo:
+    """A PLY element declaration: name, row count and properties."""
+
+    __slots__ = ("name", "count", "properties")
+
+    def __init__(self, name: str, count: int):
+        self.name = name
+        self.count = count
+        self.properties: list[PlyProperty] = []
+
+    @property
+    def has_lists(self) -> bool:
+        return any(p.is_list for p in self.properties)
+
+    def dtype(self, byte_order: str = "<") -> np.dtype:
+        if self.has_lists:
+            raise ValueError(f"Element '{self.name}' has list properties and no fixed row size")
+        return np.dtype([(p.name, byte_order + PLY_TO_NUMPY[p.type]) for p in self.properties])
+
+
+class PlyHeader:
+    """Parsed PLY header with the byte offset where element data begins."""
+
+    def __init__(self, format: str, elements: list[PlyElementInfo], comments: list[str], header_size: int):
+        self.format = format
+        self.elements = elements
+        self.comments = comments
+        self.header_size = header_size
+
+    @property
+    def is_binary(self) -> bool:
+        return self.format in ("binary_little_endian", "binary_big_endian")
+
+    @property
+    def byte_order(self) -> str:
+        return ">" if self.format == "binary_big_endian" else "<"
+
+    def element(self, name: str) -> PlyElementInfo | None:
+        for element in self.elements:
+            if element.name == name:
+                return element
+        return None
+
+    @property
+    def vertex_count(self) -> int:
+        vertex = self.element("vertex")
+        return vertex.count if vertex is not None else 0
+
+    @property
+    def vertex_fields(self) -> list[str]:
+        vertex = self.element("vertex")
+        return [p.name for p in vertex.properties] if vertex is not None else []
+
+    def vertex_dtype(self) -> np.dtype:
+        vertex = self.element("vertex")
+        if vertex is None:
+            raise ValueError("PLY file has no 'vertex' element")
+        return vertex.dtype(self.byte_order)
+
+    def element_offset(self, name: str) -> int:
+        """Byte offset of an element block; elements before it must have fixed-size rows."""
+        offset = self.header_size
+        for element in self.elements:
+            if element.name == name:
+                return offset
+            offset += element.count * element.dtype(self.byte_order).itemsize
+        raise ValueError(f"PLY file has no '{name}' element")
+
+    def vertex_offset(self) -> int:
+        return self.element_offset("vertex")
+
+
+def read_ply_header(ply_path: str) -> PlyHeader:
+    """Parse the PLY header without touching the element data."""
+    with open(ply_path, "rb") as f:
+        magic = f.readline()
+        if magic.strip() != b"ply":
+            raise ValueError(f"Not a PLY file: {ply_path}")
+
+        fmt = None
+        elements: list[PlyElementInfo] = []
+        comments: list[str] = []
+        while True:
+            raw = f.readline()
+            if not raw:
+                raise ValueError(f"Unexpected end of file in PLY header: {ply_path}")
+            if f.tell() > MAX_HEADER_BYTES:
+                raise ValueError(f"PLY header exceeds {MAX_HEADER_BYTES} bytes: {ply_path}")
+
+            line = raw.decode("ascii", errors="replace").strip()
+            if not line:
+                continue
+            parts = line.split()
+            keyword = parts[0]
+
+            if keyword == "end_header":
+                break
+            if keyword == "format":
+                fmt = parts[1]
+            elif keyword == "element":
+                elements.append(PlyElementInfo(parts[1], int(parts[2])))
+            elif keyword == "property":
+                if not elements:
+                    raise ValueError(f"PLY property declared before any element: {line}")
+                if parts[1] == "list":
+                    prop = PlyProperty(parts[4], parts[3], parts[2])
+                else:
+                    if parts[1] not in PLY_TO_NUMPY:
+                        raise ValueError(f"Unsupported PLY property type: {parts[1]}")
+                    prop = PlyProperty(parts[2], parts[1])
+                elements[-1].properties.append(prop)
+            elif keyword in ("comment", "obj_info"):
+                comments.append(line[len(keyword):].strip())
+
+        header_size = f.tell()
+
+    if fmt not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"Unsupported PLY format: {fmt}")
+
+    return PlyHeader(fmt, elements, comments, header_size)
+
+
+def open_element_memmap(ply_path: str, name: str, header: PlyHeader | None = None) -> np.ndarray:
+    """Memory-map one binary element block as a structured array (no data is read yet)."""
+    if header is None:
+        header = read_ply_header(ply_path)
+    if not header.is_binary:
+        raise ValueError(f"Cannot memory-map {header.format} PLY: {ply_path}")
+
+    element = header.element(name)
+    if element is None:
+        raise ValueError(f"PLY file has no '{name}' element: {ply_path}")
+    dtype = element.dtype(header.byte_order)
+    if element.count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(ply_path, dtype=dtype, mode="r", offset=header.element_offset(name), shape=(element.count,))
+
+
+def open_vertex_memmap(ply_path: str, header: PlyHeader | None = None) -> np.ndarray:
+    """Memory-map the binary vertex block as a structured array (no data is read yet)."""
+    return open_element_memmap(ply_path, "vertex", header)
+
+
+def read_vertex_data(ply_path: str, header: PlyHeader | None = None) -> np.ndarray:
+    """Return the vertex block: memory-mapped for binary PLYs, parsed via plyfile for ASCII."""
+    if header is None:
+        header = read_ply_header(ply_path)
+
+    vertex = header.element("vertex")
+    if vertex is None:
+        raise ValueError(f"PLY file has no 'vertex' element: {ply_path}")
+
+    if header.is_binary and not vertex.has_lists and not any(
+        e.has_lists for e in header.elements[: header.elements.index(vertex)]
+    ):
+        return open_vertex_memmap(ply_path, header)
+
+    from plyfile import PlyData
+
+    return PlyData.read(ply_path)["vertex"].data
+
+
+def _little_endian(dtype: np.dtype) -> np.dtype:
+    return np.dtype([(name, dtype[name].newbyteorder("<")) for name in dtype.names])
+
+
+def _header_lines(elements: list[tuple[str, np.dtype, str]], comments: list[str] | None) -> list[str]:
+    lines = ["ply", "format binary_little_endian 1.0"]
+    for comment in comments or []:
+        lines.append(f"comment {comment}")
+    for name, dtype, count in elements:
+        lines.append(f"element {name} {count}")
+        for field in dtype.names:
+            code = dtype[field].str[1:]
+            if code not in NUMPY_TO_PLY:
+                raise ValueError(f"Unsupported dtype for PLY property '{field}': {dtype[field]}")
+            lines.append(f"property {NUMPY_TO_PLY[code]} {field}")
+    lines.append("end_header")
+    return lines
+
+
+def _vertex_header_lines(dtype: np.dtype, count: str, comments: list[str] | None) -> list[str]:
+    return _header_lines([("vertex", dtype, count)], comments)
+
+
+def write_vertex_ply(ply_path: str, data: np.ndarray, comments: list[str] | None = None) -> None:
+    """Write a structured vertex array as a binary little-endian PLY."""
+    write_ply_elements(ply_path, [("vertex", data)], comments)
+
+
+def write_ply_elements(ply_path: str, elements: list[tuple[str, np.ndarray]], comments: list[str] | None = None) -> None:
+    """Write several structured element arrays, in order, as one binary little-endian PLY."""
+    blocks = []
+    for name, data in elements:
+        little = _little_endian(data.dtype)
+        blocks.append((name, data if data.dtype == little else data.astype(little)))
+
+    lines = _header_lines([(name, data.dtype, str(len(data))) for name, data in blocks], comments)
+    with open(ply_path, "wb") as f:
+        f.write(("\n".join(lines) + "\n").encode("ascii"))
+        for _, data in blocks:
+            np.ascontiguousarray(data).tofile(f)
+
+
+def header_byte_size(elements: list[tuple[str, np.dtype]], comments: list[str] | None = None) -> int:
+    """Upper bound on the header size this module writes for ``elements`` (any row counts)."""
+    lines = _header_lines([(name, _little_endian(dtype), "9" * _COUNT_WIDTH) for name, dtype in elements], comments)
+    return len("\n".join(lines)) + 1
+
+
+def rows_for_byte_budget(dtype: np.dtype, max_bytes: int, comments: list[str] | None = None) -> int:
+    """Largest row count whose binary PLY written by this module fits in ``max_bytes``."""
+    header_bytes = header_byte_size([("vertex", dtype)], comments)
+    return max(0, (int(max_bytes) - header_bytes) // dtype.itemsize)
+
+
+def write_vertex_chunks(
+    ply_path: str,
+    dtype: np.dtype,
+    count: int,
+    chunks,
+    comments: list[str] | None = None,
+    leading: list[tuple[str, np.ndarray]] | None = None,
+) -> None:
+    """Write ``count`` rows supplied as an iterable of structured chunks with bounded memory.
+
+    ``leading`` elements (small, fully in memory) are written before the vertex block.
+    """
+    little = _little_endian(dtype)
+    blocks = []
+    for name, data in leading or []:
+        element_dtype = _little_endian(data.dtype)
+        blocks.append((name, data if data.dtype == element_dtype else data.astype(element_dtype)))
+    lines = _header_lines([(name, data.dtype, str(len(data))) for name, data in blocks] + [("vertex", little, str(count))], comments)
+    written = 0
+    with open(ply_path, "wb") as f:
+        f.write(("\n".join(lines) + "\n").encode("ascii"))
+        for _, data in blocks:
+            np.ascontiguousarray(data).tofile(f)
+        for chunk in chunks:
+            if chunk.dtype != little:
+                chunk = chunk.astype(little)
+            np.ascontiguousarray(chunk).tofile(f)
+            written += len(chunk)
+    if written != count:
+        raise ValueError(f"Expected {count} rows, wrote {written}")
+
+
+# Zero-padded so the final count can be patched in place once streaming finishes
+_COUNT_WIDTH = 12
+
+
+def iter_vertex_chunks(ply_path: str, chunk_rows: int, header: PlyHeader | None = None):
+    """Yield consecutive slices of the vertex block, reading at most ``chunk_rows`` rows at a time."""
+    if header is None:
+        header = read_ply_header(ply_path)
+    chunk_rows = max(1, int(chunk_rows))
+
+    vertex = header.element("vertex")
+    if vertex is None:
+        raise ValueError(f"PLY file has no 'vertex' element: {ply_path}")
+
+    if not header.is_binary or vertex.has_lists:
+        data = read_vertex_data(ply_path, header)
+        for start in range(0, len(data), chunk_rows):
+            yield data[start:start + chunk_rows]
+        return
+
+    dtype = header.vertex_dtype()
+    remaining = header.vertex_count
+    with open(ply_path, "rb") as f:
+        f.seek(header.vertex_offset())
+        while remaining > 0:
+            chunk = np.fromfile(f, dtype=dtype, count=min(chunk_rows, remaining))
+            if len(chunk) == 0:
+                raise ValueError(f"Truncated PLY vertex block: {ply_path}")
+            remaining -= len(chunk)
+            yield chunk
+
+
+def stream_filter_vertices(
+    ply_path: str,
+    output_path: str,
+    keep_fn,
+    chunk_rows: int,
+    header: PlyHeader | None = None,
+) -> tuple[int, int]:
+    """Filter the vertex block chunk by chunk into ``output_path`` with bounded memory.
+
+    ``keep_fn`` maps a chunk of rows to a boolean mask. Kept rows are appended to a
+    temporary file whose ``element vertex`` count is patched at the end. Returns
+    ``(kept, total)``; when nothing is written the output file is not created.
+    """
+    if header is None:
+        header = read_ply_header(ply_path)
+    little = _little_endian(header.vertex_dtype())
+    lines = _vertex_header_lines(little, "0" * _COUNT_WIDTH, None)
+    header_bytes = ("\n".join(lines) + "\n").encode("ascii")
+    count_offset = header_bytes.index(b"element vertex ") + len(b"element vertex ")
+
+    tmp_path = partial_path(output_path)
+    kept = 0
+    total = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(header_bytes)
+            for chunk in iter_vertex_chunks(ply_path, chunk_rows, header):
+                mask = keep_fn(chunk)
+                rows = chunk[mask]
+                if rows.dtype != little:
+                    rows = rows.astype(little)
+                rows.tofile(f)
+                kept += len(rows)
+                total += len(chunk)
+            f.seek(count_offset)
+            f.write(f"{kept:0{_COUNT_WIDTH}d}".encode("ascii"))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if kept == 0 or kept == total:
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, output_path)
+    return kept, total
+
+
+def sigmoid(values: np.ndarray) -> np.ndarray:
+    """Logistic activation used for stored Gaussian opacities."""
+    return 1.0 / (1.0 + np.exp(-values))
+
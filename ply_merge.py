@@ -0,0 +1,185 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Stream several Gaussian splat files into one PLY with a reconciled property schema."""
+
+import json
+
+import numpy as np
+
+from .compact_formats import compact_vertex_count, compact_vertex_dtype, is_compressed_ply, iter_compact_chunks
+from .gaussian_ops import similarity_parts, transform_gaussians
+from .ply_io import iter_vertex_chunks, read_ply_header, write_vertex_chunks
+
+MERGE_CHUNK_ROWS = 1_000_000
+REST_PREFIX = "f_rest_"
+# Missing properties are zero-filled, except the identity quaternion's real part
+FIELD_DEFAULTS = {"rot_0": 1.0}
+
+
+class MergeSource:
+    """One input: its vertex schema and count, read from the header (or size) alone.
+
+    Compressed PLY and ``.splat`` inputs are decoded slice by slice in ``chunks()``, so no
+    input is held decoded in memory beyond the slice being written.
+    """
+
+    __slots__ = ("path", "header", "dtype", "count", "compact")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header = None
+        if not path.lower().endswith(".splat"):
+            self.header = read_ply_header(path)
+        self.compact = self.header is None or is_compressed_ply(self.header)
+        if self.compact:
+            self.dtype = compact_vertex_dtype(path, self.header)
+            self.count = compact_vertex_count(path, self.header)
+        else:
+            self.dtype = self.header.vertex_dtype()
+            self.count = self.header.vertex_count
+
+    @property
+    def rest_count(self) -> int:
+        return sum(1 for name in self.dtype.names if name.startswith(REST_PREFIX))
+
+    def chunks(self, chunk_rows: int):
+        if self.compact:
+            yield from iter_compact_chunks(self.path, chunk_rows, self.header)
+        else:
+            yield from iter_vertex_chunks(self.path, chunk_rows, self.header)
+
+
+def merged_dtype(sources: list[MergeSource]) -> np.dtype:
+    """Union of the input properties, in first-seen order, each promoted to a common type.
+
+    ``f_rest_*`` form one block sized for the highest SH degree among the inputs, placed
+    where they first appear.
+    """
+    order: list[str] = []
+    types: dict[str, list[np.dtype]] = {}
+    rest_types: list[np.dtype] = []
+    for source in sources:
+        for name in source.dtype.names:
+            field = source.dtype[name]
+            if name.startswith(REST_PREFIX):
+                rest_types.append(field)
+                name = REST_PREFIX
+            if name not in types:
+                order.append(name)
+                types[name] = []
+            types[name].append(field)
+
+    rest_count = max((source.rest_count for source in sources), default=0)
+    fields = []
+    for name in order:
+        if name == REST_PREFIX:
+            rest_type = np.result_type(*rest_types).newbyteorder("<")
+            fields.extend((f"{REST_PREFIX}{i}", rest_type) for i in range(rest_count))
+        else:
+            fields.append((name, np.result_type(*types[name]).newbyteorder("<")))
+    return np.dtype(fields)
+
+
+def rest_mapping(rest_in: int, rest_out: int) -> list[tuple[int, int]]:
+    """``(source, target)`` f_rest indices; coefficients are stored channel-major (all R, G, B)."""
+    if rest_in % 3 or rest_out % 3:
+        return [(i, i) for i in range(rest_in)]
+    per_in, per_out = rest_in // 3, rest_out // 3
+    return [(c * per_in + k, c * per_out + k) for c in range(3) for k in range(per_in)]
+
+
+def conform_rows(rows: np.ndarray, dtype: np.dtype, rest_out: int) -> np.ndarray:
+    """Copy ``rows`` into the merged ``dtype``, padding missing properties and remapping SH."""
+    out = np.zeros(len(rows), dtype=dtype)
+    names = rows.dtype.names
+    for name, value in FIELD_DEFAULTS.items():
+        if name in dtype.names and name not in names:
+            out[name] = value
+    rest_in = 0
+    for name in names:
+        if name.startswith(REST_PREFIX):
+            rest_in += 1
+        else:
+            out[name] = rows[name]
+    for source, target in rest_mapping(rest_in, rest_out):
+        out[f"{REST_PREFIX}{target}"] = rows[f"{REST_PREFIX}{source}"]
+    return out
+
+
+def parse_transforms(spec: str, count: int) -> list[list[list[float]] | None]:
+    """Per-input 4x4 matrices from JSON: a list aligned with the inputs.
+
+    Entries are ``null`` (identity), a 4x4 matrix, or an object with optional
+    ``translation`` ``[x, y, z]``, ``rotation`` (``[w, x, y, z]`` quaternion or 3x3 matrix)
+    and ``scale`` (uniform).
+    """
+    if not spec or not spec.strip():
+        return [None] * count
+    try:
+        entries = json.loads(spec)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"transforms is not valid JSON: {e}") from e
+    if not isinstance(entries, list):
+        raise ValueError("transforms must be a JSON list with one entry per input")
+    if len(entries) > count:
+        raise ValueError(f"transforms has {len(entries)} entries for {count} inputs")
+
+    matrices = []
+    for entry in entries + [None] * (count - len(entries)):
+        if entry is None:
+            matrices.append(None)
+            continue
+        if isinstance(entry, dict):
+            matrix = np.eye(4)
+            rotation = np.asarray(entry.get("rotation", [1.0, 0.0, 0.0, 0.0]), dtype=np.float64)
+            if rotation.shape == (4,):
+                w, x, y, z = rotation / np.linalg.norm(rotation)
+                rotation = np.array([
+                    [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+                    [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+                    [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+                ])
+            matrix[:3, :3] = float(entry.get("scale", 1.0)) * rotation
+            matrix[:3, 3] = entry.get("translation", [0.0, 0.0, 0.0])
+        else:
+            matrix = np.asarray(entry, dtype=np.float64)
+        similarity_parts(matrix)
+        if np.allclose(matrix[:3], np.eye(4)[:3]):
+            matrices.append(None)
+        else:
+            matrices.append([[round(float(v), 9) for v in row] for row in matrix])
+    return matrices
+
+
+def merge_plys(
+    paths: list[str],
+    output_path: str,
+    transforms: list | None = None,
+    chunk_rows: int = MERGE_CHUNK_ROWS,
+) -> tuple[int, np.dtype]:
+    """Concatenate ``paths`` into ``output_path`` with at most ``chunk_rows`` rows in memory.
+
+    The merged schema and total count come from the headers, so the output header is
+    written once, up front. Returns ``(total_rows, merged_dtype)``.
+    """
+    sources = [MergeSource(path) for path in paths]
+    dtype = merged_dtype(sources)
+    rest_out = sum(1 for name in dtype.names if name.startswith(REST_PREFIX))
+    total = sum(source.count for source in sources)
+    transforms = transforms or [None] * len(sources)
+    for matrix in transforms:
+        if matrix is not None:
+            # Reject shear/reflection before anything is written
+            similarity_parts(matrix)
+    chunk_rows = max(1, int(chunk_rows))
+
+    def chunks():
+        for source, matrix in zip(sources, transforms):
+            for rows in source.chunks(chunk_rows):
+                rows = conform_rows(rows, dtype, rest_out)
+                if matrix is not None:
+                    transform_gaussians(rows, matrix)
+                yield rows
+
+    write_vertex_chunks(output_path, dtype, total, chunks(), comments=[f"merged from {len(paths)} files"])
+    return total, dtype
@@ -0,0 +1,290 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Serve resolved PLY files by opaque id with ETags, byte ranges and precompressed variants."""
+
+import gzip
+import hashlib
+import os
+import shutil
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from .artifact_cache import derived_cache
+from .concurrency import atomic_write, run_blocking
+from .fingerprint import file_fingerprint
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ROUTE_PREFIX = "/plypreview/ply/"
+READ_CHUNK_BYTES = 1024 * 1024
+MAX_REGISTERED = 4096
+# Compressing tiny files is not worth the extra cache entries
+MIN_COMPRESS_BYTES = 256 * 1024
+# Encodes of multi-hundred-MB files run on their own small pool, apart from route I/O;
+# beyond MAX_PENDING_BUILDS queued variants, requests are served uncompressed instead
+PRECOMPRESS_WORKERS = 1
+MAX_PENDING_BUILDS = 32
+
+
+class PlyRegistry:
+    """Maps opaque ids emitted by nodes to resolved file paths (bounded, most recent kept)."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._paths: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _id_for(real: str) -> str:
+        return hashlib.sha1(real.encode("utf-8")).hexdigest()[:24]
+
+    def register(self, path: str) -> str:
+        real = os.path.realpath(path)
+        ply_id = self._id_for(real)
+        with self._lock:
+            self._paths[ply_id] = real
+            self._paths.move_to_end(ply_id)
+            while len(self._paths) > self.capacity:
+                self._paths.popitem(last=False)
+        return ply_id
+
+    def resolve(self, ply_id: str) -> str | None:
+        with self._lock:
+            return self._paths.get(ply_id)
+
+    def contains(self, path: str) -> bool:
+        """Whether ``path`` (after resolving symlinks) is currently registered."""
+        real = os.path.realpath(path)
+        with self._lock:
+            return self._paths.get(self._id_for(real)) == real
+
+
+ply_registry = PlyRegistry(MAX_REGISTERED)
+
+
+def register_ply(path: str) -> str:
+    """Register ``path`` for streaming and return its route URL."""
+    return ROUTE_PREFIX + ply_registry.register(path)
+
+
+def strong_etag(path: str) -> str:
+    """ETag from the file's stat identity and content fingerprint.
+
+    Unlike the fingerprint, the ETag also changes with the mtime or inode, so a client
+    never keeps bytes the server cannot prove are current.
+    """
+    st = os.stat(path)
+    token = f"{os.path.realpath(path)}|{st.st_size}-{st.st_mtime_ns}-{st.st_ino}|{file_fingerprint(path)}"
+    return '"' + hashlib.blake2b(token.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into an inclusive (start, end); None means serve the full body.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    spec = header[len("bytes="):].strip()
+    start_text, _, end_text = spec.partition("-")
+    try:
+        if start_text == "":
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError("empty suffix range")
+            start = max(0, size - length)
+            end = size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+class Precompressor:
+    """Builds gzip/zstd siblings in the derived cache in the background and reuses them.
+
+    Builds run on a fixed pool of ``PRECOMPRESS_WORKERS`` threads; a variant is queued at
+    most once, and at most ``MAX_PENDING_BUILDS`` are queued or running at a time.
+    """
+
+    def __init__(self, workers: int = PRECOMPRESS_WORKERS, max_pending: int = MAX_PENDING_BUILDS):
+        self.max_pending = max_pending
+        self._building: set[str] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="plypreview-precompress")
+
+    @staticmethod
+    def encodings() -> list[str]:
+        return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+    @staticmethod
+    def _variant_path(path: str, encoding: str) -> str:
+        ext = ".ply.zst" if encoding == "zstd" else ".ply.gz"
+        return derived_cache.path_for(path, "precompress", {"encoding": encoding}, "", ext=ext)
+
+    def lookup(self, path: str, encoding: str) -> str | None:
+        variant = self._variant_path(path, encoding)
+        if derived_cache.lookup(variant):
+            return variant
+        self._schedule(path, encoding, variant)
+        return None
+
+    def _schedule(self, path: str, encoding: str, variant: str) -> None:
+        with self._lock:
+            if variant in self._building or len(self._building) >= self.max_pending:
+                return
+            self._building.add(variant)
+        self._executor.submit(self._build, path, encoding, variant)
+
+    def _build(self, path: str, encoding: str, variant: str) -> None:
+        try:
+            derived_cache.prepare()
+            with atomic_write(variant) as tmp_path, open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                if encoding == "zstd":
+                    zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+                else:
+                    with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=6, mtime=0) as gz:
+                        shutil.copyfileobj(src, gz, READ_CHUNK_BYTES)
+            derived_cache.commit(variant)
+            print(f"[PlyPreview] Precompressed {os.path.basename(path)} ({encoding})")
+        except Exception as e:
+            print(f"[PlyPreview] Warning: precompression failed for {path}: {e}")
+        finally:
+            with self._lock:
+                self._building.discard(variant)
+
+
+precompressor = Precompressor()
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def _stat_regular_file(path: str) -> os.stat_result | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _open_at(path: str, start: int):
+    f = open(path, "rb")
+    f.seek(start)
+    return f
+
+
+async def _send_file(request, response: web.StreamResponse, path: str, start: int, length: int) -> web.StreamResponse:
+    await response.prepare(request)
+    if request.method == "HEAD":
+        return response
+    # open() can block on slow or network storage, like the reads themselves
+    f = await run_blocking(_open_at, path, start)
+    try:
+        remaining = length
+        while remaining > 0:
+            chunk = await run_blocking(f.read, min(READ_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            await response.write(chunk)
+            remaining -= len(chunk)
+    finally:
+        await run_blocking(f.close)
+    await response.write_eof()
+    return response
+
+
+async def handle_ply_request(request) -> web.StreamResponse:  # pragma: no cover - runtime route
+    path = ply_registry.resolve(request.match_info.get("ply_id", ""))
+    st = await run_blocking(_stat_regular_file, path) if path is not None else None
+    if st is None:
+        return web.json_response({"error": "Unknown or expired PLY id"}, status=404)
+
+    # A fingerprint miss reads sampled blocks of the file
+    etag = await run_blocking(strong_etag, path)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "no-cache",
+        "Content-Type": "application/octet-stream",
+        "Vary": "Accept-Encoding",
+    }
+
+    range_header = request.headers.get("Range", "")
+    if_range = request.headers.get("If-Range")
+    if range_header and if_range is not None and if_range.strip() != etag:
+        range_header = ""
+
+    # A client holding the identity body is still current, whichever encoding it would get now
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return web.Response(status=304, headers={**headers, "ETag": etag})
+
+    if not range_header:
+        accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        if st.st_size >= MIN_COMPRESS_BYTES:
+            for encoding in precompressor.encodings():
+                if encoding not in accepted:
+                    continue
+                # Fingerprinting the source may read sample blocks; keep it off the event loop
+                variant = await run_blocking(precompressor.lookup, path, encoding)
+                if variant is None:
+                    continue
+                variant_etag = etag[:-1] + f"-{encoding}" + '"'
+                if _etag_matches(request.headers.get("If-None-Match"), variant_etag):
+                    return web.Response(status=304, headers={**headers, "ETag": variant_etag})
+                size = await run_blocking(os.path.getsize, variant)
+                response = web.StreamResponse(
+                    status=200,
+                    headers={
+                        **headers,
+                        "ETag": variant_etag,
+                        "Content-Encoding": encoding,
+                        "Content-Length": str(size),
+                    },
+                )
+                return await _send_file(request, response, variant, 0, size)
+
+    headers["ETag"] = etag
+    try:
+        byte_range = parse_range(range_header, st.st_size)
+    except ValueError:
+        return web.Response(status=416, headers={**headers, "Content-Range": f"bytes */{st.st_size}"})
+
+    if byte_range is None:
+        response = web.StreamResponse(status=200, headers={**headers, "Content-Length": str(st.st_size)})
+        return await _send_file(request, response, path, 0, st.st_size)
+
+    start, end = byte_range
+    length = end - start + 1
+    response = web.StreamResponse(
+        status=206,
+        headers={**headers, "Content-Length": str(length), "Content-Range": f"bytes {start}-{end}/{st.st_size}"},
+    )
+    return await _send_file(request, response, path, start, length)
@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Cached preview-only derivatives of a Gaussian PLY (importance-ordered, SH-stripped)."""
+
+import numpy as np
+
+from .artifact_cache import derived_cache
+from .concurrency import atomic_write, single_flight
+from .gaussian_ops import importance_order
+from .compact_formats import load_vertex_columns
+from .ply_io import write_vertex_chunks
+
+# Bounds the gather buffer while writing the derived copy
+WRITE_CHUNK_ROWS = 1_000_000
+
+# Everything the gsplat.js viewer reads; higher-order SH (f_rest_*) and normals are dropped
+PREVIEW_FIELD_PREFIXES = ("f_dc_", "scale_", "rot_")
+PREVIEW_FIELDS = ("x", "y", "z", "opacity")
+
+
+def preview_fields(names) -> list[str]:
+    """Column subset (in source order) needed to render the DC color preview."""
+    return [name for name in names if name in PREVIEW_FIELDS or name.startswith(PREVIEW_FIELD_PREFIXES)]
+
+
+def build_preview_derivative(ply_path: str, progressive: bool = False, strip_sh: bool = False) -> str:
+    """Return a cached preview copy of ``ply_path``.
+
+    ``progressive`` sorts rows by descending importance so any prefix of the vertex block
+    is the best available subset and the viewer can render after the first chunk.
+    ``strip_sh`` keeps only position, DC color, opacity, scale and rotation columns.
+    """
+    if not progressive and not strip_sh:
+        return ply_path
+
+    params = {"version": 1, "order": "importance" if progressive else "source", "columns": "dc" if strip_sh else "all"}
+    suffix = ("_progressive" if progressive else "") + ("_lite" if strip_sh else "")
+    output_path = derived_cache.path_for(ply_path, "preview", params, suffix)
+    if derived_cache.lookup(output_path):
+        print(f"[PreviewGaussian] Using cached preview derivative: {output_path}")
+        return output_path
+
+    # Concurrent previews of the same source share one build
+    return single_flight.do(output_path, lambda: _write_preview_derivative(ply_path, output_path, progressive, strip_sh))
+
+
+def _write_preview_derivative(ply_path: str, output_path: str, progressive: bool, strip_sh: bool) -> str:
+    if derived_cache.contains(output_path):
+        return output_path
+
+    # Compact encodings (float16 / compressed PLY / .splat) are decoded first
+    vertices = load_vertex_columns(ply_path)
+    order = importance_order(vertices) if progressive else None
+
+    names = vertices.dtype.names
+    if strip_sh:
+        names = preview_fields(names)
+    # The viewer's PLY parser only reads float32/int32, so half/double columns become float32
+    out_dtype = np.dtype([(name, "<f4" if vertices.dtype[name].kind == "f" else vertices.dtype[name]) for name in names])
+
+    def chunks():
+        for start in range(0, len(vertices), WRITE_CHUNK_ROWS):
+            if order is not None:
+                rows = vertices[order[start:start + WRITE_CHUNK_ROWS]]
+            else:
+                rows = vertices[start:start + WRITE_CHUNK_ROWS]
+            if rows.dtype == out_dtype:
+                yield rows
+                continue
+            # Column projection and conversion: copy only the kept fields into a packed chunk
+            chunk = np.empty(len(rows), dtype=out_dtype)
+            for name in names:
+                chunk[name] = rows[name]
+            yield chunk
+
+    derived_cache.prepare()
+    with atomic_write(output_path) as tmp_path:
+        write_vertex_chunks(tmp_path, out_dtype, len(vertices), chunks())
+    derived_cache.commit(output_path)
+    print(f"[PreviewGaussian] Wrote preview derivative ({len(vertices)} gaussians, {len(names)} properties): {output_path}")
+    return output_path
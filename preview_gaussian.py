@@ -2,6 +2,8 @@
 
 import os
 from .common import COMFYUI_OUTPUT_FOLDER
+from .metrics import metrics
+from .ply_stream import register_ply
 
 
 class PreviewGaussianNode:
@@ -10,19 +12,36 @@ class PreviewGaussianNode:
     @classmethod
     def INPUT_TYPES(cls):
         return {
-            "required": {
+            "required": {},
+            "optional": {
                 "ply_path": ("STRING", {
                     "forceInput": True,
                     "tooltip": "Path to a Gaussian Splatting PLY file",
                 }),
-            },
-            "optional": {
+                "gaussian_cloud": ("GAUSSIAN_CLOUD", {
+                    "tooltip": "In-memory Gaussian cloud (written to the derived cache only if not already on disk)",
+                }),
                 "extrinsics": ("EXTRINSICS", {
                     "tooltip": "4x4 camera extrinsics matrix for initial view",
                 }),
                 "intrinsics": ("INTRINSICS", {
                     "tooltip": "3x3 camera intrinsics matrix for FOV",
                 }),
+                "preview_mode": (["full", "progressive"], {
+                    "default": "full",
+                    "tooltip": "progressive: stream an importance-ordered copy and render before the download finishes",
+                }),
+                "progressive_chunk_rows": ("INT", {
+                    "default": 200000,
+                    "min": 1000,
+                    "max": 10000000,
+                    "step": 10000,
+                    "tooltip": "Gaussians in the first progressive render; later refinements double it",
+                }),
+                "strip_sh": (["disabled", "enabled"], {
+                    "default": "disabled",
+                    "tooltip": "Serve a cached copy with only position, DC color, opacity, scale and rotation (the viewer ignores higher-order SH)",
+                }),
             },
         }
 
@@ -31,7 +50,20 @@ class PreviewGaussianNode:
     FUNCTION = "preview_gaussian"
     CATEGORY = "PlyPreview/visualization"
 
-    def preview_gaussian(self, ply_path: str, extrinsics=None, intrinsics=None):
+    @metrics.timed("preview")
+    def preview_gaussian(
+        self,
+        ply_path: str = "",
+        extrinsics=None,
+        intrinsics=None,
+        preview_mode: str = "full",
+        progressive_chunk_rows: int = 200000,
+        strip_sh: str = "disabled",
+        gaussian_cloud=None,
+    ):
+        if gaussian_cloud is not None:
+            ply_path = gaussian_cloud.to_path()
+
         if not ply_path:
             print("[PreviewGaussian] No PLY path provided")
             return {"ui": {"error": ["No PLY path provided"]}}
@@ -58,6 +90,37 @@ class PreviewGaussianNode:
             "file_size_mb": [round(file_size_mb, 2)],
         }
 
+        served_path = ply_path
+        progressive = preview_mode == "progressive"
+        if progressive or strip_sh == "enabled":
+            try:
+                from .preview_derivatives import build_preview_derivative
+
+                served_path = build_preview_derivative(ply_path, progressive=progressive, strip_sh=strip_sh == "enabled")
+                if progressive:
+                    ui_data["progressive"] = [{"chunk_rows": int(progressive_chunk_rows)}]
+            except Exception as e:
+                print(f"[PreviewGaussian] Warning: preview derivative failed, serving full file: {e}")
+                served_path = ply_path
+
+        if served_path != ply_path:
+            served_size = os.path.getsize(served_path)
+            ui_data["served_size_mb"] = [round(served_size / (1024 * 1024), 2)]
+            ui_data["savings_percent"] = [round(100.0 * (1.0 - served_size / max(file_size, 1)), 1)]
+            print(f"[PreviewGaussian] Serving derivative: {served_size / (1024 * 1024):.2f} MB ({ui_data['savings_percent'][0]}% smaller)")
+
+        # Opaque streaming URL; works for files outside the output folder too
+        ui_data["ply_url"] = [register_ply(served_path)]
+
+        try:
+            from .ply_info import ply_info_index
+
+            info = ply_info_index.get(ply_path)
+            ui_data["ply_info"] = [info]
+            print(f"[PreviewGaussian] {info['vertex_count']} gaussians, SH degree {info['sh_degree']}")
+        except Exception as e:
+            print(f"[PreviewGaussian] Warning: could not read PLY metadata: {e}")
+
         if extrinsics is not None:
             ui_data["extrinsics"] = [extrinsics]
         if intrinsics is not None:
@@ -2,7 +2,8 @@
 
 import os
 from .common import get_default_extrinsics, get_default_intrinsics, get_recommended_resolution
-from .load_gaussian_ply import LoadGaussianPLY
+from .load_gaussian_ply import OUTLIER_INPUTS, OUTPUT_INPUTS, PROFILE_INPUTS, PRUNE_INPUTS, THREADS_INPUTS, LoadGaussianPLY
+from .metrics import metrics
 
 
 class ProcessGaussianPLY:
@@ -11,13 +12,15 @@ class ProcessGaussianPLY:
     @classmethod
     def INPUT_TYPES(cls):
         return {
-            "required": {
+            "required": {},
+            "optional": {
                 "ply_path": ("STRING", {
                     "forceInput": True,
                     "tooltip": "PLY file path from upstream node (e.g., SHARP Predict)",
                 }),
-            },
-            "optional": {
+                "gaussian_cloud": ("GAUSSIAN_CLOUD", {
+                    "tooltip": "In-memory Gaussian cloud from a loader/process node (used instead of ply_path when connected)",
+                }),
                 "input_extrinsics": ("EXTRINSICS", {
                     "tooltip": "Extrinsics from upstream node (ignored if override_camera enabled)",
                 }),
@@ -71,17 +74,31 @@ class ProcessGaussianPLY:
                     "step": 0.01,
                     "tooltip": "Minimum opacity (0-1). Gaussians below this will be removed",
                 }),
+                "stream_chunk_rows": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 100000000,
+                    "step": 100000,
+                    "tooltip": "Stream the opacity filter in chunks of this many Gaussians to keep memory flat on huge files (0 = filter in one pass)",
+                }),
+                **OUTLIER_INPUTS,
+                **PRUNE_INPUTS,
+                **OUTPUT_INPUTS,
+                **THREADS_INPUTS,
+                **PROFILE_INPUTS,
             },
         }
 
-    RETURN_TYPES = ("STRING", "EXTRINSICS", "INTRINSICS")
-    RETURN_NAMES = ("ply_path", "extrinsics", "intrinsics")
+    RETURN_TYPES = ("STRING", "EXTRINSICS", "INTRINSICS", "GAUSSIAN_CLOUD")
+    RETURN_NAMES = ("ply_path", "extrinsics", "intrinsics", "gaussian_cloud")
     FUNCTION = "process_ply"
     CATEGORY = "PlyPreview"
 
+    @metrics.profile_input
     def process_ply(
         self,
-        ply_path: str,
+        ply_path: str = "",
+        gaussian_cloud=None,
         input_extrinsics=None,
         input_intrinsics=None,
         override_camera: str = "enabled",
@@ -92,17 +109,34 @@ class ProcessGaussianPLY:
         image_height: int = 512,
         enable_opacity_filter: str = "disabled",
         opacity_threshold: float = 0.1,
+        stream_chunk_rows: int = 0,
+        outlier_removal: str = "disabled",
+        outlier_sigma: float = 3.0,
+        outlier_radius: float = 0.0,
+        prune_mode: str = "disabled",
+        prune_target_count: int = 1000000,
+        prune_target_mb: float = 100.0,
+        prune_center_weight: float = 0.0,
+        output_format: str = "ply",
+        spatial_order: str = "source",
+        threads: int = 0,
+        profile: str = "disabled",
     ):
-        if not ply_path or ply_path.strip() == "":
-            raise ValueError("PLY path cannot be empty")
+        if gaussian_cloud is not None:
+            source = gaussian_cloud
+            print(f"[ProcessGaussianPLY] Input cloud: {gaussian_cloud!r}")
+        else:
+            if not ply_path or ply_path.strip() == "":
+                raise ValueError("PLY path cannot be empty")
 
-        resolved = ply_path.strip().strip('"')
-        if not os.path.exists(resolved):
-            raise ValueError(f"PLY file not found: {resolved}")
-        if not resolved.lower().endswith(".ply"):
-            raise ValueError("File must be a .ply Gaussian splat")
+            resolved = ply_path.strip().strip('"')
+            if not os.path.exists(resolved):
+                raise ValueError(f"PLY file not found: {resolved}")
+            if not resolved.lower().endswith((".ply", ".splat")):
+                raise ValueError("File must be a .ply or .splat Gaussian splat")
 
-        print(f"[ProcessGaussianPLY] Input PLY: {resolved}")
+            source = resolved
+            print(f"[ProcessGaussianPLY] Input PLY: {resolved}")
 
         if override_camera == "enabled":
             if auto_resolution == "enabled":
@@ -126,10 +160,33 @@ class ProcessGaussianPLY:
                 intrinsics = get_default_intrinsics(image_width, image_height, fov_degrees)
                 print("[ProcessGaussianPLY] Using default intrinsics (no input provided)")
 
-        output_path = resolved
-        if enable_opacity_filter == "enabled":
-            loader = LoadGaussianPLY()
-            output_path = loader._filter_by_opacity(resolved, opacity_threshold)
+        loader = LoadGaussianPLY()
+        cloud = loader._process_cloud(
+            source,
+            enable_opacity_filter,
+            opacity_threshold,
+            stream_chunk_rows,
+            outlier_removal,
+            outlier_sigma,
+            outlier_radius,
+            prune_mode,
+            prune_target_count,
+            prune_target_mb,
+            prune_center_weight,
+            spatial_order,
+            threads or None,
+            output_format=output_format,
+        )
+        # Always materialized: ComfyUI's output cache does not see which outputs are linked,
+        # and the derived cache makes reruns a lookup
+        output_path = cloud.to_path(output_format)
+        processed = (
+            "enabled" in (enable_opacity_filter, outlier_removal)
+            or prune_mode != "disabled"
+            or output_format != "ply"
+            or spatial_order != "source"
+        )
+        if processed and output_path:
             print(f"[ProcessGaussianPLY] Filtered PLY saved to: {output_path}")
 
-        return (output_path, extrinsics, intrinsics)
+        return (output_path, extrinsics, intrinsics, cloud)
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import time
+from .load_gaussian_ply import PROFILE_INPUTS, THREADS_INPUTS
+from .metrics import metrics
+
+BACKGROUNDS = {
+    "black": (0.0, 0.0, 0.0),
+    "white": (1.0, 1.0, 1.0),
+    "gray": (0.5, 0.5, 0.5),
+}
+
+
+class RenderGaussianPLY:
+    """Rasterize a Gaussian splat on the CPU into an IMAGE (no GPU needed)."""
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "background": (list(BACKGROUNDS), {
+                    "default": "black",
+                    "tooltip": "Color behind the splat; the MASK output holds the accumulated opacity",
+                }),
+                "scale_modifier": ("FLOAT", {
+                    "default": 1.0,
+                    "min": 0.01,
+                    "max": 10.0,
+                    "step": 0.01,
+                    "tooltip": "Multiplies every Gaussian's scale before projection",
+                }),
+            },
+            "optional": {
+                "ply_path": ("STRING", {
+                    "forceInput": True,
+                    "tooltip": "PLY file path from upstream node",
+                }),
+                "gaussian_cloud": ("GAUSSIAN_CLOUD", {
+                    "tooltip": "In-memory Gaussian cloud from a loader/process node (used instead of ply_path when connected)",
+                }),
+                "extrinsics": ("EXTRINSICS", {
+                    "tooltip": "4x4 world-to-camera matrix (OpenCV axes: x right, y down, z forward); identity when not connected",
+                }),
+                "intrinsics": ("INTRINSICS", {
+                    "tooltip": "3x3 camera intrinsics; the image is 2*cx by 2*cy pixels. Built from the fallback size/FOV below when not connected",
+                }),
+                "image_width": ("INT", {
+                    "default": 512,
+                    "min": 16,
+                    "max": 8192,
+                    "step": 16,
+                    "tooltip": "Image width when no intrinsics are connected",
+                }),
+                "image_height": ("INT", {
+                    "default": 512,
+                    "min": 16,
+                    "max": 8192,
+                    "step": 16,
+                    "tooltip": "Image height when no intrinsics are connected",
+                }),
+                "fov_degrees": ("FLOAT", {
+                    "default": 50.0,
+                    "min": 1.0,
+                    "max": 170.0,
+                    "step": 0.5,
+                    "tooltip": "Horizontal field of view when no intrinsics are connected",
+                }),
+                **THREADS_INPUTS,
+                **PROFILE_INPUTS,
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE", "MASK")
+    RETURN_NAMES = ("image", "mask")
+    FUNCTION = "render"
+    CATEGORY = "PlyPreview/visualization"
+
+    @metrics.profile_input
+    def render(
+        self,
+        background: str = "black",
+        scale_modifier: float = 1.0,
+        ply_path: str = "",
+        gaussian_cloud=None,
+        extrinsics=None,
+        intrinsics=None,
+        image_width: int = 512,
+        image_height: int = 512,
+        fov_degrees: float = 50.0,
+        threads: int = 0,
+        profile: str = "disabled",
+    ):
+        import numpy as np
+        import torch
+        from .common import get_default_extrinsics, get_default_intrinsics
+        from .gaussian_cloud import GaussianCloud
+        from .splat_render import render_splats
+
+        if gaussian_cloud is not None:
+            cloud = gaussian_cloud
+            print(f"[RenderGaussianPLY] Input cloud: {gaussian_cloud!r}")
+        else:
+            if not ply_path or ply_path.strip() == "":
+                raise ValueError("Connect a ply_path or gaussian_cloud input")
+
+            resolved = ply_path.strip().strip('"')
+            if not os.path.exists(resolved):
+                raise ValueError(f"PLY file not found: {resolved}")
+            if not resolved.lower().endswith((".ply", ".splat")):
+                raise ValueError("File must be a .ply or .splat Gaussian splat")
+
+            cloud = GaussianCloud.from_path(resolved)
+            print(f"[RenderGaussianPLY] Input PLY: {resolved}")
+
+        if intrinsics is None:
+            intrinsics = get_default_intrinsics(image_width, image_height, fov_degrees)
+        if extrinsics is None:
+            extrinsics = get_default_extrinsics()
+        intrinsics = np.asarray(intrinsics, dtype=np.float64)
+        width = max(1, int(round(2.0 * intrinsics[0, 2])))
+        height = max(1, int(round(2.0 * intrinsics[1, 2])))
+
+        start = time.perf_counter()
+        with metrics.stage("render", len(cloud)) as span:
+            rgb, alpha, visible = render_splats(
+                cloud.data,
+                np.asarray(extrinsics, dtype=np.float64),
+                intrinsics,
+                width,
+                height,
+                background=BACKGROUNDS.get(background, BACKGROUNDS["black"]),
+                scale_modifier=scale_modifier,
+                threads=threads or None,
+            )
+            span.bytes = rgb.nbytes
+        elapsed = time.perf_counter() - start
+        print(f"[RenderGaussianPLY] Rendered {visible}/{len(cloud)} gaussians at {width}x{height} in {elapsed:.2f}s")
+
+        return (torch.from_numpy(rgb).unsqueeze(0), torch.from_numpy(alpha).unsqueeze(0))
@@ -0,0 +1,262 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Persistent octree index for region reads of large Gaussian PLYs.
+
+The index is one binary PLY in the derived cache: an ``octree_node`` element (bounding
+box, row range and children of every node, breadth-first) followed by the source's vertex
+block reordered along the Morton curve, so every node covers one contiguous row range.
+Crops walk the octree against a set of half-spaces (an axis-aligned box or a camera
+frustum) and memory-map only the row ranges of intersecting leaves.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from .artifact_cache import derived_cache
+from .compact_formats import POSITION_FIELDS, load_vertex_columns
+from .concurrency import atomic_write, single_flight
+from .gaussian_ops import MORTON_BITS, morton_codes
+from .metrics import metrics
+from .ply_io import open_element_memmap, read_ply_header, write_vertex_chunks
+
+INDEX_VERSION = 1
+# Leaves are split until they hold at most this many rows (~2 MB at SH degree 3)
+LEAF_ROWS = 8192
+# Smaller clouds are cheaper to filter in memory than to index
+INDEX_MIN_ROWS = 262_144
+# Bounds the gather buffer while writing the reordered copy
+WRITE_CHUNK_ROWS = 1_000_000
+
+OCTREE_DTYPE = np.dtype([
+    ("min_x", "<f4"), ("min_y", "<f4"), ("min_z", "<f4"),
+    ("max_x", "<f4"), ("max_y", "<f4"), ("max_z", "<f4"),
+    ("start", "<u4"), ("count", "<u4"),
+    ("first_child", "<i4"), ("child_count", "u1"),
+])
+
+
+def gaussian_positions(vertices: np.ndarray) -> np.ndarray:
+    """``(N, 3)`` float32 centers."""
+    return np.stack([np.asarray(vertices[name], dtype=np.float32) for name in POSITION_FIELDS], axis=1)
+
+
+def build_octree(codes: np.ndarray, xyz: np.ndarray, leaf_rows: int = LEAF_ROWS) -> np.ndarray:
+    """Breadth-first octree over rows already sorted by Morton ``codes``.
+
+    A node splits on the next 3 code bits while it holds more than ``leaf_rows`` rows;
+    bounding boxes are the tight bounds of the rows below each node.
+    """
+    starts, counts, levels = [0], [len(codes)], [0]
+    first_child, child_count = [-1], [0]
+    i = 0
+    while i < len(starts):
+        start, count, level = starts[i], counts[i], levels[i]
+        if count > leaf_rows and level < MORTON_BITS:
+            shift = np.uint64(3 * (MORTON_BITS - level - 1))
+            digits = (codes[start:start + count] >> shift) & np.uint64(7)
+            bounds = np.searchsorted(digits, np.arange(9, dtype=np.uint64)) + start
+            first_child[i] = len(starts)
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                if hi > lo:
+                    starts.append(int(lo))
+                    counts.append(int(hi - lo))
+                    levels.append(level + 1)
+                    first_child.append(-1)
+                    child_count.append(0)
+            child_count[i] = len(starts) - first_child[i]
+        i += 1
+
+    nodes = np.zeros(len(starts), dtype=OCTREE_DTYPE)
+    nodes["start"] = starts
+    nodes["count"] = counts
+    nodes["first_child"] = first_child
+    nodes["child_count"] = child_count
+    if len(codes) == 0:
+        return nodes
+
+    # Leaves partition the rows, so one reduceat over them in row order gives their bounds
+    leaves = np.flatnonzero(nodes["child_count"] == 0)
+    leaves = leaves[np.argsort(nodes["start"][leaves])]
+    low = np.minimum.reduceat(xyz, nodes["start"][leaves].astype(np.int64), axis=0)
+    high = np.maximum.reduceat(xyz, nodes["start"][leaves].astype(np.int64), axis=0)
+    bounds = np.zeros((len(nodes), 6), dtype=np.float32)
+    bounds[leaves, :3] = low
+    bounds[leaves, 3:] = high
+    # Children always follow their parent in breadth-first order
+    for node in range(len(nodes) - 1, -1, -1):
+        if child_count[node]:
+            children = bounds[first_child[node]:first_child[node] + child_count[node]]
+            bounds[node, :3] = children[:, :3].min(axis=0)
+            bounds[node, 3:] = children[:, 3:].max(axis=0)
+    for axis, name in enumerate(("min_x", "min_y", "min_z", "max_x", "max_y", "max_z")):
+        nodes[name] = bounds[:, axis]
+    return nodes
+
+
+def spatial_index_path(ply_path: str) -> str:
+    return derived_cache.path_for(ply_path, "spatial_index", {"version": INDEX_VERSION, "leaf_rows": LEAF_ROWS}, "_octree")
+
+
+def ensure_spatial_index(ply_path: str) -> str:
+    """Return the cached index of ``ply_path``, building it on first use."""
+    index_path = spatial_index_path(ply_path)
+    if derived_cache.lookup(index_path):
+        return index_path
+    # Concurrent crops of the same source share one build
+    return single_flight.do(index_path, lambda: _write_spatial_index(ply_path, index_path))
+
+
+def _write_spatial_index(ply_path: str, index_path: str) -> str:
+    if derived_cache.contains(index_path):
+        return index_path
+
+    start = time.perf_counter()
+    with metrics.stage("index") as span:
+        # Compact encodings (float16 / compressed PLY / .splat) are decoded first
+        vertices = load_vertex_columns(ply_path)
+        span.gaussians = len(vertices)
+        codes = morton_codes(vertices)
+        order = np.argsort(codes, kind="stable")
+        nodes = build_octree(codes[order], gaussian_positions(vertices)[order])
+        del codes
+
+        # The reordered copy keeps every column; half/double stay as stored
+        out_dtype = np.dtype([(name, vertices.dtype[name].newbyteorder("<")) for name in vertices.dtype.names])
+
+        def chunks():
+            for begin in range(0, len(vertices), WRITE_CHUNK_ROWS):
+                yield vertices[order[begin:begin + WRITE_CHUNK_ROWS]]
+
+        derived_cache.prepare()
+        with atomic_write(index_path) as tmp_path:
+            write_vertex_chunks(
+                tmp_path, out_dtype, len(vertices), chunks(),
+                comments=[f"plypreview spatial index v{INDEX_VERSION}"],
+                leading=[("octree_node", nodes)],
+            )
+            span.bytes = os.path.getsize(tmp_path)
+        derived_cache.commit(index_path)
+    leaves = int(np.count_nonzero(nodes["child_count"] == 0))
+    print(f"[SpatialIndex] Indexed {len(vertices)} gaussians into {len(nodes)} octree nodes ({leaves} leaves) in {time.perf_counter() - start:.2f}s: {index_path}")
+    return index_path
+
+
+def box_planes(box_min, box_max) -> np.ndarray:
+    """Half-spaces ``n·p + d >= 0`` (rows ``[nx, ny, nz, d]``) bounding an axis-aligned box."""
+    planes = []
+    for axis in range(3):
+        normal = np.zeros(3)
+        normal[axis] = 1.0
+        planes.append([*normal, -float(box_min[axis])])
+        planes.append([*-normal, float(box_max[axis])])
+    return np.asarray(planes, dtype=np.float64)
+
+
+def frustum_planes(extrinsics, intrinsics, near: float = 0.01, far: float = 0.0) -> np.ndarray:
+    """World-space half-spaces of the pinhole frustum covering a ``2·cx × 2·cy`` image.
+
+    ``extrinsics`` maps world to camera (OpenCV axes); ``far = 0`` leaves the frustum open.
+    """
+    extrinsics = np.asarray(extrinsics, dtype=np.float64)
+    intrinsics = np.asarray(intrinsics, dtype=np.float64)
+    fx, fy, cx, cy = intrinsics[0, 0], intrinsics[1, 1], intrinsics[0, 2], intrinsics[1, 2]
+    # Camera-space planes: 0 <= u <= 2cx, 0 <= v <= 2cy, z >= near (, z <= far)
+    camera = [
+        [fx, 0.0, cx, 0.0],
+        [-fx, 0.0, cx, 0.0],
+        [0.0, fy, cy, 0.0],
+        [0.0, -fy, cy, 0.0],
+        [0.0, 0.0, 1.0, -near],
+    ]
+    if far > 0:
+        camera.append([0.0, 0.0, -1.0, far])
+    camera = np.asarray(camera)
+    rotation, translation = extrinsics[:3, :3], extrinsics[:3, 3]
+    planes = np.empty_like(camera)
+    planes[:, :3] = camera[:, :3] @ rotation
+    planes[:, 3] = camera[:, :3] @ translation + camera[:, 3]
+    return planes
+
+
+def points_inside(xyz: np.ndarray, planes: np.ndarray) -> np.ndarray:
+    """Boolean mask of the points on the inner side of every plane."""
+    inside = np.ones(len(xyz), dtype=bool)
+    for nx, ny, nz, d in planes:
+        inside &= xyz[:, 0] * nx + xyz[:, 1] * ny + xyz[:, 2] * nz + d >= 0
+    return inside
+
+
+def _classify_boxes(nodes: np.ndarray, planes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``(outside, inside)`` masks: boxes entirely outside one plane / inside all planes."""
+    low = np.stack([nodes["min_x"], nodes["min_y"], nodes["min_z"]], axis=1).astype(np.float64)
+    high = np.stack([nodes["max_x"], nodes["max_y"], nodes["max_z"]], axis=1).astype(np.float64)
+    outside = np.zeros(len(nodes), dtype=bool)
+    inside = np.ones(len(nodes), dtype=bool)
+    for plane in planes:
+        normal, d = plane[:3], plane[3]
+        # Corner farthest along the normal decides "outside", the nearest one "inside"
+        outside |= np.where(normal > 0, high, low) @ normal + d < 0
+        inside &= np.where(normal > 0, low, high) @ normal + d >= 0
+    return outside, inside
+
+
+def _merge_ranges(starts: np.ndarray, counts: np.ndarray) -> list[tuple[int, int]]:
+    ranges = []
+    for start, count in sorted(zip(starts.tolist(), counts.tolist())):
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], start + count)
+        elif count:
+            ranges.append((start, start + count))
+    return ranges
+
+
+class SpatialIndex:
+    """Memory-mapped octree index; :meth:`crop` reads only intersecting chunks."""
+
+    def __init__(self, index_path: str):
+        self.path = index_path
+        self.header = read_ply_header(index_path)
+        self.nodes = np.array(open_element_memmap(index_path, "octree_node", self.header))
+        self.vertices = open_element_memmap(index_path, "vertex", self.header)
+
+    @classmethod
+    def for_source(cls, ply_path: str) -> "SpatialIndex":
+        return cls(ensure_spatial_index(ply_path))
+
+    def query(self, planes: np.ndarray) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """Row ranges fully inside the region, and leaf ranges that need a per-row test."""
+        full, partial = [], []
+        frontier = np.zeros(1, dtype=np.int64)
+        while len(frontier):
+            nodes = self.nodes[frontier]
+            outside, inside = _classify_boxes(nodes, planes)
+            full.append(frontier[inside])
+            straddling = frontier[~outside & ~inside]
+            children = self.nodes["child_count"][straddling].astype(np.int64)
+            partial.append(straddling[children == 0])
+            parents = straddling[children > 0]
+            counts = children[children > 0]
+            firsts = np.repeat(self.nodes["first_child"][parents].astype(np.int64), counts)
+            frontier = firsts + np.arange(len(firsts)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        full = np.concatenate(full)
+        partial = np.concatenate(partial)
+        return (
+            _merge_ranges(self.nodes["start"][full], self.nodes["count"][full]),
+            _merge_ranges(self.nodes["start"][partial], self.nodes["count"][partial]),
+        )
+
+    def crop(self, planes: np.ndarray) -> tuple[np.ndarray, int]:
+        """Rows inside every plane (in Morton order) and the number of vertex bytes read."""
+        full, partial = self.query(planes)
+        pieces = []
+        for start, end, exact in sorted([(s, e, False) for s, e in full] + [(s, e, True) for s, e in partial]):
+            rows = np.array(self.vertices[start:end])
+            if exact:
+                rows = rows[points_inside(gaussian_positions(rows), planes)]
+            pieces.append(rows)
+        rows_read = sum(end - start for start, end in full + partial)
+        cropped = np.concatenate(pieces) if pieces else np.empty(0, dtype=self.vertices.dtype)
+        return cropped, rows_read * self.vertices.dtype.itemsize
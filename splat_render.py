@@ -0,0 +1,255 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Headless tile-based CPU rasterizer for Gaussian splats (numpy only).
+
+Follows the 3DGS forward pass: project each 3D covariance to a 2D conic through the
+pinhole Jacobian, bin Gaussians into 16×16 screen tiles, sort each tile front to back
+and alpha-composite the DC color. Cameras use the loaders' OpenCV convention
+(x right, y down, z forward; extrinsics map world to camera).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .compact_formats import DC_FIELDS, POSITION_FIELDS, ROTATION_FIELDS, SCALE_FIELDS, SH_C0
+from .gaussian_ops import worker_threads
+
+TILE_SIZE = 16
+NEAR_PLANE = 0.01
+# Screen-space dilation added to every 2D covariance (anti-aliasing low-pass)
+COVARIANCE_BLUR = 0.3
+ALPHA_MIN = 1.0 / 255.0
+ALPHA_MAX = 0.99
+# A pixel stops accumulating once its transmittance falls below this
+TRANSMITTANCE_MIN = 1e-4
+# Gaussians scored per vectorized step inside a tile
+COMPOSITE_BATCH = 4096
+
+
+def _column(vertices: np.ndarray, name: str, default: float) -> np.ndarray:
+    if name in vertices.dtype.names:
+        return np.asarray(vertices[name], dtype=np.float32)
+    return np.full(len(vertices), default, dtype=np.float32)
+
+
+def _rotation_matrices(vertices: np.ndarray) -> np.ndarray:
+    q = np.stack([_column(vertices, name, 1.0 if name == "rot_0" else 0.0) for name in ROTATION_FIELDS], axis=1)
+    norm = np.linalg.norm(q, axis=1, keepdims=True)
+    q /= np.where(norm > 0, norm, 1.0)
+    w, x, y, z = q.T
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=1),
+    ], axis=1)
+
+
+def project_gaussians(
+    vertices: np.ndarray,
+    extrinsics: np.ndarray,
+    intrinsics: np.ndarray,
+    width: int,
+    height: int,
+    scale_modifier: float = 1.0,
+) -> dict[str, np.ndarray]:
+    """Screen-space means, conics, radii, depths, opacities and colors of the visible Gaussians."""
+    names = vertices.dtype.names
+    missing = [name for name in POSITION_FIELDS + SCALE_FIELDS if name not in names]
+    if missing:
+        raise ValueError(f"Rendering needs Gaussian fields, missing {missing}")
+
+    rotation_cam = np.asarray(extrinsics, dtype=np.float32)[:3, :3]
+    translation = np.asarray(extrinsics, dtype=np.float32)[:3, 3]
+    fx, fy = float(intrinsics[0][0]), float(intrinsics[1][1])
+    cx, cy = float(intrinsics[0][2]), float(intrinsics[1][2])
+
+    xyz = np.stack([_column(vertices, name, 0.0) for name in POSITION_FIELDS], axis=1)
+    cam = xyz @ rotation_cam.T + translation
+    del xyz
+    visible = np.flatnonzero(cam[:, 2] > NEAR_PLANE)
+    cam = cam[visible]
+    subset = vertices[visible] if len(visible) < len(vertices) else vertices
+    x, y, z = cam.T
+
+    u = fx * x / z + cx
+    v = fy * y / z + cy
+
+    # Jacobian of the perspective projection, with off-screen points clamped as in 3DGS
+    lim_x = 1.3 * max(cx, width - cx) / fx
+    lim_y = 1.3 * max(cy, height - cy) / fy
+    tx = np.clip(x / z, -lim_x, lim_x) * z
+    ty = np.clip(y / z, -lim_y, lim_y) * z
+    jacobian = np.zeros((len(z), 2, 3), dtype=np.float32)
+    jacobian[:, 0, 0] = fx / z
+    jacobian[:, 0, 2] = -fx * tx / (z * z)
+    jacobian[:, 1, 1] = fy / z
+    jacobian[:, 1, 2] = -fy * ty / (z * z)
+
+    # Σ2D = (J W R S)(J W R S)^T, so only the 2×3 factor is formed
+    scales = np.exp(np.stack([_column(subset, name, -5.0) for name in SCALE_FIELDS], axis=1)) * scale_modifier
+    factor = (jacobian @ rotation_cam) @ (_rotation_matrices(subset) * scales[:, None, :])
+    del jacobian, scales
+    a = np.einsum("ij,ij->i", factor[:, 0], factor[:, 0]) + COVARIANCE_BLUR
+    b = np.einsum("ij,ij->i", factor[:, 0], factor[:, 1])
+    c = np.einsum("ij,ij->i", factor[:, 1], factor[:, 1]) + COVARIANCE_BLUR
+    del factor
+    det = a * c - b * b
+    mid = 0.5 * (a + c)
+    radius = np.ceil(3.0 * np.sqrt(mid + np.sqrt(np.maximum(0.1, mid * mid - det))))
+
+    opacity = 1.0 / (1.0 + np.exp(-_column(subset, "opacity", 10.0)))
+    on_screen = (
+        (det > 0)
+        & (u + radius >= 0) & (u - radius < width)
+        & (v + radius >= 0) & (v - radius < height)
+        & (opacity >= ALPHA_MIN)
+    )
+    keep = np.flatnonzero(on_screen)
+    inv_det = 1.0 / det[keep]
+    if all(name in names for name in DC_FIELDS):
+        color = np.stack([0.5 + SH_C0 * _column(subset, name, 0.0)[keep] for name in DC_FIELDS], axis=1)
+    elif all(name in names for name in ("red", "green", "blue")):
+        color = np.stack([_column(subset, name, 0.0)[keep] / 255.0 for name in ("red", "green", "blue")], axis=1)
+    else:
+        color = np.full((len(keep), 3), 0.5, dtype=np.float32)
+    return {
+        "u": u[keep],
+        "v": v[keep],
+        "conic_a": c[keep] * inv_det,
+        "conic_b": -b[keep] * inv_det,
+        "conic_c": a[keep] * inv_det,
+        "radius": radius[keep],
+        "depth": z[keep],
+        "opacity": opacity[keep],
+        "color": np.clip(color, 0.0, 1.0).astype(np.float32),
+    }
+
+
+def bin_tiles(u: np.ndarray, v: np.ndarray, radius: np.ndarray, depth: np.ndarray, tiles_x: int, tiles_y: int):
+    """Duplicate each Gaussian into every tile its 3-sigma box touches, sorted by (tile, depth).
+
+    Returns ``(gaussian_index, tile_starts)``: the Gaussians of tile ``t`` front to back are
+    ``gaussian_index[tile_starts[t]:tile_starts[t + 1]]``.
+    """
+    tx0 = np.clip(np.floor((u - radius) / TILE_SIZE), 0, tiles_x - 1).astype(np.int64)
+    tx1 = np.clip(np.floor((u + radius) / TILE_SIZE), 0, tiles_x - 1).astype(np.int64)
+    ty0 = np.clip(np.floor((v - radius) / TILE_SIZE), 0, tiles_y - 1).astype(np.int64)
+    ty1 = np.clip(np.floor((v + radius) / TILE_SIZE), 0, tiles_y - 1).astype(np.int64)
+
+    # Depth order first; the stable tile sort below then keeps each tile front to back
+    order = np.argsort(depth, kind="stable")
+    span_x = (tx1 - tx0 + 1)[order]
+    counts = span_x * (ty1 - ty0 + 1)[order]
+    total = int(counts.sum())
+    gaussian = np.repeat(order, counts)
+    local = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    span = np.repeat(span_x, counts)
+    tile = (ty0[gaussian] + local // span) * tiles_x + tx0[gaussian] + local % span
+    del local, span
+
+    by_tile = np.argsort(tile, kind="stable")
+    tile_starts = np.searchsorted(tile[by_tile], np.arange(tiles_x * tiles_y + 1))
+    return gaussian[by_tile], tile_starts
+
+
+def _composite_tile(projected: dict, gaussians: np.ndarray, x0: int, y0: int, w: int, h: int, background: np.ndarray):
+    # Tile-local pixel centers as quadratic features [1, x, y, x², y², xy]
+    ly, lx = np.divmod(np.arange(w * h, dtype=np.float64), w)
+    lx += 0.5
+    ly += 0.5
+    features = np.stack([np.ones_like(lx), lx, ly, lx * lx, ly * ly, lx * ly], axis=1)
+    log_transmittance = np.zeros(w * h, dtype=np.float64)
+    rgb = np.zeros((w * h, 3), dtype=np.float64)
+    log_alpha_min = np.log(ALPHA_MIN)
+    log_alpha_max = np.log(ALPHA_MAX)
+    log_t_min = np.log(TRANSMITTANCE_MIN)
+
+    for begin in range(0, len(gaussians), COMPOSITE_BATCH):
+        idx = gaussians[begin:begin + COMPOSITE_BATCH]
+        mx = projected["u"][idx].astype(np.float64) - x0
+        my = projected["v"][idx].astype(np.float64) - y0
+        ca = projected["conic_a"][idx].astype(np.float64)
+        cb = projected["conic_b"][idx].astype(np.float64)
+        cc = projected["conic_c"][idx].astype(np.float64)
+        # log(opacity) - ½ dᵀ·conic·d expanded in the pixel features, so one matmul scores every pair
+        coefficients = np.stack([
+            np.log(projected["opacity"][idx]) - 0.5 * (ca * mx * mx + cc * my * my) - cb * mx * my,
+            ca * mx + cb * my,
+            cc * my + cb * mx,
+            -0.5 * ca,
+            -0.5 * cc,
+            -cb,
+        ])
+        log_alpha = features @ coefficients
+        # Pixel-major pairs, depth order within each pixel; most pairs of a tile never overlap
+        flat = np.flatnonzero(log_alpha >= log_alpha_min)
+        if len(flat) == 0:
+            continue
+        pixel, member = np.divmod(flat, len(idx))
+        alpha = np.exp(np.minimum(log_alpha.ravel().take(flat), log_alpha_max))
+        log_keep = np.log1p(-alpha)
+
+        # Exclusive per-pixel prefix sum of log(1 - alpha) = transmittance in front of each pair
+        running = np.cumsum(log_keep)
+        first = np.flatnonzero(np.r_[True, pixel[1:] != pixel[:-1]])
+        counts = np.diff(np.r_[first, len(pixel)])
+        base = np.repeat(running[first] - log_keep[first], counts)
+        front = log_transmittance[pixel] + running - log_keep - base
+        weights = np.where(front >= log_t_min, alpha * np.exp(front), 0.0)
+
+        colors = projected["color"][idx[member]]
+        for channel in range(3):
+            rgb[:, channel] += np.bincount(pixel, weights * colors[:, channel], minlength=w * h)
+        log_transmittance += np.bincount(pixel, log_keep, minlength=w * h)
+        if log_transmittance.max() < log_t_min:
+            break
+
+    transmittance = np.exp(log_transmittance)
+    rgb += transmittance[:, None] * background
+    return rgb.reshape(h, w, 3), (1.0 - transmittance).reshape(h, w)
+
+
+def render_splats(
+    vertices: np.ndarray,
+    extrinsics,
+    intrinsics,
+    width: int,
+    height: int,
+    background=(0.0, 0.0, 0.0),
+    scale_modifier: float = 1.0,
+    threads: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Render to an ``(height, width, 3)`` float32 RGB image in [0, 1] plus its alpha.
+
+    Tiles are composited independently in a thread pool (``threads``, default
+    ``PLYPREVIEW_THREADS``). Also returns the number of Gaussians that reached the screen.
+    """
+    projected = project_gaussians(vertices, extrinsics, intrinsics, width, height, scale_modifier)
+    tiles_x = -(-width // TILE_SIZE)
+    tiles_y = -(-height // TILE_SIZE)
+    gaussians, tile_starts = bin_tiles(projected["u"], projected["v"], projected["radius"], projected["depth"], tiles_x, tiles_y)
+
+    image = np.empty((height, width, 3), dtype=np.float32)
+    alpha = np.empty((height, width), dtype=np.float32)
+    background = np.asarray(background, dtype=np.float32)
+
+    def render_tile(tile: int) -> None:
+        ty, tx = divmod(tile, tiles_x)
+        x0, y0 = tx * TILE_SIZE, ty * TILE_SIZE
+        w, h = min(TILE_SIZE, width - x0), min(TILE_SIZE, height - y0)
+        members = gaussians[tile_starts[tile]:tile_starts[tile + 1]]
+        tile_rgb, tile_alpha = _composite_tile(projected, members, x0, y0, w, h, background)
+        image[y0:y0 + h, x0:x0 + w] = tile_rgb
+        alpha[y0:y0 + h, x0:x0 + w] = tile_alpha
+
+    # Busiest tiles first so the pool stays balanced
+    tiles = np.argsort(-np.diff(tile_starts), kind="stable").tolist()
+    threads = worker_threads(threads)
+    if threads == 1:
+        for tile in tiles:
+            render_tile(tile)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(render_tile, tiles))
+    return np.clip(image, 0.0, 1.0), alpha, len(projected["u"])
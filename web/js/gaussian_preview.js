@@ -53,9 +53,40 @@ app.registerExtension({
                 refreshList();
 
                 // Hint label: user must right-click "Reload Node" to refresh PLY list
+                const hintText = "Right-click → Refresh Node to load new PLY files";
                 const hintEl = document.createElement("div");
                 hintEl.style.cssText = "font-size:10px;color:#888;text-align:center;padding:4px 8px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;";
-                hintEl.textContent = "Right-click → Refresh Node to load new PLY files";
+                hintEl.textContent = hintText;
+
+                // Show header metadata for the selected file (served from the server-side index)
+                const showInfo = async (value) => {
+                    if (!value || value === "No PLY files found") {
+                        hintEl.textContent = hintText;
+                        return;
+                    }
+                    try {
+                        const resp = await api.fetchApi(`/plypreview/info?file=${encodeURIComponent(value)}`);
+                        const info = await resp.json();
+                        if (!resp.ok || info.error) {
+                            hintEl.textContent = hintText;
+                            return;
+                        }
+                        const sizeMb = (info.file_size / (1024 * 1024)).toFixed(1);
+                        hintEl.textContent = `${Number(info.vertex_count).toLocaleString()} gaussians · SH ${info.sh_degree} · ${sizeMb} MB`;
+                        hintEl.title = hintText;
+                    } catch (e) {
+                        hintEl.textContent = hintText;
+                    }
+                };
+                if (widget) {
+                    const widgetCallback = widget.callback;
+                    widget.callback = function(value) {
+                        const result = widgetCallback ? widgetCallback.apply(this, arguments) : undefined;
+                        showInfo(value);
+                        return result;
+                    };
+                    showInfo(widget.value);
+                }
                 this.addDOMWidget("ply_hint", "PLY_HINT", hintEl, {
                     serialize: false,
                     hideOnZoom: false,
@@ -190,6 +221,16 @@ app.registerExtension({
                             console.error('[GeomPack Gaussian] Error saving screenshot:', error);
                         }
                     }
+                    // Load timings reported by this node's viewer once its first frame is drawn
+                    else if (event.data.type === 'MESH_LOADED' && event.source === iframe.contentWindow) {
+                        const grid = infoPanel.querySelector("div");
+                        if (grid && event.data.firstFrameMs != null) {
+                            const sizeMb = (event.data.bytes / (1024 * 1024)).toFixed(1);
+                            grid.insertAdjacentHTML("beforeend", `
+                                <span style="color: #888;">Load:</span>
+                                <span>${sizeMb} MB in ${(event.data.loadMs / 1000).toFixed(2)} s · first frame ${Math.round(event.data.firstFrameMs)} ms</span>`);
+                        }
+                    }
                     // Handle error messages from iframe
                     else if (event.data.type === 'MESH_ERROR' && event.data.error) {
                         console.error('[GeomPack Gaussian] Error from viewer:', event.data.error);
@@ -220,6 +261,8 @@ app.registerExtension({
                         const displayName = message.filename?.[0] || filename;
                         const fileSizeMb = message.file_size_mb?.[0] || 'N/A';
 
+                        const progressive = message.progressive?.[0] || null;
+
                         // Extract camera parameters if provided
                         const extrinsics = message.extrinsics?.[0] || null;
                         const intrinsics = message.intrinsics?.[0] || null;
@@ -231,56 +274,74 @@ app.registerExtension({
                             this.resizeToAspectRatio(imageWidth, imageHeight);
                         }
 
+                        // Header-derived metadata (count, SH degree, bounds) is available before the download
+                        const plyInfo = message.ply_info?.[0] || null;
+                        let infoRows = "";
+                        if (message.served_size_mb?.[0] !== undefined) {
+                            infoRows += `
+                                <span style="color: #888;">Transfer:</span>
+                                <span>${message.served_size_mb[0]} MB (${message.savings_percent?.[0] ?? 0}% smaller)</span>`;
+                        }
+                        if (plyInfo) {
+                            infoRows += `
+                                <span style="color: #888;">Gaussians:</span>
+                                <span>${Number(plyInfo.vertex_count).toLocaleString()} (SH degree ${plyInfo.sh_degree})</span>`;
+                            if (plyInfo.encoding && plyInfo.encoding !== "ply") {
+                                infoRows += `
+                                <span style="color: #888;">Encoding:</span>
+                                <span>${plyInfo.encoding} (${plyInfo.bytes_per_gaussian} B/gaussian)</span>`;
+                            }
+                            if (plyInfo.bounds) {
+                                const extent = plyInfo.bounds.max.map((v, i) => (v - plyInfo.bounds.min[i]).toFixed(2));
+                                infoRows += `
+                                <span style="color: #888;">Extent:</span>
+                                <span>${extent.join(" × ")}</span>`;
+                            }
+                        }
+
                         // Update info panel
                         infoPanel.innerHTML = `
                             <div style="display: grid; grid-template-columns: auto 1fr; gap: 2px 8px;">
                                 <span style="color: #888;">File:</span>
                                 <span style="color: #6cc;">${displayName}</span>
                                 <span style="color: #888;">Size:</span>
-                                <span>${fileSizeMb} MB</span>
+                                <span>${fileSizeMb} MB</span>${infoRows}
                             </div>
                         `;
 
-                        // ComfyUI serves output files via /view API endpoint
-                        const filepath = `/view?filename=${encodeURIComponent(filename)}&type=output&subfolder=`;
-
-                        // Function to fetch and send data to iframe
-                        const fetchAndSend = async () => {
+                        // ComfyUI serves output files via /view API endpoint (subfolder split off, e.g. plypreview_cache/)
+                        const normalized = filename.replace(/\\/g, "/");
+                        const slash = normalized.lastIndexOf("/");
+                        const subfolder = slash >= 0 ? normalized.slice(0, slash) : "";
+                        const basename = slash >= 0 ? normalized.slice(slash + 1) : normalized;
+                        // Prefer the dedicated streaming route (ETag/304, ranges, precompressed); /view is the legacy fallback
+                        const filepath = message.ply_url?.[0]
+                            || `/view?filename=${encodeURIComponent(basename)}&type=output&subfolder=${encodeURIComponent(subfolder)}`;
+
+                        // The viewer fetches the file itself (same origin), streaming it with progress,
+                        // so the PLY is never downloaded into this page and cloned into the iframe
+                        const sendToViewer = () => {
                             if (!iframe.contentWindow) {
                                 console.error("[GeomPack Gaussian] Iframe contentWindow not available");
                                 return;
                             }
-
-                            try {
-                                // Fetch the PLY file from parent context (authenticated)
-                                console.log("[GeomPack Gaussian] Fetching PLY file:", filepath);
-                                const response = await fetch(filepath);
-                                if (!response.ok) {
-                                    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-                                }
-                                const arrayBuffer = await response.arrayBuffer();
-                                console.log("[GeomPack Gaussian] Fetched PLY file, size:", arrayBuffer.byteLength);
-
-                                // Send the data to iframe with camera parameters
-                                iframe.contentWindow.postMessage({
-                                    type: "LOAD_MESH_DATA",
-                                    data: arrayBuffer,
-                                    filename: filename,
-                                    extrinsics: extrinsics,
-                                    intrinsics: intrinsics,
-                                    timestamp: Date.now()
-                                }, "*", [arrayBuffer]);
-                            } catch (error) {
-                                console.error("[GeomPack Gaussian] Error fetching PLY:", error);
-                                infoPanel.innerHTML = `<div style="color: #ff6b6b;">Error loading PLY: ${error.message}</div>`;
-                            }
+                            console.log("[GeomPack Gaussian] Loading PLY in viewer:", filepath);
+                            iframe.contentWindow.postMessage({
+                                type: "LOAD_MESH_URL",
+                                url: new URL(filepath, window.location.href).href,
+                                filename: filename,
+                                extrinsics: extrinsics,
+                                intrinsics: intrinsics,
+                                progressive: progressive,
+                                timestamp: Date.now()
+                            }, "*");
                         };
 
-                        // Fetch and send when iframe is ready
+                        // Send when iframe is ready
                         if (iframeLoaded) {
-                            fetchAndSend();
+                            sendToViewer();
                         } else {
-                            setTimeout(fetchAndSend, 500);
+                            setTimeout(sendToViewer, 500);
                         }
                     }
                 };